@@ -1,169 +1,471 @@
 """
-MiniMax ve Alpha-Beta Pruning algoritmaları.
-Derinlik bazlı arama.
-Gelecekte iterative deepening ve zaman kontrolü eklenecek.
+MiniMax ve Alpha-Beta Pruning algoritmaları (negamax).
+Süre/düğüm limitli iterative deepening, yapraklarda sadece almalarla sükunet araması.
 """
 
-from HamleUret import HamleUretici
-from Degerlendirme import Degerlendirici
-import copy
+import time
+
+from LegalHamle import LegalHamleBulucu
+from HamleSecici import HamleSecici, MAKS_PLY
+from Degerlendirme import Degerlendirici, MAT_DEGERI, MAT_ESIGI
+from Hamle import ALINAN_KAYDIR, TERFI_KAYDIR
+from Sabitler import BOS
+from Zobrist import TranspositionTable, KESIN, ALT_SINIR, UST_SINIR
+
+
+# Süre/düğüm limiti kaç düğümde bir kontrol edilir
+ZAMAN_KONTROL_ARALIGI = 1024
+
+# Tekrar ve 50 hamle kuralı skoru
+BERABERLIK_SKORU = 0
+
+# Tam sayı arama sınırı: her mat skorundan büyük, TT'nin 32 bit skor alanına sığar
+SONSUZ = MAT_DEGERI + 2000
+
+# Aspirasyon penceresi: önceki iterasyon skoru etrafında ± yarı genişlik (centipawn),
+# taşma olursa taşan taraf bu oranla genişletilir; ilk iterasyonlar tam pencere ile aranır
+ASPIRASYON_PENCERESI = 50
+ASPIRASYON_GENISLEME = 4
+ASPIRASYON_MIN_DERINLIK = 3
+
+# Null hamle budaması: derinlik azaltması (R), R'nin 3 olduğu derinlik ve doğrulama araması derinliği
+NULL_R = 2
+NULL_R_BUYUK = 3
+NULL_R_BUYUK_DERINLIK = 6
+NULL_DOGRULAMA_DERINLIGI = 5
+
+# Geç hamle azaltması (LMR): bu kadar hamleden sonra ve bu derinlikten itibaren sessiz hamleler azaltılır
+LMR_HAMLE_SIRASI = 3
+LMR_MIN_DERINLIK = 3
+LMR_BUYUK_HAMLE_SIRASI = 6  # Bundan sonraki hamleler 2 kat azaltılır
+
+# Geçen süre sert limitin bu oranını aştıysa yeni iterasyona başlanmaz
+YUMUSAK_LIMIT_ORANI = 0.5
+
+
+def tt_skoruna_cevir(skor, ply):
+    """Mat skorunu kökten uzaklıktan düğümden uzaklığa çevir (TT kaydı pozisyona bağlı kalsın)"""
+    if skor >= MAT_ESIGI:
+        return skor + ply
+    if skor <= -MAT_ESIGI:
+        return skor - ply
+    return skor
+
+
+def tt_skorundan_cevir(skor, ply):
+    """TT'deki düğüme göre mat skorunu bu düğümün kökten uzaklığına göre düzelt"""
+    if skor >= MAT_ESIGI:
+        return skor - ply
+    if skor <= -MAT_ESIGI:
+        return skor + ply
+    return skor
+
+
+class AramaZamanAsimi(Exception):
+    """Sert süre veya düğüm limiti dolduğunda aramayı kesmek için"""
+    pass
 
 
 class Arama:
-    def __init__(self, derinlik=6):
-        self.derinlik = derinlik
-        self.hamle_uretici = HamleUretici()
+    def __init__(self, derinlik=6, sure_limiti=None, dugum_limiti=None, tt_boyut_mb=16, aspirasyon=True):
+        self.derinlik = derinlik  # Iterative deepening için en fazla derinlik
+        self.aspirasyon = aspirasyon  # Iterasyonlar önceki skor etrafında dar pencere ile başlasın mı
+        self.sure_limiti = sure_limiti  # Saniye (sert limit), None = sınırsız
+        self.dugum_limiti = dugum_limiti  # Düğüm sayısı (sert limit), None = sınırsız
+        self.legal_bulucu = LegalHamleBulucu()
+        self.hamle_secici = HamleSecici(self.legal_bulucu)
         self.degerlendirme = Degerlendirici()
+        self.tt = TranspositionTable(tt_boyut_mb)
         self.dugum_sayisi = 0
+        self.sukunet_dugum_sayisi = 0
+        self.beraberlik_sayisi = 0
+        self.mat_sayisi = 0
+        self.pat_sayisi = 0
+        self.null_deneme_sayisi = 0
+        self.null_kesme_sayisi = 0
+        self.lmr_sayisi = 0
+        self.yeniden_arama_sayisi = 0
+        self.aspirasyon_tasma_sayisi = 0
         self.max_derinlik = 0
+        self.mevcut_derinlik = 0
+        self.tamamlanan_derinlik = 0
+        self.son_skor = 0
+        self.arama_suresi = 0.0
+        self._baslangic_zamani = time.perf_counter()
+        self._sonraki_kontrol = ZAMAN_KONTROL_ARALIGI
 
     def derinlik_degistir(self, yeni_derinlik):
         """Arama derinliğini değiştir"""
         self.derinlik = yeni_derinlik
 
+    def limit_degistir(self, sure_limiti=None, dugum_limiti=None):
+        """Süre (saniye) ve düğüm limitlerini değiştir (None = sınırsız)"""
+        self.sure_limiti = sure_limiti
+        self.dugum_limiti = dugum_limiti
+
     def en_iyi_hamle_bul(self, tahta):
-        """Alpha-Beta pruning ile en iyi hamleyi bul"""
+        """Iterative deepening ile en iyi hamleyi bul.
+        Derinlik 1, 2, 3... aranır; süre/düğüm limiti dolarsa son tamamlanan iterasyonun hamlesi döner"""
         self.dugum_sayisi = 0
+        self.sukunet_dugum_sayisi = 0
+        self.beraberlik_sayisi = 0
+        self.mat_sayisi = 0
+        self.pat_sayisi = 0
+        self.null_deneme_sayisi = 0
+        self.null_kesme_sayisi = 0
+        self.lmr_sayisi = 0
+        self.yeniden_arama_sayisi = 0
+        self.aspirasyon_tasma_sayisi = 0
         self.max_derinlik = 0
+        self.tamamlanan_derinlik = 0
+        self._baslangic_zamani = time.perf_counter()
+        self._sonraki_kontrol = ZAMAN_KONTROL_ARALIGI
 
         en_iyi_hamle = None
-        en_iyi_skor = float('-inf') if tahta.beyaz_sira else float('inf')
-
-        try:
-            hamleler = self.hamle_uretici.tum_hamleleri_uret(tahta)
 
-            # Hamle yoksa None döndür
-            if not hamleler:
-                return None
+        # Arama tahtayı yerinde değiştirir; GUI'nin tahtası etkilenmesin diye tek kopya
+        tahta = tahta.kopyala()
 
-            # Hamleleri sırala (basit sıralama - alma hamleleri önce)
-            hamleler = self._hamleleri_sirala(tahta, hamleler)
+        # Transposition table aramalar arasında korunur; eski nesil kayıtlar önce değiştirilir
+        self.tt.yeni_arama()
+        self.hamle_secici.yeni_arama()
+        self.degerlendirme.piyon_tablosu.yeni_arama()
 
-            for i, hamle in enumerate(hamleler):
-                try:
-                    # Hamleyi yap
-                    tahta_kopyasi = tahta.kopyala()  # deepcopy yerine kendi kopyala metodunu kullan
+        hamleler = self.legal_bulucu.legal_hamleleri_bul(tahta)
 
-                    if not tahta_kopyasi.hamle_yap(hamle):
-                        continue  # Geçersiz hamle, atla
+        # Hamle yoksa None döndür
+        if not hamleler:
+            return None
 
-                    if tahta.beyaz_sira:  # Beyaz oynuyor (maksimize)
-                        skor = self.alpha_beta(tahta_kopyasi, self.derinlik - 1, float('-inf'), float('inf'), False)
-                        if skor > en_iyi_skor:
-                            en_iyi_skor = skor
-                            en_iyi_hamle = hamle
-                    else:  # Siyah oynuyor (minimize)
-                        skor = self.alpha_beta(tahta_kopyasi, self.derinlik - 1, float('-inf'), float('inf'), True)
-                        if skor < en_iyi_skor:
-                            en_iyi_skor = skor
-                            en_iyi_hamle = hamle
+        # Hamleleri sırala (MVV-LVA almalar, geçmiş skorlu sessizler)
+        hamleler = self._hamleleri_sirala(tahta, hamleler)
 
-                except Exception as e:
-                    continue
+        for iterasyon in range(1, self.derinlik + 1):
+            # Önceki iterasyonun en iyi hamlesi ilk aranır
+            if en_iyi_hamle is not None:
+                hamleler.remove(en_iyi_hamle)
+                hamleler.insert(0, en_iyi_hamle)
 
-        except Exception as e:
-            print(f"Arama genel hatası: {e}")
+            try:
+                en_iyi_hamle, self.son_skor = self._aspirasyon_arama(tahta, iterasyon, hamleler)
+            except AramaZamanAsimi:
+                break  # Yarım kalan iterasyonun sonucu kullanılmaz
 
-        return en_iyi_hamle
+            self.tamamlanan_derinlik = iterasyon
 
-    def _hamleleri_sirala(self, tahta, hamleler):
-        """Hamleleri sırala (alma hamleleri önce)"""
-        alma_hamleler = []
-        normal_hamleler = []
+            # Bu derinlikte görülen mat, daha derin aramada kısalamaz: aramayı bitir
+            if self.degerlendirme.skor_mat_mi(self.son_skor) and MAT_DEGERI - abs(self.son_skor) <= iterasyon:
+                break
 
-        for hamle in hamleler:
-            hedef_kare = hamle[1]
-            if tahta.bit_kontrol_et(hedef_kare):  # Hedef karede taş var
-                alma_hamleler.append(hamle)
-            else:
-                normal_hamleler.append(hamle)
+            # Yumuşak limit: bir sonraki iterasyon büyük ihtimalle bitmeyecekse başlama
+            if self.sure_limiti is not None and self._gecen_sure() >= self.sure_limiti * YUMUSAK_LIMIT_ORANI:
+                break
 
-        return alma_hamleler + normal_hamleler
+        self.arama_suresi = self._gecen_sure()
+        return en_iyi_hamle
 
-    def alpha_beta(self, tahta, derinlik, alpha, beta, maksimize_ediyor):
-        """Alpha-Beta pruning algoritması"""
-        self.dugum_sayisi += 1
-        self.max_derinlik = max(self.max_derinlik, self.derinlik - derinlik)
+    def _aspirasyon_arama(self, tahta, derinlik, hamleler):
+        """Önceki skor etrafında dar pencere ile kök araması; skor pencere dışına taşarsa
+        taşan taraf genişletilip yeniden aranır: (en iyi hamle, skor)"""
+        if (not self.aspirasyon or derinlik < ASPIRASYON_MIN_DERINLIK or
+                abs(self.son_skor) >= MAT_ESIGI):
+            return self._kok_arama(tahta, derinlik, hamleler, -SONSUZ, SONSUZ)
+
+        alt_genislik = ust_genislik = ASPIRASYON_PENCERESI
+        while True:
+            alpha = max(self.son_skor - alt_genislik, -SONSUZ)
+            beta = min(self.son_skor + ust_genislik, SONSUZ)
+            hamle, skor = self._kok_arama(tahta, derinlik, hamleler, alpha, beta)
+
+            if skor <= alpha and alpha > -SONSUZ:
+                # Fail-low: hiçbir hamle alpha'yı geçemedi, en iyi hamle belirsiz
+                alt_genislik *= ASPIRASYON_GENISLEME
+            elif skor >= beta and beta < SONSUZ:
+                # Fail-high: kesme yapan hamle yeniden aramada ilk sıraya alınır
+                ust_genislik *= ASPIRASYON_GENISLEME
+                hamleler.remove(hamle)
+                hamleler.insert(0, hamle)
+            else:
+                return hamle, skor
+
+            self.aspirasyon_tasma_sayisi += 1
+            if alt_genislik >= MAT_ESIGI:
+                alt_genislik = SONSUZ
+            if ust_genislik >= MAT_ESIGI:
+                ust_genislik = SONSUZ
+
+    def _kok_arama(self, tahta, derinlik, hamleler, alpha=-SONSUZ, beta=SONSUZ):
+        """Kök düğümde tek derinlikli arama (fail-soft): (en iyi hamle, skor).
+        Skor <= alpha ise üst sınır, >= beta ise alt sınırdır"""
+        self.mevcut_derinlik = derinlik
+        en_iyi_hamle = None
+        en_iyi_skor = -SONSUZ
 
-        # Terminal düğüm kontrolü
-        if derinlik == 0:
-            return self.degerlendirme.degerlendir(tahta)
+        for hamle in hamleler:
+            # Hamleyi yap
+            if not tahta.hamle_yap(hamle):
+                continue  # Geçersiz hamle, atla
+
+            try:
+                # Negamax: skor hamleyi yapan taraf açısından
+                if en_iyi_hamle is None:
+                    skor = -self.alpha_beta(tahta, derinlik - 1, -beta, -alpha, 1)
+                else:
+                    # PVS: sıfır pencere ile alpha'yı geçip geçmediğini sına, geçerse tam ara
+                    skor = -self.alpha_beta(tahta, derinlik - 1, -alpha - 1, -alpha, 1)
+                    if alpha < skor < beta:
+                        self.yeniden_arama_sayisi += 1
+                        skor = -self.alpha_beta(tahta, derinlik - 1, -beta, -alpha, 1)
+            finally:
+                tahta.hamle_geri_al()
+
+            if skor > en_iyi_skor or en_iyi_hamle is None:
+                en_iyi_skor = skor
+                en_iyi_hamle = hamle
+                if skor > alpha:
+                    alpha = skor
+                    if alpha >= beta:
+                        break
+
+        return en_iyi_hamle, en_iyi_skor
+
+    def _gecen_sure(self):
+        """Arama başından beri geçen süre (saniye)"""
+        return time.perf_counter() - self._baslangic_zamani
+
+    def _limit_kontrol(self):
+        """Sert süre veya düğüm limiti dolduysa aramayı kes (derinlik 1 her zaman tamamlanır)"""
+        self._sonraki_kontrol = self.dugum_sayisi + ZAMAN_KONTROL_ARALIGI
+        if self.tamamlanan_derinlik == 0:
+            return
+        if self.dugum_limiti is not None and self.dugum_sayisi >= self.dugum_limiti:
+            raise AramaZamanAsimi()
+        if self.sure_limiti is not None and self._gecen_sure() >= self.sure_limiti:
+            raise AramaZamanAsimi()
 
-        hamleler = self.hamle_uretici.tum_hamleleri_uret(tahta)
+    def _hamleleri_sirala(self, tahta, hamleler):
+        """Hamleleri sırala (kazançlı almalar, geçmiş skorlu sessizler, kaybettiren almalar)"""
+        return self.hamle_secici.sirala(tahta, hamleler)
 
-        # Hamle yoksa (pat/mat durumu)
-        if not hamleler:
-            # Şah durumu kontrolü yapılmalı - basit bir yaklaşım
-            return self.degerlendirme.degerlendir(tahta)
+    def alpha_beta(self, tahta, derinlik, alpha, beta, ply=1, null_izin=True):
+        """Alpha-Beta pruning algoritması (negamax, skor sırası gelen taraf açısından).
+        ply: kökten uzaklık (katil hamle slotları için), null_izin: bu düğümde null hamle denenebilir mi"""
+        self.max_derinlik = max(self.max_derinlik, self.mevcut_derinlik - derinlik)
 
-        if maksimize_ediyor:
-            max_eval = float('-inf')
-            for hamle in hamleler:
-                tahta_kopyasi = copy.deepcopy(tahta)
-                tahta_kopyasi.hamle_yap(hamle)
+        # Arama yolunda veya oyunda tekrar eden pozisyon ya da 50 hamle kuralı: beraberlik
+        if tahta.yarim_hamle_sayici >= 100 or tahta.tekrar_sayisi():
+            self.beraberlik_sayisi += 1
+            return BERABERLIK_SKORU
 
-                eval_skor = self.alpha_beta(tahta_kopyasi, derinlik - 1, alpha, beta, False)
-                max_eval = max(max_eval, eval_skor)
-                alpha = max(alpha, eval_skor)
+        # Mat mesafesi budaması: bu ply'dan en hızlı mat bile pencereyi iyileştiremiyorsa ara
+        alpha = max(alpha, -self.degerlendirme.mat_skoru(ply))
+        beta = min(beta, self.degerlendirme.mat_skoru(ply + 1))
+        if alpha >= beta:
+            return alpha
 
-                if beta <= alpha:
-                    break  # Beta cutoff
+        # Yaprakta statik değerlendirme yerine alma dizileri sükunete kadar aranır
+        if derinlik <= 0:
+            return self.sukunet_arama(tahta, alpha, beta, ply)
 
-            return max_eval
+        self.dugum_sayisi += 1
+        if self.dugum_sayisi >= self._sonraki_kontrol:
+            self._limit_kontrol()
+
+        # Transposition table: yeterli derinlikte kayıt varsa kesme, yoksa hash hamlesi
+        anahtar = tahta.zobrist_anahtari
+        hash_hamle = None
+        kayit = self.tt.sorgula(anahtar)
+        if kayit is not None:
+            kayit_derinlik, kayit_skor, sinir, hash_hamle = kayit
+            kayit_skor = tt_skorundan_cevir(kayit_skor, ply)
+            if kayit_derinlik >= derinlik:
+                if (sinir == KESIN or (sinir == ALT_SINIR and kayit_skor >= beta) or
+                        (sinir == UST_SINIR and kayit_skor <= alpha)):
+                    return kayit_skor
+            hash_hamle = hash_hamle or None
+
+        sah_tehdidinde = self.legal_bulucu.sah_tehdidinde_mi(tahta, tahta.beyaz_sira)
+
+        # Null hamle budaması: pas geçmek bile beta'yı aşıyorsa gerçek hamleler de aşar
+        if (null_izin and derinlik >= 2 and beta < MAT_ESIGI and not sah_tehdidinde and
+                self._tas_malzemesi_var_mi(tahta)):
+            R = NULL_R_BUYUK if derinlik >= NULL_R_BUYUK_DERINLIK else NULL_R
+            self.null_deneme_sayisi += 1
+
+            tahta.null_hamle_yap()
+            try:
+                skor = -self.alpha_beta(tahta, derinlik - 1 - R, -beta, -beta + 1, ply + 1, False)
+            finally:
+                tahta.null_hamle_geri_al()
+
+            if skor >= beta:
+                # Derin düğümlerde zugzwang'a karşı null hamlesiz azaltılmış doğrulama araması
+                if derinlik >= NULL_DOGRULAMA_DERINLIGI:
+                    skor = self.alpha_beta(tahta, derinlik - 1 - R, beta - 1, beta, ply, False)
+                if skor >= beta:
+                    self.null_kesme_sayisi += 1
+                    # Pas geçerek bulunan mat kanıtlanmış değil: mat skoru döndürülmez
+                    return beta if skor >= MAT_ESIGI else skor
+
+        alpha_baslangic = alpha
+
+        # Hamleler kademeli üretilir: kesme olursa kalan aşamalar hiç üretilmez
+        en_iyi = -SONSUZ
+        en_iyi_hamle = None
+        hamle_sirasi = 0
+        katiller = self.hamle_secici.katiller[ply] if ply < MAKS_PLY else ()
+
+        for hamle in self.hamle_secici.hamleler(tahta, hash_hamle, ply):
+            tahta.hamle_yap(hamle)
+            hamle_sirasi += 1
+
+            try:
+                if hamle_sirasi == 1:
+                    # İlk hamle (PV adayı) tam pencere ile
+                    skor = -self.alpha_beta(tahta, derinlik - 1, -beta, -alpha, ply + 1, True)
+                else:
+                    # LMR: geç sıralanan sessiz hamleler azaltılmış derinlikte aranır.
+                    # Almalar, terfiler, katiller, şah çeken ve şahtan kaçan hamleler muaf
+                    azaltma = 0
+                    if (hamle_sirasi > LMR_HAMLE_SIRASI and derinlik >= LMR_MIN_DERINLIK and not sah_tehdidinde and
+                            (hamle >> ALINAN_KAYDIR) & 15 == BOS and not (hamle >> TERFI_KAYDIR) & 15 and
+                            hamle not in katiller and
+                            not self.legal_bulucu.sah_tehdidinde_mi(tahta, tahta.beyaz_sira)):
+                        azaltma = 2 if hamle_sirasi > LMR_BUYUK_HAMLE_SIRASI else 1
+                        self.lmr_sayisi += 1
+
+                    # PVS: sıfır pencere; alpha'yı geçerse önce tam derinlik, sonra tam pencere
+                    skor = -self.alpha_beta(tahta, derinlik - 1 - azaltma, -alpha - 1, -alpha, ply + 1, True)
+                    if skor > alpha and azaltma:
+                        skor = -self.alpha_beta(tahta, derinlik - 1, -alpha - 1, -alpha, ply + 1, True)
+                    if alpha < skor < beta:
+                        self.yeniden_arama_sayisi += 1
+                        skor = -self.alpha_beta(tahta, derinlik - 1, -beta, -alpha, ply + 1, True)
+            finally:
+                tahta.hamle_geri_al()
+
+            if skor > en_iyi:
+                en_iyi = skor
+                en_iyi_hamle = hamle
+                if skor > alpha:
+                    alpha = skor
+                    if alpha >= beta:
+                        # Beta cutoff - sessiz hamle ise katil ve geçmiş tablolarına yaz
+                        if (hamle >> ALINAN_KAYDIR) & 15 == BOS and not (hamle >> TERFI_KAYDIR) & 15:
+                            self.hamle_secici.katil_ekle(hamle, ply)
+                            self.hamle_secici.gecmis_guncelle(hamle, tahta.beyaz_sira, derinlik)
+                        break
+
+        # Legal hamle yok: şah altındaysa mat (kökten uzaklığa göre), değilse pat
+        if en_iyi_hamle is None:
+            if sah_tehdidinde:
+                self.mat_sayisi += 1
+                return -self.degerlendirme.mat_skoru(ply)
+            self.pat_sayisi += 1
+            return BERABERLIK_SKORU
+
+        if en_iyi >= beta:
+            sinir = ALT_SINIR
+        elif en_iyi <= alpha_baslangic:
+            sinir = UST_SINIR
         else:
-            min_eval = float('inf')
-            for hamle in hamleler:
-                tahta_kopyasi = copy.deepcopy(tahta)
-                tahta_kopyasi.hamle_yap(hamle)
+            sinir = KESIN
+        self.tt.kaydet(anahtar, derinlik, tt_skoruna_cevir(en_iyi, ply), sinir, en_iyi_hamle)
+
+        return en_iyi
 
-                eval_skor = self.alpha_beta(tahta_kopyasi, derinlik - 1, alpha, beta, True)
-                min_eval = min(min_eval, eval_skor)
-                beta = min(beta, eval_skor)
+    def _tas_malzemesi_var_mi(self, tahta):
+        """Sırası gelen tarafın piyon ve şah dışında taşı var mı (piyon oyunu sonlarında zugzwang riski)"""
+        if tahta.beyaz_sira:
+            return bool(tahta.beyaz_taslar & ~(tahta.beyaz_piyon | tahta.beyaz_sah))
+        return bool(tahta.siyah_taslar & ~(tahta.siyah_piyon | tahta.siyah_sah))
 
-                if beta <= alpha:
-                    break  # Alpha cutoff
+    def sukunet_arama(self, tahta, alpha, beta, ply=0):
+        """Sükunet (quiescence) araması: sadece almalar ve terfiler, durma (stand-pat) skoru ile.
+        ply: kökten uzaklık (mat skorları için)"""
+        self.dugum_sayisi += 1
+        self.sukunet_dugum_sayisi += 1
+        if self.dugum_sayisi >= self._sonraki_kontrol:
+            self._limit_kontrol()
 
-            return min_eval
+        # Şah altındayken durma skoru geçerli değil: tüm kaçış hamleleri aranır
+        if self.legal_bulucu.sah_tehdidinde_mi(tahta, tahta.beyaz_sira):
+            hamleler = self.legal_bulucu.legal_hamleleri_bul(tahta)
+            if not hamleler:
+                self.mat_sayisi += 1
+                return -self.degerlendirme.mat_skoru(ply)
+            en_iyi = -SONSUZ
+        else:
+            # Durma skoru: taraf hiçbir alma yapmadan bu skoru garanti edebilir
+            en_iyi = self.degerlendirme.degerlendir(tahta)
+            if en_iyi >= beta:
+                return en_iyi
+            if en_iyi > alpha:
+                alpha = en_iyi
+            # Sessiz hamleler hiç üretilmez; SEE'ye göre kaybettiren almalar atlanır
+            hamleler = self.hamle_secici.alma_hamleleri(tahta, kaybettirenler=False)
 
-    def minimax(self, tahta, derinlik, maksimize_ediyor):
-        """Basit MiniMax algoritması (Alpha-Beta olmadan)"""
+        for hamle in hamleler:
+            tahta.hamle_yap(hamle)
+            try:
+                skor = -self.sukunet_arama(tahta, -beta, -alpha, ply + 1)
+            finally:
+                tahta.hamle_geri_al()
+
+            if skor > en_iyi:
+                en_iyi = skor
+                if skor > alpha:
+                    alpha = skor
+                    if alpha >= beta:
+                        break
+
+        return en_iyi
+
+    def minimax(self, tahta, derinlik, ply=0):
+        """Basit MiniMax algoritması (Alpha-Beta olmadan, negamax biçiminde)"""
         self.dugum_sayisi += 1
 
         # Terminal düğüm kontrolü
         if derinlik == 0:
             return self.degerlendirme.degerlendir(tahta)
 
-        hamleler = self.hamle_uretici.tum_hamleleri_uret(tahta)
+        hamleler = self.legal_bulucu.legal_hamleleri_bul(tahta)
 
-        # Hamle yoksa
+        # Hamle yoksa mat veya pat
         if not hamleler:
-            return self.degerlendirme.degerlendir(tahta)
-
-        if maksimize_ediyor:
-            max_eval = float('-inf')
-            for hamle in hamleler:
-                tahta_kopyasi = copy.deepcopy(tahta)
-                tahta_kopyasi.hamle_yap(hamle)
-
-                eval_skor = self.minimax(tahta_kopyasi, derinlik - 1, False)
-                max_eval = max(max_eval, eval_skor)
+            if self.legal_bulucu.sah_tehdidinde_mi(tahta, tahta.beyaz_sira):
+                return -self.degerlendirme.mat_skoru(ply)
+            return BERABERLIK_SKORU
 
-            return max_eval
-        else:
-            min_eval = float('inf')
-            for hamle in hamleler:
-                tahta_kopyasi = copy.deepcopy(tahta)
-                tahta_kopyasi.hamle_yap(hamle)
+        en_iyi = -SONSUZ
+        for hamle in hamleler:
+            tahta.hamle_yap(hamle)
+            skor = -self.minimax(tahta, derinlik - 1, ply + 1)
+            tahta.hamle_geri_al()
 
-                eval_skor = self.minimax(tahta_kopyasi, derinlik - 1, True)
-                min_eval = min(min_eval, eval_skor)
+            en_iyi = max(en_iyi, skor)
 
-            return min_eval
+        return en_iyi
 
     def get_istatistikler(self):
         """Arama istatistiklerini döndür"""
-        return {
+        istatistikler = {
             'dugum_sayisi': self.dugum_sayisi,
+            'sukunet_dugum_sayisi': self.sukunet_dugum_sayisi,
+            'beraberlik_sayisi': self.beraberlik_sayisi,
+            'mat_sayisi': self.mat_sayisi,
+            'pat_sayisi': self.pat_sayisi,
+            'null_deneme_sayisi': self.null_deneme_sayisi,
+            'null_kesme_sayisi': self.null_kesme_sayisi,
+            'lmr_sayisi': self.lmr_sayisi,
+            'yeniden_arama_sayisi': self.yeniden_arama_sayisi,
+            'aspirasyon_tasma_sayisi': self.aspirasyon_tasma_sayisi,
             'max_derinlik': self.max_derinlik,
-            'derinlik': self.derinlik
-        }
\ No newline at end of file
+            'derinlik': self.derinlik,
+            'tamamlanan_derinlik': self.tamamlanan_derinlik,
+            'skor': self.son_skor,
+            'sure': self.arama_suresi
+        }
+        istatistikler.update(self.tt.get_istatistikler())
+        istatistikler.update(self.degerlendirme.piyon_tablosu.get_istatistikler())
+        return istatistikler
\ No newline at end of file
@@ -3,29 +3,210 @@ Pozisyon değerlendirme modülü. Taş değerleri, pozisyonel faktörler ve
 piece-square table tabanlı değerlendirme sistemi.
 """
 
+from Sabitler import (BOS, SIYAH_PIYON, BITBOARD_ISIMLERI, BEYAZ_KALE, BEYAZ_AT, BEYAZ_FIL, BEYAZ_VEZIR,
+                      SIYAH_KALE, SIYAH_AT, SIYAH_FIL, SIYAH_VEZIR)
+from HamleUret import (AT_MASKELERI, KALE_MASKELERI, KALE_TABLOLARI, FIL_MASKELERI, FIL_TABLOLARI,
+                       BEYAZ_PIYON_SALDIRI, SIYAH_PIYON_SALDIRI)
+from Zobrist import PiyonHashTablosu
+
+# Mat skoru (kökten uzaklık kadar azaltılır) ve bir skorun mat sayıldığı eşik
+MAT_DEGERI = 30000
+MAT_ESIGI = 25000
+
+# Taş türü değerleri ve oyun fazı ağırlıkları (taş kodu sırası: piyon, kale, at, fil, vezir, şah)
+TAS_DEGERLERI = (100, 500, 320, 330, 900, 0)  # Şah değeri sonsuz olarak kabul edilir
+FAZ_AGIRLIKLARI = (0, 2, 1, 1, 4, 0)
+
+# Açılış pozisyonundaki toplam faz ağırlığı: 4*1 (at) + 4*1 (fil) + 4*2 (kale) + 2*4 (vezir)
+FAZ_MAKS = 24
+
+# Mobilite: taş türü başına saldırılan (kendi taşı olmayan) kare başına puan
+MOBILITE_AGIRLIKLARI = (0, 3, 4, 4, 2, 0)
+
+# Mobilitesi sayılan taşlar ve taş kodu indeksli işaretli ağırlıklar (beyaz pozitif)
+MOBILITE_TASLARI = (BEYAZ_KALE, BEYAZ_AT, BEYAZ_FIL, BEYAZ_VEZIR, SIYAH_KALE, SIYAH_AT, SIYAH_FIL, SIYAH_VEZIR)
+MOBILITE_TABLOSU = MOBILITE_AGIRLIKLARI + tuple(-agirlik for agirlik in MOBILITE_AGIRLIKLARI)
+
+# Geçer piyon bonusu, tarafın kendi bakışından satıra göre (orta oyun / son oyun, faza göre karışır)
+GECER_BONUSU_ORTA = (0, 5, 10, 15, 25, 40, 60, 0)
+GECER_BONUSU_SON = (0, 10, 20, 35, 60, 90, 130, 0)
+
+# Kendi piyonunca korunan geçer piyona ek bonus (orta oyun / son oyun)
+KORUMALI_GECER_BONUSU_ORTA = 10
+KORUMALI_GECER_BONUSU_SON = 25
+
+# Aday geçer piyon bonusu (satıra göre, sadece piyonlara bağlı - piyon tablosunda saklanır)
+ADAY_BONUSU = (0, 3, 5, 8, 12, 18, 0, 0)
+
+# Sütun ve komşu sütun maskeleri
+SUTUN_MASKELERI = tuple(0x0101010101010101 << sutun for sutun in range(8))
+KOMSU_SUTUN_MASKELERI = tuple((SUTUN_MASKELERI[sutun - 1] if sutun > 0 else 0) |
+                              (SUTUN_MASKELERI[sutun + 1] if sutun < 7 else 0) for sutun in range(8))
+
+# Piyon PST (beyaz perspektifinden, siyah için kare 63 - kare olarak çevrilir)
+PIYON_PST = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0
+)
+
+# At PST
+AT_PST = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50
+)
+
+# Fil PST
+FIL_PST = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20
+)
+
+# Kale PST
+KALE_PST = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0
+)
+
+# Vezir PST
+VEZIR_PST = (
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20
+)
+
+# Şah PST (açılış/orta oyun)
+SAH_ACILIS_PST = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20
+)
+
+# Şah PST (son oyun)
+SAH_SON_PST = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50
+)
+
+
+def _skor_tablosu_olustur(sah_pst):
+    """Taş kodu x kare -> malzeme + PST (beyaz pozitif, siyah negatif; siyah için kare çevrilir)"""
+    pst_tablolari = (PIYON_PST, KALE_PST, AT_PST, FIL_PST, VEZIR_PST, sah_pst)
+    tablo = []
+    for kod in range(BOS):
+        tur = kod % SIYAH_PIYON
+        beyaz = kod < SIYAH_PIYON
+        isaret = 1 if beyaz else -1
+        tablo.append(tuple(isaret * (TAS_DEGERLERI[tur] + pst_tablolari[tur][kare if beyaz else 63 - kare])
+                           for kare in range(64)))
+    return tuple(tablo)
+
+
+# Tahta'nın artımlı değerlendirme toplamları için taş kodu indeksli tablolar:
+# orta oyun / son oyun malzeme+PST skoru ve faz ağırlığı. Sadece şah PST'si faza göre değişir
+ORTA_OYUN_TABLOSU = _skor_tablosu_olustur(SAH_ACILIS_PST)
+SON_OYUN_TABLOSU = _skor_tablosu_olustur(SAH_SON_PST)
+FAZ_TABLOSU = FAZ_AGIRLIKLARI * 2
+
+
+def _piyon_maskeleri_olustur():
+    """Renk (0 beyaz, 1 siyah) ve kare başına piyon maskeleri:
+    ön açıklık (aynı sütunda öndeki kareler), geçer maskesi (aynı ve komşu sütunlarda öndeki kareler),
+    komşu arka (komşu sütunlarda aynı satır ve gerideki kareler)"""
+    on_aciklik = ([0] * 64, [0] * 64)
+    gecer_maskeleri = ([0] * 64, [0] * 64)
+    komsu_arka = ([0] * 64, [0] * 64)
+    for kare in range(64):
+        satir, sutun = divmod(kare, 8)
+        for renk, on_satirlar in ((0, range(satir + 1, 8)), (1, range(satir))):
+            on = 0
+            for on_satir in on_satirlar:
+                on |= 0xFF << (8 * on_satir)
+            on_aciklik[renk][kare] = on & SUTUN_MASKELERI[sutun]
+            gecer_maskeleri[renk][kare] = on & (SUTUN_MASKELERI[sutun] | KOMSU_SUTUN_MASKELERI[sutun])
+            komsu_arka[renk][kare] = ~on & KOMSU_SUTUN_MASKELERI[sutun]
+    return (tuple(map(tuple, on_aciklik)), tuple(map(tuple, gecer_maskeleri)), tuple(map(tuple, komsu_arka)))
+
+
+ON_ACIKLIK, GECER_MASKELERI, KOMSU_ARKA_MASKELERI = _piyon_maskeleri_olustur()
+
+
+def sutun_kumesi(piyonlar):
+    """Piyon bulunan sütunlar, 8 bitlik küme olarak (sütun doldurma: tüm satırlar 1. satıra katlanır)"""
+    piyonlar |= piyonlar >> 32
+    piyonlar |= piyonlar >> 16
+    piyonlar |= piyonlar >> 8
+    return piyonlar & 0xFF
+
+
+def kademeli_skor(orta_oyun, son_oyun, faz):
+    """Orta ve son oyun skorlarını faz ağırlığına göre karıştır (faz = FAZ_MAKS: açılış, 0: son oyun)"""
+    faz = min(faz, FAZ_MAKS)  # Terfilerle açılış toplamı aşılabilir
+    return (orta_oyun * faz + son_oyun * (FAZ_MAKS - faz)) // FAZ_MAKS
+
+
+def malzeme_pst_hesapla(tahta):
+    """Orta oyun, son oyun skoru ve faz ağırlığını sıfırdan hesapla: (orta_oyun, son_oyun, faz).
+    12 taş bitboard'unun set bitleri üzerinde tek geçiş; Tahta'nın artımlı toplamlarına eşit olmalıdır"""
+    orta_oyun = son_oyun = faz = 0
+    for kod, isim in enumerate(BITBOARD_ISIMLERI):
+        bitboard = getattr(tahta, isim)
+        if not bitboard:
+            continue
+        orta_tablo = ORTA_OYUN_TABLOSU[kod]
+        son_tablo = SON_OYUN_TABLOSU[kod]
+        faz += FAZ_TABLOSU[kod] * bin(bitboard).count('1')
+        while bitboard:
+            kare = (bitboard & -bitboard).bit_length() - 1
+            orta_oyun += orta_tablo[kare]
+            son_oyun += son_tablo[kare]
+            bitboard &= bitboard - 1
+    return orta_oyun, son_oyun, faz
+
 
 class Degerlendirici:
     def __init__(self):
-        # Temel taş değerleri (centipawn cinsinden)
-        self.tas_degerleri = {
-            'piyon': 100,
-            'at': 320,
-            'fil': 330,
-            'kale': 500,
-            'vezir': 900,
-            'sah': 0  # Şah değeri sonsuz olarak kabul edilir
-        }
-
-        # Piece-Square Tables (PST) - açılış/orta oyun için
-        self._pst_tablolarini_olustur()
-
-        # Oyun fazı tespiti için malzeme değerleri
-        self.faz_malzeme_degerleri = {
-            'piyon': 0, 'at': 1, 'fil': 1, 'kale': 2, 'vezir': 4
-        }
-
-        # Maksimum malzeme skoru (açılış pozisyonu)
-        self.max_malzeme_skoru = 78  # 16*0 + 4*1 + 4*1 + 4*2 + 2*4
+        # Piyon yapısı önbelleği (Tahta.piyon_anahtari ile)
+        self.piyon_tablosu = PiyonHashTablosu()
 
     def degerlendir(self, tahta):
         """Arama modülü tarafından çağrılan ana değerlendirme fonksiyonu"""
@@ -33,117 +214,15 @@ class Degerlendirici:
         skor = self.pozisyon_degerlendir(tahta)
         return skor if tahta.beyaz_sira else -skor
 
-    def _pst_tablolarini_olustur(self):
-        """Piece-Square Table tablolarını oluştur"""
-
-        # Piyon PST (beyaz perspektifinden)
-        self.piyon_pst = [
-            0, 0, 0, 0, 0, 0, 0, 0,
-            50, 50, 50, 50, 50, 50, 50, 50,
-            10, 10, 20, 30, 30, 20, 10, 10,
-            5, 5, 10, 25, 25, 10, 5, 5,
-            0, 0, 0, 20, 20, 0, 0, 0,
-            5, -5, -10, 0, 0, -10, -5, 5,
-            5, 10, 10, -20, -20, 10, 10, 5,
-            0, 0, 0, 0, 0, 0, 0, 0
-        ]
-
-        # At PST
-        self.at_pst = [
-            -50, -40, -30, -30, -30, -30, -40, -50,
-            -40, -20, 0, 0, 0, 0, -20, -40,
-            -30, 0, 10, 15, 15, 10, 0, -30,
-            -30, 5, 15, 20, 20, 15, 5, -30,
-            -30, 0, 15, 20, 20, 15, 0, -30,
-            -30, 5, 10, 15, 15, 10, 5, -30,
-            -40, -20, 0, 5, 5, 0, -20, -40,
-            -50, -40, -30, -30, -30, -30, -40, -50
-        ]
-
-        # Fil PST
-        self.fil_pst = [
-            -20, -10, -10, -10, -10, -10, -10, -20,
-            -10, 0, 0, 0, 0, 0, 0, -10,
-            -10, 0, 5, 10, 10, 5, 0, -10,
-            -10, 5, 5, 10, 10, 5, 5, -10,
-            -10, 0, 10, 10, 10, 10, 0, -10,
-            -10, 10, 10, 10, 10, 10, 10, -10,
-            -10, 5, 0, 0, 0, 0, 5, -10,
-            -20, -10, -10, -10, -10, -10, -10, -20
-        ]
-
-        # Kale PST
-        self.kale_pst = [
-            0, 0, 0, 0, 0, 0, 0, 0,
-            5, 10, 10, 10, 10, 10, 10, 5,
-            -5, 0, 0, 0, 0, 0, 0, -5,
-            -5, 0, 0, 0, 0, 0, 0, -5,
-            -5, 0, 0, 0, 0, 0, 0, -5,
-            -5, 0, 0, 0, 0, 0, 0, -5,
-            -5, 0, 0, 0, 0, 0, 0, -5,
-            0, 0, 0, 5, 5, 0, 0, 0
-        ]
-
-        # Vezir PST
-        self.vezir_pst = [
-            -20, -10, -10, -5, -5, -10, -10, -20,
-            -10, 0, 0, 0, 0, 0, 0, -10,
-            -10, 0, 5, 5, 5, 5, 0, -10,
-            -5, 0, 5, 5, 5, 5, 0, -5,
-            0, 0, 5, 5, 5, 5, 0, -5,
-            -10, 5, 5, 5, 5, 5, 0, -10,
-            -10, 0, 5, 0, 0, 0, 0, -10,
-            -20, -10, -10, -5, -5, -10, -10, -20
-        ]
-
-        # Şah PST (açılış/orta oyun)
-        self.sah_acilis_pst = [
-            -30, -40, -40, -50, -50, -40, -40, -30,
-            -30, -40, -40, -50, -50, -40, -40, -30,
-            -30, -40, -40, -50, -50, -40, -40, -30,
-            -30, -40, -40, -50, -50, -40, -40, -30,
-            -20, -30, -30, -40, -40, -30, -30, -20,
-            -10, -20, -20, -20, -20, -20, -20, -10,
-            20, 20, 0, 0, 0, 0, 20, 20,
-            20, 30, 10, 0, 0, 10, 30, 20
-        ]
-
-        # Şah PST (son oyun)
-        self.sah_son_pst = [
-            -50, -40, -30, -20, -20, -30, -40, -50,
-            -30, -20, -10, 0, 0, -10, -20, -30,
-            -30, -10, 20, 30, 30, 20, -10, -30,
-            -30, -10, 30, 40, 40, 30, -10, -30,
-            -30, -10, 30, 40, 40, 30, -10, -30,
-            -30, -10, 20, 30, 30, 20, -10, -30,
-            -30, -30, 0, 0, 0, 0, -30, -30,
-            -50, -30, -30, -30, -30, -30, -30, -50
-        ]
-
-        # PST lookup dictionary
-        self.pst_tablosu = {
-            'piyon': self.piyon_pst,
-            'at': self.at_pst,
-            'fil': self.fil_pst,
-            'kale': self.kale_pst,
-            'vezir': self.vezir_pst,
-            'sah': self.sah_acilis_pst  # Varsayılan olarak açılış PST
-        }
-
     def pozisyon_degerlendir(self, tahta):
         """Ana değerlendirme fonksiyonu"""
         skor = 0
 
-        # Malzeme ve pozisyonel değerlendirme
-        skor += self.malzeme_dengesi_hesapla(tahta)
-        skor += self.pozisyonel_deger_hesapla(tahta)
+        # Malzeme ve pozisyonel değerlendirme (Tahta'nın artımlı orta/son oyun toplamlarından)
+        skor += self.malzeme_pst_skoru(tahta)
 
         # Mobilite değerlendirmesi
-        try:
-            skor += self.mobilite_hesapla(tahta)
-        except:
-            # Mobilite hesaplaması başarısız olursa pas geç
-            pass
+        skor += self.mobilite_hesapla(tahta)
 
         # Şah güvenliği
         try:
@@ -152,139 +231,47 @@ class Degerlendirici:
             # Şah güvenliği hesaplaması başarısız olursa pas geç
             pass
 
-        # Piyon yapısı
-        try:
-            skor += self.piyon_yapisi_hesapla(tahta)
-        except:
-            # Piyon yapısı hesaplaması başarısız olursa pas geç
-            pass
+        # Piyon yapısı (piyon hash tablosu üzerinden)
+        skor += self.piyon_yapisi_hesapla(tahta)
 
         # Her zaman beyaz perspektifinden döndür (pozitif = beyaz iyi, negatif = siyah iyi)
         return skor
 
-    def malzeme_dengesi_hesapla(self, tahta):
-        """Malzeme dengesini hesapla"""
-        beyaz_malzeme = 0
-        siyah_malzeme = 0
+    def malzeme_pst_skoru(self, tahta):
+        """Artımlı malzeme+PST toplamlarının faza göre karışımı (O(1))"""
+        return kademeli_skor(tahta.orta_oyun_skoru, tahta.son_oyun_skoru, tahta.faz_agirligi)
 
-        try:
-            # Bitboard'ları kullanarak hızlı hesaplama
-            beyaz_malzeme += tahta.bit_sayisi(tahta.beyaz_piyon) * self.tas_degerleri['piyon']
-            beyaz_malzeme += tahta.bit_sayisi(tahta.beyaz_at) * self.tas_degerleri['at']
-            beyaz_malzeme += tahta.bit_sayisi(tahta.beyaz_fil) * self.tas_degerleri['fil']
-            beyaz_malzeme += tahta.bit_sayisi(tahta.beyaz_kale) * self.tas_degerleri['kale']
-            beyaz_malzeme += tahta.bit_sayisi(tahta.beyaz_vezir) * self.tas_degerleri['vezir']
-
-            siyah_malzeme += tahta.bit_sayisi(tahta.siyah_piyon) * self.tas_degerleri['piyon']
-            siyah_malzeme += tahta.bit_sayisi(tahta.siyah_at) * self.tas_degerleri['at']
-            siyah_malzeme += tahta.bit_sayisi(tahta.siyah_fil) * self.tas_degerleri['fil']
-            siyah_malzeme += tahta.bit_sayisi(tahta.siyah_kale) * self.tas_degerleri['kale']
-            siyah_malzeme += tahta.bit_sayisi(tahta.siyah_vezir) * self.tas_degerleri['vezir']
-        except:
-            # Bitboard metodları yoksa basit malzeme sayımı yap
-            for kare in range(64):
-                tas_info = tahta.karedeki_tas(kare)
-                if tas_info:
-                    renk, tas_turu = tas_info
-                    if tas_turu in self.tas_degerleri:
-                        if renk == 'beyaz':
-                            beyaz_malzeme += self.tas_degerleri[tas_turu]
-                        else:
-                            siyah_malzeme += self.tas_degerleri[tas_turu]
-
-        return beyaz_malzeme - siyah_malzeme
-
-    def pozisyonel_deger_hesapla(self, tahta):
-        """Piece-Square Table kullanarak pozisyonel değer hesapla"""
+    def mobilite_hesapla(self, tahta):
+        """Taş mobilitesi: her at/fil/kale/vezirin kendi taşı olmayan saldırı karelerinin sayısı,
+        tür ağırlığıyla. Ortak saldırı tablolarından popcount; hamle listesi yok, tahta değişmez"""
+        dolu = tahta.tum_taslar
+        serbest_kareler = (~tahta.beyaz_taslar, ~tahta.siyah_taslar)
         skor = 0
 
-        try:
-            oyun_fazi = self.oyun_fazi_hesapla(tahta)
-        except:
-            oyun_fazi = 0.5  # Varsayılan orta oyun
-
-        # Tüm taşlar için PST değerlerini hesapla
-        for kare in range(64):
-            try:
-                tas_bilgisi = tahta.karedeki_tas(kare)
-                if tas_bilgisi:
-                    renk, tur = tas_bilgisi
-                    pst_degeri = self.pst_deger_al(tur, kare, renk, oyun_fazi)
-
-                    if renk == 'beyaz':
-                        skor += pst_degeri
-                    else:
-                        skor -= pst_degeri
-            except:
+        for kod in MOBILITE_TASLARI:
+            taslar = getattr(tahta, BITBOARD_ISIMLERI[kod])
+            if not taslar:
                 continue
+            serbest = serbest_kareler[kod >= SIYAH_PIYON]
+            tur = kod % SIYAH_PIYON
+            sayi = 0
+            while taslar:
+                kare = (taslar & -taslar).bit_length() - 1
+                taslar &= taslar - 1
+                if tur == BEYAZ_AT:
+                    saldiri = AT_MASKELERI[kare]
+                elif tur == BEYAZ_FIL:
+                    saldiri = FIL_TABLOLARI[kare][dolu & FIL_MASKELERI[kare]]
+                elif tur == BEYAZ_KALE:
+                    saldiri = KALE_TABLOLARI[kare][dolu & KALE_MASKELERI[kare]]
+                else:
+                    saldiri = (KALE_TABLOLARI[kare][dolu & KALE_MASKELERI[kare]] |
+                               FIL_TABLOLARI[kare][dolu & FIL_MASKELERI[kare]])
+                sayi += bin(saldiri & serbest).count('1')
+            skor += MOBILITE_TABLOSU[kod] * sayi
 
         return skor
 
-    def pst_deger_al(self, tas_turu, kare, renk, oyun_fazi):
-        """Belirtilen taş ve kare için PST değeri al"""
-        if tas_turu == 'sah':
-            # Şah için oyun fazına göre PST seç
-            if oyun_fazi > 0.5:  # Son oyun
-                pst = self.sah_son_pst
-            else:  # Açılış/orta oyun
-                pst = self.sah_acilis_pst
-        else:
-            pst = self.pst_tablosu.get(tas_turu, [0] * 64)
-
-        # Siyah taşlar için kareyi çevir (flip)
-        if renk == 'siyah':
-            kare = 63 - kare
-
-        return pst[kare] if kare < len(pst) else 0
-
-    def oyun_fazi_hesapla(self, tahta):
-        """Oyun fazını hesapla (0=açılış, 1=son oyun)"""
-        try:
-            mevcut_malzeme = 0
-
-            # Piyon hariç malzeme sayısını hesapla
-            mevcut_malzeme += tahta.bit_sayisi(tahta.beyaz_at) * self.faz_malzeme_degerleri['at']
-            mevcut_malzeme += tahta.bit_sayisi(tahta.beyaz_fil) * self.faz_malzeme_degerleri['fil']
-            mevcut_malzeme += tahta.bit_sayisi(tahta.beyaz_kale) * self.faz_malzeme_degerleri['kale']
-            mevcut_malzeme += tahta.bit_sayisi(tahta.beyaz_vezir) * self.faz_malzeme_degerleri['vezir']
-
-            mevcut_malzeme += tahta.bit_sayisi(tahta.siyah_at) * self.faz_malzeme_degerleri['at']
-            mevcut_malzeme += tahta.bit_sayisi(tahta.siyah_fil) * self.faz_malzeme_degerleri['fil']
-            mevcut_malzeme += tahta.bit_sayisi(tahta.siyah_kale) * self.faz_malzeme_degerleri['kale']
-            mevcut_malzeme += tahta.bit_sayisi(tahta.siyah_vezir) * self.faz_malzeme_degerleri['vezir']
-
-            # Oyun fazı oranını hesapla
-            faz_orani = 1.0 - (mevcut_malzeme / self.max_malzeme_skoru)
-            return max(0.0, min(1.0, faz_orani))
-        except:
-            return 0.5  # Varsayılan orta oyun
-
-    def mobilite_hesapla(self, tahta):
-        """Taş mobilitesini hesapla"""
-        # Basit mobilite hesaplama - geliştirilmesi gerekebilir
-        try:
-            from HamleUret import HamleUretici
-            hamle_uretici = HamleUretici()
-
-            # Mevcut sırayı kaydet
-            orijinal_sira = tahta.beyaz_sira
-
-            # Beyaz hamleleri
-            tahta.beyaz_sira = True
-            beyaz_hamleler = len(hamle_uretici.tum_hamleleri_uret(tahta))
-
-            # Siyah hamleleri
-            tahta.beyaz_sira = False
-            siyah_hamleler = len(hamle_uretici.tum_hamleleri_uret(tahta))
-
-            # Sırayı geri yükle
-            tahta.beyaz_sira = orijinal_sira
-
-            mobilite_fark = (beyaz_hamleler - siyah_hamleler) * 5
-            return mobilite_fark
-        except:
-            return 0
-
     def sah_guvenlik_hesapla(self, tahta):
         """Şah güvenliğini hesapla"""
         try:
@@ -304,85 +291,124 @@ class Degerlendirici:
             return 0
 
     def piyon_yapisi_hesapla(self, tahta):
-        """Piyon yapısını değerlendir"""
-        try:
-            skor = 0
+        """Piyon yapısını değerlendir.
+        Sadece piyonlara bağlı kısım (skor ve geçer piyonlar) piyon hash tablosundan okunur"""
+        kayit = self.piyon_tablosu.sorgula(tahta.piyon_anahtari)
+        if kayit is None:
+            kayit = self.piyon_yapisi_degerlendir(tahta)
+            self.piyon_tablosu.kaydet(tahta.piyon_anahtari, *kayit)
+        skor, beyaz_gecerler, siyah_gecerler = kayit
+
+        # Geçer piyonları ödüllendir
+        skor += self.gecer_piyon_bonusu(tahta, beyaz_gecerler, True)  # Beyaz
+        skor -= self.gecer_piyon_bonusu(tahta, siyah_gecerler, False)  # Siyah
 
-            # Çiftlenmiş piyonları penalize et
-            skor -= self.ciftlenmis_piyon_penaltisi(tahta, True) * 50  # Beyaz
-            skor += self.ciftlenmis_piyon_penaltisi(tahta, False) * 50  # Siyah
+        return skor
 
-            # İzole piyonları penalize et
-            skor -= self.izole_piyon_penaltisi(tahta, True) * 20  # Beyaz
-            skor += self.izole_piyon_penaltisi(tahta, False) * 20  # Siyah
+    def piyon_yapisi_degerlendir(self, tahta):
+        """Sadece piyon konumuna bağlı terimler: (skor, beyaz geçer piyonlar, siyah geçer piyonlar)"""
+        skor = 0
 
-            # Geçer piyonları ödüllendir
-            skor += self.gecer_piyon_bonusu(tahta, True) * 20  # Beyaz
-            skor -= self.gecer_piyon_bonusu(tahta, False) * 20  # Siyah
+        # Çiftlenmiş piyonları penalize et
+        skor -= self.ciftlenmis_piyon_penaltisi(tahta, True) * 50  # Beyaz
+        skor += self.ciftlenmis_piyon_penaltisi(tahta, False) * 50  # Siyah
 
-            return skor
-        except:
-            return 0
+        # İzole piyonları penalize et
+        skor -= self.izole_piyon_penaltisi(tahta, True) * 20  # Beyaz
+        skor += self.izole_piyon_penaltisi(tahta, False) * 20  # Siyah
 
-    def ciftlenmis_piyon_penaltisi(self, tahta, beyaz):
-        """Çiftlenmiş piyon sayısını hesapla"""
-        try:
-            piyonlar = tahta.beyaz_piyon if beyaz else tahta.siyah_piyon
-            ciftlenmis_sayisi = 0
+        beyaz_gecerler = self.gecer_piyonlari_bul(tahta, True)
+        siyah_gecerler = self.gecer_piyonlari_bul(tahta, False)
 
-            for sutun in range(8):
-                sutun_maski = 0x0101010101010101 << sutun
-                sutun_piyonlari = piyonlar & sutun_maski
-                piyon_sayisi = tahta.bit_sayisi(sutun_piyonlari)
+        # Aday geçer piyonları ödüllendir
+        skor += self.aday_piyon_bonusu(tahta, beyaz_gecerler, True)  # Beyaz
+        skor -= self.aday_piyon_bonusu(tahta, siyah_gecerler, False)  # Siyah
 
-                if piyon_sayisi > 1:
-                    ciftlenmis_sayisi += piyon_sayisi - 1
+        return skor, beyaz_gecerler, siyah_gecerler
 
-            return ciftlenmis_sayisi
-        except:
-            return 0
+    def ciftlenmis_piyon_penaltisi(self, tahta, beyaz):
+        """Çiftlenmiş piyon sayısını hesapla (piyon sayısı - piyonlu sütun sayısı)"""
+        piyonlar = tahta.beyaz_piyon if beyaz else tahta.siyah_piyon
+        return tahta.bit_sayisi(piyonlar) - tahta.bit_sayisi(sutun_kumesi(piyonlar))
 
     def izole_piyon_penaltisi(self, tahta, beyaz):
-        """İzole piyon sayısını hesapla"""
-        try:
-            piyonlar = tahta.beyaz_piyon if beyaz else tahta.siyah_piyon
-            izole_sayisi = 0
-
-            for sutun in range(8):
-                sutun_maski = 0x0101010101010101 << sutun
-                sutun_piyonlari = piyonlar & sutun_maski
-
-                if sutun_piyonlari != 0:
-                    # Komşu sütunlarda piyon var mı kontrol et
-                    komsu_var = False
-
-                    if sutun > 0:  # Sol komşu
-                        sol_maski = 0x0101010101010101 << (sutun - 1)
-                        if piyonlar & sol_maski:
-                            komsu_var = True
-
-                    if sutun < 7:  # Sağ komşu
-                        sag_maski = 0x0101010101010101 << (sutun + 1)
-                        if piyonlar & sag_maski:
-                            komsu_var = True
-
-                    if not komsu_var:
-                        izole_sayisi += 1
-
-            return izole_sayisi
-        except:
+        """İzole piyon sayısını hesapla (komşu sütunlarında piyon olmayan piyonlu sütunlar)"""
+        sutunlar = sutun_kumesi(tahta.beyaz_piyon if beyaz else tahta.siyah_piyon)
+        komsu_sutunlar = ((sutunlar << 1) | (sutunlar >> 1)) & 0xFF
+        return tahta.bit_sayisi(sutunlar & ~komsu_sutunlar)
+
+    def gecer_piyonlari_bul(self, tahta, beyaz):
+        """Geçer piyonların bitboard'u: önünde ve komşu sütunlarda önünde rakip piyon olmayan,
+        aynı sütunda önünde kendi piyonu da olmayan piyonlar"""
+        if beyaz:
+            piyonlar, rakip_piyonlar, renk = tahta.beyaz_piyon, tahta.siyah_piyon, 0
+        else:
+            piyonlar, rakip_piyonlar, renk = tahta.siyah_piyon, tahta.beyaz_piyon, 1
+        gecer_maskeleri = GECER_MASKELERI[renk]
+        on_aciklik = ON_ACIKLIK[renk]
+
+        gecerler = 0
+        kalan = piyonlar
+        while kalan:
+            bit = kalan & -kalan
+            kare = bit.bit_length() - 1
+            kalan ^= bit
+            if not (rakip_piyonlar & gecer_maskeleri[kare]) and not (piyonlar & on_aciklik[kare]):
+                gecerler |= bit
+        return gecerler
+
+    def aday_piyon_bonusu(self, tahta, gecerler, beyaz):
+        """Aday geçer piyon bonusu: sütunu önünde boş, komşu sütunlardaki destekçi piyon sayısı
+        önündeki rakip bekçi piyon sayısından az olmayan (henüz geçer olmayan) piyonlar"""
+        if beyaz:
+            piyonlar, rakip_piyonlar, renk = tahta.beyaz_piyon, tahta.siyah_piyon, 0
+        else:
+            piyonlar, rakip_piyonlar, renk = tahta.siyah_piyon, tahta.beyaz_piyon, 1
+        tum_piyonlar = piyonlar | rakip_piyonlar
+        on_aciklik = ON_ACIKLIK[renk]
+        gecer_maskeleri = GECER_MASKELERI[renk]
+        komsu_arka = KOMSU_ARKA_MASKELERI[renk]
+
+        bonus = 0
+        kalan = piyonlar & ~gecerler
+        while kalan:
+            kare = (kalan & -kalan).bit_length() - 1
+            kalan &= kalan - 1
+            if tum_piyonlar & on_aciklik[kare]:
+                continue
+            bekciler = rakip_piyonlar & gecer_maskeleri[kare]
+            destekciler = piyonlar & komsu_arka[kare]
+            if tahta.bit_sayisi(destekciler) >= tahta.bit_sayisi(bekciler):
+                bonus += ADAY_BONUSU[kare >> 3 if beyaz else 7 - (kare >> 3)]
+        return bonus
+
+    def gecer_piyon_bonusu(self, tahta, gecerler, beyaz):
+        """Geçer piyon bonusu: satıra göre, kendi piyonunca korunan geçerlere ek bonus,
+        orta/son oyun değerleri faza göre karışır (son oyunda geçer piyonlar daha değerli)"""
+        if not gecerler:
             return 0
-
-    def gecer_piyon_bonusu(self, tahta, beyaz):
-        """Geçer piyon sayısını hesapla"""
-        # Basitleştirilmiş geçer piyon tespiti
-        # Gerçek implementasyon daha karmaşık olmalı
-        return 0  # Şimdilik implementasyon yok
+        piyonlar = tahta.beyaz_piyon if beyaz else tahta.siyah_piyon
+        # Bir karedeki piyonu koruyan kendi piyonları, o karedeki rakip renkli piyonun saldırdığı karelerdedir
+        koruma_maskeleri = SIYAH_PIYON_SALDIRI if beyaz else BEYAZ_PIYON_SALDIRI
+
+        orta_oyun = 0
+        son_oyun = 0
+        while gecerler:
+            kare = (gecerler & -gecerler).bit_length() - 1
+            gecerler &= gecerler - 1
+            satir = kare >> 3 if beyaz else 7 - (kare >> 3)
+            orta_oyun += GECER_BONUSU_ORTA[satir]
+            son_oyun += GECER_BONUSU_SON[satir]
+            if piyonlar & koruma_maskeleri[kare]:
+                orta_oyun += KORUMALI_GECER_BONUSU_ORTA
+                son_oyun += KORUMALI_GECER_BONUSU_SON
+        return kademeli_skor(orta_oyun, son_oyun, tahta.faz_agirligi)
 
     def mat_skoru(self, derinlik):
         """Mat skorunu hesapla"""
-        return 30000 - derinlik
+        return MAT_DEGERI - derinlik
 
     def skor_mat_mi(self, skor):
         """Skor mat skoru mu kontrol et"""
-        return abs(skor) > 25000
\ No newline at end of file
+        return abs(skor) > MAT_ESIGI
+
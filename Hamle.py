@@ -0,0 +1,155 @@
+"""
+Tamsayı hamle kodlaması. Her hamle tek bir int içinde paketlenir:
+kaynak, hedef, hamle bayrağı, terfi taşı, oynayan taş ve alınan taş kodu.
+
+Bit düzeni:
+    0-5   kaynak kare
+    6-11  hedef kare
+    12-14 bayrak (NORMAL, ALMA, IKI_KARE, ...)
+    15-18 terfi taşı kodu (terfi yoksa 0)
+    19-22 oynayan taş kodu
+    23-26 alınan taş kodu (alma yoksa BOS)
+"""
+
+from Sabitler import BOS, BEYAZ_PIYON, SIYAH_PIYON, TAS_BILGILERI, TAS_KODLARI, TAS_TURLERI
+
+# Hamle bayrakları
+NORMAL = 0
+ALMA = 1
+IKI_KARE = 2
+EN_PASSANT = 3
+KISA_ROK = 4
+UZUN_ROK = 5
+TERFI = 6
+TERFI_ALMA = 7
+
+# Bayrak <-> eski string etiketleri (GUI ve debug çıktıları için)
+BAYRAK_ISIMLERI = ('normal', 'alma', 'iki_kare', 'en_passant',
+                   'kisa_rok', 'uzun_rok', 'terfi', 'terfi_alma')
+BAYRAK_KODLARI = {isim: bayrak for bayrak, isim in enumerate(BAYRAK_ISIMLERI)}
+
+# Bit kaydırma miktarları
+HEDEF_KAYDIR = 6
+BAYRAK_KAYDIR = 12
+TERFI_KAYDIR = 15
+TAS_KAYDIR = 19
+ALINAN_KAYDIR = 23
+
+# Alma olmayan hamlelerde alınan taş alanı
+ALINAN_YOK = BOS << ALINAN_KAYDIR
+
+# Hedef karedeki taş kodu -> bayrak + alınan taş alanı (BOS için normal hamle)
+ALINAN_ALANI = tuple((ALMA << BAYRAK_KAYDIR) | (kod << ALINAN_KAYDIR) for kod in range(BOS)) + (ALINAN_YOK,)
+
+# Terfi taşı harfleri (UCI notasyonu)
+TERFI_HARFLERI = {'vezir': 'q', 'kale': 'r', 'fil': 'b', 'at': 'n'}
+
+
+def hamle_kodla(kaynak, hedef, bayrak=NORMAL, tas=BOS, alinan=BOS, terfi=0):
+    """Hamle bileşenlerini tek bir tamsayıya paketle"""
+    return (kaynak | (hedef << HEDEF_KAYDIR) | (bayrak << BAYRAK_KAYDIR) |
+            (terfi << TERFI_KAYDIR) | (tas << TAS_KAYDIR) | (alinan << ALINAN_KAYDIR))
+
+
+def hamle_coz(hamle):
+    """Paketlenmiş hamleyi (kaynak, hedef, bayrak, terfi, tas, alinan) olarak aç"""
+    return (hamle & 63, (hamle >> HEDEF_KAYDIR) & 63, (hamle >> BAYRAK_KAYDIR) & 7,
+            (hamle >> TERFI_KAYDIR) & 15, (hamle >> TAS_KAYDIR) & 15, (hamle >> ALINAN_KAYDIR) & 15)
+
+
+def hamle_kaynak(hamle):
+    """Kaynak kare"""
+    return hamle & 63
+
+
+def hamle_hedef(hamle):
+    """Hedef kare"""
+    return (hamle >> HEDEF_KAYDIR) & 63
+
+
+def hamle_bayrak(hamle):
+    """Hamle bayrağı"""
+    return (hamle >> BAYRAK_KAYDIR) & 7
+
+
+def hamle_terfi(hamle):
+    """Terfi taşı kodu (terfi değilse 0)"""
+    return (hamle >> TERFI_KAYDIR) & 15
+
+
+def hamle_tas(hamle):
+    """Oynayan taşın kodu"""
+    return (hamle >> TAS_KAYDIR) & 15
+
+
+def hamle_alinan(hamle):
+    """Alınan taşın kodu (alma değilse BOS)"""
+    return (hamle >> ALINAN_KAYDIR) & 15
+
+
+def hamle_alma_mi(hamle):
+    """Hamle taş alıyor mu (en passant dahil)"""
+    return (hamle >> ALINAN_KAYDIR) & 15 != BOS
+
+
+def kare_notasyonu(kare):
+    """Kare indeksini satranç notasyonuna çevir (örn: 0 -> a1)"""
+    return chr(ord('a') + kare % 8) + str(kare // 8 + 1)
+
+
+def notasyondan_kare(metin):
+    """Satranç notasyonunu kare indeksine çevir (örn: e4 -> 28)"""
+    return (int(metin[1]) - 1) * 8 + ord(metin[0]) - ord('a')
+
+
+def hamle_metni(hamle):
+    """Hamleyi UCI benzeri metne çevir (örn: e2e4, e7e8q)"""
+    if hamle is None:
+        return '0000'
+    metin = kare_notasyonu(hamle & 63) + kare_notasyonu((hamle >> HEDEF_KAYDIR) & 63)
+    terfi = (hamle >> TERFI_KAYDIR) & 15
+    if terfi:
+        metin += TERFI_HARFLERI[TAS_BILGILERI[terfi][1]]
+    return metin
+
+
+def metinden_hamle(metin, hamleler):
+    """UCI benzeri metni (örn: e2e4, e7e8q) verilen hamle listesindeki tamsayı hamleye çevir"""
+    metin = metin.strip().lower()
+    for hamle in hamleler:
+        if hamle_metni(hamle) == metin:
+            return hamle
+    return None
+
+
+def tuple_hamle_donustur(tahta, hamle):
+    """Eski string etiketli tuple hamleyi, örn. (kaynak, hedef, 'piyon', 'terfi', 'vezir'),
+    verilen tahtaya göre tamsayı hamleye çevir"""
+    kaynak, hedef = hamle[0], hamle[1]
+    ozel_hamle = hamle[3] if len(hamle) > 3 else 'normal'
+    bayrak = BAYRAK_KODLARI.get(ozel_hamle, NORMAL)
+
+    tas = tahta.kareler[kaynak]
+    if bayrak == EN_PASSANT:
+        alinan = SIYAH_PIYON if tas < SIYAH_PIYON else BEYAZ_PIYON
+    else:
+        alinan = tahta.kareler[hedef]
+        if bayrak == NORMAL and alinan != BOS:
+            bayrak = ALMA
+
+    terfi = 0
+    if bayrak in (TERFI, TERFI_ALMA):
+        renk = 'beyaz' if tas < SIYAH_PIYON else 'siyah'
+        terfi_tasi = hamle[4] if len(hamle) > 4 else 'vezir'
+        terfi = TAS_KODLARI[(renk, terfi_tasi)]
+
+    return hamle_kodla(kaynak, hedef, bayrak, tas, alinan, terfi)
+
+
+def hamle_tuple(hamle):
+    """Tamsayı hamleyi eski tuple formatına çevir (debug ve geriye uyumluluk)"""
+    kaynak, hedef, bayrak, terfi, tas, _ = hamle_coz(hamle)
+    tur = TAS_TURLERI[tas % 6]
+    if terfi:
+        return (kaynak, hedef, tur, BAYRAK_ISIMLERI[bayrak], TAS_BILGILERI[terfi][1])
+    return (kaynak, hedef, tur, BAYRAK_ISIMLERI[bayrak])
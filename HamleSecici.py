@@ -0,0 +1,160 @@
+"""
+Kademeli (lazy) hamle seçici ve hamle sıralama. Hamleler aşama aşama üretilir:
+hash hamlesi -> MVV-LVA sıralı kazançlı/eşit almalar -> katil hamleler ->
+geçmiş skoruna göre sessiz hamleler -> SEE'ye göre kaybettiren almalar.
+Her aşama bir önceki tükenince üretilir; erken beta kesmesi olan düğümler
+sessiz hamle üretiminin maliyetini hiç ödemez.
+"""
+
+from LegalHamle import LegalHamleBulucu
+from HamleUret import SEE_DEGERLERI
+from Hamle import ALINAN_KAYDIR, TERFI_KAYDIR, TAS_KAYDIR
+from Sabitler import BOS
+
+# Alma sıralaması için kurban değerleri (taş kodu indeksli, BOS = 0)
+KURBAN_DEGERLERI = SEE_DEGERLERI
+
+# Saldıran taş sırası (en değersiz önce): piyon, at, fil, kale, vezir, şah
+SALDIRAN_SIRASI = (0, 3, 1, 2, 4, 5) * 2 + (0,)
+
+# MVV-LVA: (hamle >> TAS_KAYDIR) & 255 = oynayan taş | alınan taş << 4 -> skor
+# En değerli kurban önce, eşit kurbanda en değersiz saldıran önce
+MVV_LVA = tuple(KURBAN_DEGERLERI[alan >> 4] * 10 - SALDIRAN_SIRASI[alan & 15]
+                if (alan & 15) < BOS and (alan >> 4) <= BOS else 0
+                for alan in range(256))
+
+# Terfi taşı kodu -> sıralama bonusu (terfi yoksa 0)
+TERFI_BONUSU = tuple(KURBAN_DEGERLERI[kod] * 10 if 0 < kod < BOS else 0 for kod in range(16))
+
+# Katil hamle tablosu derinliği ve ply başına slot sayısı
+MAKS_PLY = 128
+KATIL_SLOT = 2
+
+
+def mvv_lva_skoru(hamle):
+    """Alma/terfi sıralama skoru: en değerli kurban, en değersiz saldıran, terfi taşı"""
+    return MVV_LVA[(hamle >> TAS_KAYDIR) & 255] + TERFI_BONUSU[(hamle >> TERFI_KAYDIR) & 15]
+
+
+class HamleSecici:
+    def __init__(self, legal_bulucu=None):
+        self.legal_bulucu = legal_bulucu if legal_bulucu is not None else LegalHamleBulucu()
+
+        # Ply başına iki katil hamle (beta kesmesi yapan sessiz hamleler)
+        self.katiller = [[None] * KATIL_SLOT for _ in range(MAKS_PLY)]
+
+        # Kelebek geçmiş tablosu [renk][kaynak][hedef], düz dizi:
+        # indeks = renk * 4096 + (hamle & 4095) (alt 12 bit kaynak | hedef << 6)
+        self.gecmis = [0] * (2 * 4096)
+
+    def yeni_arama(self):
+        """Yeni arama: katilleri temizle, geçmiş skorlarını yarıya indir (eski bilgi zayıflar)"""
+        for slotlar in self.katiller:
+            slotlar[0] = slotlar[1] = None
+        self.gecmis = [skor >> 1 for skor in self.gecmis]
+
+    def katil_ekle(self, hamle, ply):
+        """Beta kesmesi yapan sessiz hamleyi bu ply'ın katil slotlarına ekle"""
+        if ply >= MAKS_PLY:
+            return
+        slotlar = self.katiller[ply]
+        if slotlar[0] != hamle:
+            slotlar[1] = slotlar[0]
+            slotlar[0] = hamle
+
+    def gecmis_guncelle(self, hamle, beyaz, derinlik):
+        """Beta kesmesi yapan sessiz hamlenin geçmiş skorunu derinlik karesi kadar artır"""
+        self.gecmis[(0 if beyaz else 4096) + (hamle & 4095)] += derinlik * derinlik
+
+    def sessiz_siralama(self, hamleler, beyaz):
+        """Sessiz hamleleri geçmiş skoruna göre (yüksek önce) yerinde sırala"""
+        gecmis = self.gecmis
+        ofset = 0 if beyaz else 4096
+        hamleler.sort(key=lambda hamle: gecmis[ofset + (hamle & 4095)], reverse=True)
+        return hamleler
+
+    def alma_kaybettirir_mi(self, tahta, hamle):
+        """Alma SEE'ye göre malzeme kaybettiriyor mu.
+        Kurban saldırandan değersiz değilse SEE hesaplanmaz (kayıp olamaz)"""
+        if KURBAN_DEGERLERI[(hamle >> ALINAN_KAYDIR) & 15] >= KURBAN_DEGERLERI[(hamle >> TAS_KAYDIR) & 15]:
+            return False
+        return self.legal_bulucu.hamle_uretici.statik_degisim(tahta, hamle) < 0
+
+    def _almalari_ayir(self, tahta, almalar):
+        """MVV-LVA sıralı almaları (kazançlı/eşit, kaybettiren) olarak ayır"""
+        almalar.sort(key=mvv_lva_skoru, reverse=True)
+        iyi_almalar = []
+        kotu_almalar = []
+        for hamle in almalar:
+            if self.alma_kaybettirir_mi(tahta, hamle):
+                kotu_almalar.append(hamle)
+            else:
+                iyi_almalar.append(hamle)
+        return iyi_almalar, kotu_almalar
+
+    def sirala(self, tahta, hamleler):
+        """Tam hamle listesini sırala: kazançlı/eşit almalar ve terfiler (MVV-LVA),
+        geçmiş skorlu sessizler, en son kaybettiren almalar"""
+        almalar = []
+        sessizler = []
+        for hamle in hamleler:
+            if (hamle >> ALINAN_KAYDIR) & 15 != BOS or (hamle >> TERFI_KAYDIR) & 15:
+                almalar.append(hamle)
+            else:
+                sessizler.append(hamle)
+
+        iyi_almalar, kotu_almalar = self._almalari_ayir(tahta, almalar)
+        return iyi_almalar + self.sessiz_siralama(sessizler, tahta.beyaz_sira) + kotu_almalar
+
+    def alma_hamleleri(self, tahta, durum=None, kaybettirenler=True):
+        """Legal alma ve terfi hamleleri, MVV-LVA sıralı.
+        kaybettirenler=False ise SEE'ye göre malzeme kaybettiren almalar atılır (sükunet araması)"""
+        almalar = self.legal_bulucu.legal_alma_hamlelerini_bul(tahta, durum)
+        if kaybettirenler:
+            almalar.sort(key=mvv_lva_skoru, reverse=True)
+            return almalar
+        return self._almalari_ayir(tahta, almalar)[0]
+
+    def hamleler(self, tahta, hash_hamle=None, ply=None):
+        """Legal hamleleri aşamalı olarak veren generator.
+        ply verilirse o ply'ın katil hamleleri kullanılır.
+        Çağıran her hamleyi yapıp geri aldıktan sonra bir sonrakini istemelidir."""
+        bulucu = self.legal_bulucu
+        durum = bulucu.legal_durum_hesapla(tahta)
+
+        # 1) Hash hamlesi - başka bir düğümden geldiği için geçerliliği kontrol edilir
+        if hash_hamle is not None:
+            if bulucu.hamle_gecerli_mi(tahta, hash_hamle):
+                yield hash_hamle
+            else:
+                hash_hamle = None
+
+        # 2) Kazançlı/eşit almalar ve terfiler (MVV-LVA); kaybettirenler sona bırakılır
+        iyi_almalar, kotu_almalar = self._almalari_ayir(
+            tahta, bulucu.legal_alma_hamlelerini_bul(tahta, durum))
+        for hamle in iyi_almalar:
+            if hamle != hash_hamle:
+                yield hamle
+
+        # 3) Katil hamleler - sadece sessiz hamleler, bu pozisyonda legal ise
+        oynanan_katiller = []
+        katil_hamleler = self.katiller[ply] if ply is not None and ply < MAKS_PLY else ()
+        for katil in katil_hamleler:
+            if katil is None or katil == hash_hamle or katil in oynanan_katiller:
+                continue
+            if (katil >> ALINAN_KAYDIR) & 15 != BOS or (katil >> TERFI_KAYDIR) & 15:
+                continue
+            if bulucu.hamle_gecerli_mi(tahta, katil):
+                oynanan_katiller.append(katil)
+                yield katil
+
+        # 4) Sessiz hamleler (geçmiş skoruna göre)
+        sessizler = self.sessiz_siralama(bulucu.legal_sessiz_hamleleri_bul(tahta, durum), tahta.beyaz_sira)
+        for hamle in sessizler:
+            if hamle != hash_hamle and hamle not in oynanan_katiller:
+                yield hamle
+
+        # 5) SEE'ye göre malzeme kaybettiren almalar
+        for hamle in kotu_almalar:
+            if hamle != hash_hamle:
+                yield hamle
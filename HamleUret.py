@@ -1,385 +1,587 @@
 """
 Pseudo-legal hamle üretici. Her taş türü için optimize edilmiş hamle üretimi.
 Bitboard tabanlı hız optimizasyonları ile.
+Hamleler Hamle modülündeki tamsayı formatında üretilir.
 """
 
-class HamleUretici:
-    def __init__(self):
-        self.hamleler = []
-        self._onceden_hesapla()
-
-    def _onceden_hesapla(self):
-        """Sık kullanılan maskeleri ve tabloları önceden hesapla"""
-        # At hamleleri için ön hesaplama
-        self.at_hamle_maskeleri = [0] * 64
-        for kare in range(64):
-            satir, sutun = divmod(kare, 8)
-            mask = 0
-            for ds, dt in [(-2,-1), (-2,1), (-1,-2), (-1,2), (1,-2), (1,2), (2,-1), (2,1)]:
+from Sabitler import (BOS, BITBOARD_ISIMLERI, BEYAZ_PIYON, BEYAZ_KALE, BEYAZ_AT, BEYAZ_FIL, BEYAZ_VEZIR, BEYAZ_SAH,
+                      SIYAH_PIYON, SIYAH_KALE, SIYAH_AT, SIYAH_FIL, SIYAH_VEZIR, SIYAH_SAH)
+from Hamle import (HEDEF_KAYDIR, BAYRAK_KAYDIR, TERFI_KAYDIR, TAS_KAYDIR, ALINAN_KAYDIR, ALINAN_ALANI,
+                   IKI_KARE, EN_PASSANT, KISA_ROK, UZUN_ROK, TERFI, TERFI_ALMA, ALINAN_YOK)
+
+
+# Kale ve fil yönleri (satır, sütun adımı)
+KALE_YONLERI = ((1, 0), (-1, 0), (0, 1), (0, -1))
+FIL_YONLERI = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def _isin_saldirisi(kare, yonler, dolu):
+    """Verilen yönlerde ilk engele kadar (engel dahil) saldırı bitboard'u - tablo kurulumu için"""
+    satir, sutun = divmod(kare, 8)
+    saldiri = 0
+    for ds, dt in yonler:
+        yeni_satir, yeni_sutun = satir + ds, sutun + dt
+        while 0 <= yeni_satir < 8 and 0 <= yeni_sutun < 8:
+            bit = 1 << (yeni_satir * 8 + yeni_sutun)
+            saldiri |= bit
+            if dolu & bit:
+                break
+            yeni_satir += ds
+            yeni_sutun += dt
+    return saldiri
+
+
+def _ilgili_doluluk_maskesi(kare, yonler):
+    """Saldırıyı etkileyebilecek kareler (kenar kareler hariç ışın kareleri)"""
+    satir, sutun = divmod(kare, 8)
+    mask = 0
+    for ds, dt in yonler:
+        yeni_satir, yeni_sutun = satir + ds, sutun + dt
+        while 0 <= yeni_satir + ds < 8 and 0 <= yeni_sutun + dt < 8:
+            mask |= 1 << (yeni_satir * 8 + yeni_sutun)
+            yeni_satir += ds
+            yeni_sutun += dt
+    return mask
+
+
+def _kayan_tas_tablosu(yonler):
+    """Her kare için ilgili doluluk maskesi ve doluluk -> saldırı sözlüğü.
+    Magic bitboard'daki çarp-kaydır yerine Python'da doğrudan (dolu & maske) anahtarı kullanılır."""
+    maskeler = [0] * 64
+    tablolar = [None] * 64
+    for kare in range(64):
+        mask = _ilgili_doluluk_maskesi(kare, yonler)
+        tablo = {}
+        # Maskenin tüm alt kümelerini dolaş (carry-rippler)
+        alt_kume = 0
+        while True:
+            tablo[alt_kume] = _isin_saldirisi(kare, yonler, alt_kume)
+            alt_kume = (alt_kume - mask) & mask
+            if alt_kume == 0:
+                break
+        maskeler[kare] = mask
+        tablolar[kare] = tablo
+    return maskeler, tablolar
+
+
+def _onceden_hesapla():
+    """Sık kullanılan maskeleri ve tabloları önceden hesapla (modül yüklenirken bir kez)"""
+    # At hamleleri için ön hesaplama
+    at_hamle_maskeleri = [0] * 64
+    for kare in range(64):
+        satir, sutun = divmod(kare, 8)
+        mask = 0
+        for ds, dt in [(-2,-1), (-2,1), (-1,-2), (-1,2), (1,-2), (1,2), (2,-1), (2,1)]:
+            yeni_satir, yeni_sutun = satir + ds, sutun + dt
+            if 0 <= yeni_satir < 8 and 0 <= yeni_sutun < 8:
+                mask |= 1 << (yeni_satir * 8 + yeni_sutun)
+        at_hamle_maskeleri[kare] = mask
+
+    # Şah hamleleri için ön hesaplama
+    sah_hamle_maskeleri = [0] * 64
+    for kare in range(64):
+        satir, sutun = divmod(kare, 8)
+        mask = 0
+        for ds in [-1, 0, 1]:
+            for dt in [-1, 0, 1]:
+                if ds == 0 and dt == 0:
+                    continue
                 yeni_satir, yeni_sutun = satir + ds, sutun + dt
                 if 0 <= yeni_satir < 8 and 0 <= yeni_sutun < 8:
                     mask |= 1 << (yeni_satir * 8 + yeni_sutun)
-            self.at_hamle_maskeleri[kare] = mask
-
-        # Şah hamleleri için ön hesaplama
-        self.sah_hamle_maskeleri = [0] * 64
-        for kare in range(64):
-            satir, sutun = divmod(kare, 8)
-            mask = 0
-            for ds in [-1, 0, 1]:
-                for dt in [-1, 0, 1]:
-                    if ds == 0 and dt == 0:
-                        continue
-                    yeni_satir, yeni_sutun = satir + ds, sutun + dt
-                    if 0 <= yeni_satir < 8 and 0 <= yeni_sutun < 8:
-                        mask |= 1 << (yeni_satir * 8 + yeni_sutun)
-            self.sah_hamle_maskeleri[kare] = mask
-
-        # Piyon saldırı maskeleri
-        self.beyaz_piyon_saldiri = [0] * 64
-        self.siyah_piyon_saldiri = [0] * 64
-
-        for kare in range(64):
-            satir, sutun = divmod(kare, 8)
-
-            # Beyaz piyon saldırıları
-            mask = 0
-            if satir < 7:
-                if sutun > 0: mask |= 1 << ((satir + 1) * 8 + sutun - 1)
-                if sutun < 7: mask |= 1 << ((satir + 1) * 8 + sutun + 1)
-            self.beyaz_piyon_saldiri[kare] = mask
-
-            # Siyah piyon saldırıları
-            mask = 0
-            if satir > 0:
-                if sutun > 0: mask |= 1 << ((satir - 1) * 8 + sutun - 1)
-                if sutun < 7: mask |= 1 << ((satir - 1) * 8 + sutun + 1)
-            self.siyah_piyon_saldiri[kare] = mask
-
-    def tum_hamleleri_uret(self, tahta):
-        """Mevcut pozisyon için tüm pseudo-legal hamleleri üret"""
-        self.hamleler = []
-        renk = 'beyaz' if tahta.beyaz_sira else 'siyah'
-
-        if renk == 'beyaz':
-            self._piyon_hamleleri_uret(tahta, True)
-            self._at_hamleleri_uret(tahta, True)
-            self._fil_hamleleri_uret(tahta, True)
-            self._kale_hamleleri_uret(tahta, True)
-            self._vezir_hamleleri_uret(tahta, True)
-            self._sah_hamleleri_uret(tahta, True)
-        else:
-            self._piyon_hamleleri_uret(tahta, False)
-            self._at_hamleleri_uret(tahta, False)
-            self._fil_hamleleri_uret(tahta, False)
-            self._kale_hamleleri_uret(tahta, False)
-            self._vezir_hamleleri_uret(tahta, False)
-            self._sah_hamleleri_uret(tahta, False)
+        sah_hamle_maskeleri[kare] = mask
 
-        return self.hamleler
+    # Piyon saldırı maskeleri
+    beyaz_piyon_saldiri = [0] * 64
+    siyah_piyon_saldiri = [0] * 64
 
-    def saldiri_altinda_mi(self, tahta, kare, beyaz_saldiri):
-        """Belirtilen kare saldırı altında mı kontrol et"""
-        if beyaz_saldiri:
-            # Beyaz taşlar tarafından saldırı kontrolü
-            # Piyon saldırıları
-            if self.siyah_piyon_saldiri[kare] & tahta.beyaz_piyon:
-                return True
+    for kare in range(64):
+        satir, sutun = divmod(kare, 8)
 
-            # At saldırıları
-            if self.at_hamle_maskeleri[kare] & tahta.beyaz_at:
-                return True
+        # Beyaz piyon saldırıları
+        mask = 0
+        if satir < 7:
+            if sutun > 0: mask |= 1 << ((satir + 1) * 8 + sutun - 1)
+            if sutun < 7: mask |= 1 << ((satir + 1) * 8 + sutun + 1)
+        beyaz_piyon_saldiri[kare] = mask
 
-            # Şah saldırıları
-            if self.sah_hamle_maskeleri[kare] & tahta.beyaz_sah:
-                return True
+        # Siyah piyon saldırıları
+        mask = 0
+        if satir > 0:
+            if sutun > 0: mask |= 1 << ((satir - 1) * 8 + sutun - 1)
+            if sutun < 7: mask |= 1 << ((satir - 1) * 8 + sutun + 1)
+        siyah_piyon_saldiri[kare] = mask
 
-            # Çizgisel saldırılar (kale, vezir)
-            if self._cizgisel_saldiri_kontrol(tahta, kare, tahta.beyaz_kale | tahta.beyaz_vezir):
-                return True
+    # Kayan taşlar: ilgili doluluk ile anahtarlanmış saldırı tabloları
+    kale_maskeleri, kale_tablolari = _kayan_tas_tablosu(KALE_YONLERI)
+    fil_maskeleri, fil_tablolari = _kayan_tas_tablosu(FIL_YONLERI)
 
-            # Çapraz saldırılar (fil, vezir)
-            if self._capraz_saldiri_kontrol(tahta, kare, tahta.beyaz_fil | tahta.beyaz_vezir):
-                return True
+    # Aynı hat üzerindeki iki kare arasındaki kareler (iki uç hariç)
+    ara_kareler = [[0] * 64 for _ in range(64)]
+    for kare in range(64):
+        satir, sutun = divmod(kare, 8)
+        for ds, dt in KALE_YONLERI + FIL_YONLERI:
+            arasi = 0
+            yeni_satir, yeni_sutun = satir + ds, sutun + dt
+            while 0 <= yeni_satir < 8 and 0 <= yeni_sutun < 8:
+                hedef = yeni_satir * 8 + yeni_sutun
+                ara_kareler[kare][hedef] = arasi
+                arasi |= 1 << hedef
+                yeni_satir += ds
+                yeni_sutun += dt
 
-        else:
-            # Siyah taşlar tarafından saldırı kontrolü
-            # Piyon saldırıları
-            if self.beyaz_piyon_saldiri[kare] & tahta.siyah_piyon:
-                return True
+    return (at_hamle_maskeleri, sah_hamle_maskeleri, beyaz_piyon_saldiri, siyah_piyon_saldiri,
+            kale_maskeleri, kale_tablolari, fil_maskeleri, fil_tablolari, ara_kareler)
 
-            # At saldırıları
-            if self.at_hamle_maskeleri[kare] & tahta.siyah_at:
-                return True
 
-            # Şah saldırıları
-            if self.sah_hamle_maskeleri[kare] & tahta.siyah_sah:
-                return True
+(AT_MASKELERI, SAH_MASKELERI, BEYAZ_PIYON_SALDIRI, SIYAH_PIYON_SALDIRI,
+ KALE_MASKELERI, KALE_TABLOLARI, FIL_MASKELERI, FIL_TABLOLARI, ARA_KARELER) = _onceden_hesapla()
 
-            # Çizgisel saldırılar (kale, vezir)
-            if self._cizgisel_saldiri_kontrol(tahta, kare, tahta.siyah_kale | tahta.siyah_vezir):
-                return True
+# Hedef maskesi verilmediğinde kullanılan tam tahta
+TUM_KARELER = 0xFFFFFFFFFFFFFFFF
 
-            # Çapraz saldırılar (fil, vezir)
-            if self._capraz_saldiri_kontrol(tahta, kare, tahta.siyah_fil | tahta.siyah_vezir):
-                return True
+# Statik değişim değerlendirmesi (SEE) için taş değerleri (taş kodu indeksli, BOS = 0)
+SEE_DEGERLERI = (100, 500, 320, 330, 900, 20000) * 2 + (0,)
 
-        return False
+# SEE'de sıradaki saldıran aranırken taş kodları, en değersizden (piyon, at, fil, kale, vezir, şah)
+SEE_SIRASI = ((BEYAZ_PIYON, BEYAZ_AT, BEYAZ_FIL, BEYAZ_KALE, BEYAZ_VEZIR, BEYAZ_SAH),
+              (SIYAH_PIYON, SIYAH_AT, SIYAH_FIL, SIYAH_KALE, SIYAH_VEZIR, SIYAH_SAH))
 
-    def _cizgisel_saldiri_kontrol(self, tahta, kare, saldirgan_taslar):
-        """Çizgisel (kale/vezir) saldırı kontrolü"""
-        if saldirgan_taslar == 0:
-            return False
 
-        # Dört doğrusal yön
-        for yon in [1, -1, 8, -8]:
-            hedef = kare + yon
+def kale_saldirilari(kare, dolu):
+    """Verilen doluluk için kale saldırı bitboard'u"""
+    return KALE_TABLOLARI[kare][dolu & KALE_MASKELERI[kare]]
 
-            while 0 <= hedef < 64:
-                # Yatay hareket sınır kontrolü
-                if yon in [1, -1]:
-                    if (hedef // 8) != (kare // 8):
-                        break
 
-                if tahta.tum_taslar & (1 << hedef):
-                    if saldirgan_taslar & (1 << hedef):
-                        return True
-                    break
+def fil_saldirilari(kare, dolu):
+    """Verilen doluluk için fil saldırı bitboard'u"""
+    return FIL_TABLOLARI[kare][dolu & FIL_MASKELERI[kare]]
 
-                hedef += yon
 
-        return False
+def vezir_saldirilari(kare, dolu):
+    """Verilen doluluk için vezir saldırı bitboard'u"""
+    return (KALE_TABLOLARI[kare][dolu & KALE_MASKELERI[kare]] |
+            FIL_TABLOLARI[kare][dolu & FIL_MASKELERI[kare]])
 
-    def _capraz_saldiri_kontrol(self, tahta, kare, saldirgan_taslar):
-        """Çapraz (fil/vezir) saldırı kontrolü"""
-        if saldirgan_taslar == 0:
+
+class HamleUretici:
+    def __init__(self):
+        self.hamleler = []
+        self._onceden_hesapla()
+
+    def _onceden_hesapla(self):
+        """Modül yüklenirken hesaplanan ortak tabloları bağla"""
+        self.at_hamle_maskeleri = AT_MASKELERI
+        self.sah_hamle_maskeleri = SAH_MASKELERI
+        self.beyaz_piyon_saldiri = BEYAZ_PIYON_SALDIRI
+        self.siyah_piyon_saldiri = SIYAH_PIYON_SALDIRI
+        self.kale_maskeleri = KALE_MASKELERI
+        self.kale_tablolari = KALE_TABLOLARI
+        self.fil_maskeleri = FIL_MASKELERI
+        self.fil_tablolari = FIL_TABLOLARI
+        self.ara_kareler = ARA_KARELER
+
+    def tum_hamleleri_uret(self, tahta, hedef_maski=TUM_KARELER):
+        """Mevcut pozisyon için tüm pseudo-legal hamleleri üret.
+        hedef_maski şah dışındaki taşların hedeflerini sınırlar (şah tehdidinden kaçış için)"""
+        return self._hamleleri_uret(tahta, hedef_maski, True, True)
+
+    def alma_hamlelerini_uret(self, tahta, hedef_maski=TUM_KARELER):
+        """Sadece alma hamleleri, en passant ve terfiler (quiescence ve kademeli sıralama için)"""
+        return self._hamleleri_uret(tahta, hedef_maski, True, False)
+
+    def sessiz_hamleleri_uret(self, tahta, hedef_maski=TUM_KARELER):
+        """Alma ve terfi olmayan hamleler (rok dahil)"""
+        return self._hamleleri_uret(tahta, hedef_maski, False, True)
+
+    def _hamleleri_uret(self, tahta, hedef_maski, alma, sessiz):
+        """Hamle üretiminin ortak gövdesi - alma/sessiz seçimi hedef karelere maske olarak uygulanır"""
+        self.hamleler = []
+        beyaz = tahta.beyaz_sira
+
+        # Hedef türü maskesi: alma -> düşman taşları, sessiz -> boş kareler
+        tur_maski = 0
+        if alma:
+            tur_maski |= tahta.siyah_taslar if beyaz else tahta.beyaz_taslar
+        if sessiz:
+            tur_maski |= TUM_KARELER & ~tahta.tum_taslar
+
+        self._piyon_hamleleri_uret(tahta, beyaz, hedef_maski, alma, sessiz)
+        self._at_hamleleri_uret(tahta, beyaz, hedef_maski & tur_maski)
+        self._fil_hamleleri_uret(tahta, beyaz, hedef_maski & tur_maski)
+        self._kale_hamleleri_uret(tahta, beyaz, hedef_maski & tur_maski)
+        self._vezir_hamleleri_uret(tahta, beyaz, hedef_maski & tur_maski)
+        self._sah_hamleleri_uret(tahta, beyaz, tur_maski, sessiz)
+
+        return self.hamleler
+
+    def hamle_pseudo_legal_mi(self, tahta, hamle):
+        """Başka bir düğümden gelen hamle (hash/katil hamle) bu pozisyonda pseudo-legal mi"""
+        kaynak = hamle & 63
+        hedef = (hamle >> HEDEF_KAYDIR) & 63
+        bayrak = (hamle >> BAYRAK_KAYDIR) & 7
+        tas = (hamle >> TAS_KAYDIR) & 15
+        alinan = (hamle >> ALINAN_KAYDIR) & 15
+        beyaz = tahta.beyaz_sira
+        kareler = tahta.kareler
+
+        if (tas < SIYAH_PIYON) != beyaz or kareler[kaynak] != tas:
+            return False
+
+        if bayrak == KISA_ROK or bayrak == UZUN_ROK:
+            # Rok koşullarını üretici ile yeniden kontrol et
+            onceki = self.hamleler
+            self.hamleler = []
+            self._rok_hamleleri_uret(tahta, beyaz)
+            sonuc = hamle in self.hamleler
+            self.hamleler = onceki
+            return sonuc
+
+        if bayrak == EN_PASSANT:
+            saldiri_maskeleri = BEYAZ_PIYON_SALDIRI if beyaz else SIYAH_PIYON_SALDIRI
+            return hedef == tahta.en_passant_kare and (saldiri_maskeleri[kaynak] >> hedef) & 1 == 1
+
+        if kareler[hedef] != alinan:
             return False
 
-        # Dört çapraz yön
-        for yon in [7, 9, -7, -9]:
-            hedef = kare + yon
+        tur = tas % 6
+        hedef_biti = 1 << hedef
+        tum_taslar = tahta.tum_taslar
 
-            while 0 <= hedef < 64:
-                # Çapraz sınır kontrolü
-                if abs((hedef % 8) - (kare % 8)) != abs((hedef // 8) - (kare // 8)):
+        if tur == BEYAZ_PIYON:
+            yon = 8 if beyaz else -8
+            if alinan != BOS:
+                saldiri_maskeleri = BEYAZ_PIYON_SALDIRI if beyaz else SIYAH_PIYON_SALDIRI
+                return (saldiri_maskeleri[kaynak] & hedef_biti) != 0
+            if bayrak == IKI_KARE:
+                return hedef == kaynak + 2 * yon and not (tum_taslar & (1 << (kaynak + yon)))
+            return hedef == kaynak + yon
+        if tur == BEYAZ_AT:
+            return (AT_MASKELERI[kaynak] & hedef_biti) != 0
+        if tur == BEYAZ_SAH:
+            return (SAH_MASKELERI[kaynak] & hedef_biti) != 0
+        if tur == BEYAZ_FIL:
+            return (FIL_TABLOLARI[kaynak][tum_taslar & FIL_MASKELERI[kaynak]] & hedef_biti) != 0
+        if tur == BEYAZ_KALE:
+            return (KALE_TABLOLARI[kaynak][tum_taslar & KALE_MASKELERI[kaynak]] & hedef_biti) != 0
+        return (vezir_saldirilari(kaynak, tum_taslar) & hedef_biti) != 0
+
+    def saldiranlar(self, tahta, kare, dolu):
+        """Verilen doluluk ile kareye saldıran iki renkten tüm taşların bitboard'u"""
+        return ((SIYAH_PIYON_SALDIRI[kare] & tahta.beyaz_piyon) |
+                (BEYAZ_PIYON_SALDIRI[kare] & tahta.siyah_piyon) |
+                (AT_MASKELERI[kare] & (tahta.beyaz_at | tahta.siyah_at)) |
+                (SAH_MASKELERI[kare] & (tahta.beyaz_sah | tahta.siyah_sah)) |
+                (KALE_TABLOLARI[kare][dolu & KALE_MASKELERI[kare]] &
+                 (tahta.beyaz_kale | tahta.beyaz_vezir | tahta.siyah_kale | tahta.siyah_vezir)) |
+                (FIL_TABLOLARI[kare][dolu & FIL_MASKELERI[kare]] &
+                 (tahta.beyaz_fil | tahta.beyaz_vezir | tahta.siyah_fil | tahta.siyah_vezir)))
+
+    def statik_degisim(self, tahta, hamle):
+        """Statik değişim değerlendirmesi (SEE): hedef karedeki alma dizisinin hamleyi yapan
+        taraf için malzeme sonucu. Her adımda en değersiz saldıran alır; kayan taşların
+        arkasındaki (x-ray) saldıranlar önlerindeki taş kalktıkça eklenir. Hamle yapılmadan çağrılır."""
+        kaynak = hamle & 63
+        hedef = (hamle >> HEDEF_KAYDIR) & 63
+        tas = (hamle >> TAS_KAYDIR) & 15
+        terfi = (hamle >> TERFI_KAYDIR) & 15
+
+        dolu = tahta.tum_taslar ^ (1 << kaynak)
+        kazanc = [SEE_DEGERLERI[(hamle >> ALINAN_KAYDIR) & 15]]
+        if (hamle >> BAYRAK_KAYDIR) & 7 == EN_PASSANT:
+            dolu ^= 1 << (hedef - 8 if tas < SIYAH_PIYON else hedef + 8)
+
+        # Karede duran taşın değeri (bir sonraki almada kaybedilecek)
+        if terfi:
+            kazanc[0] += SEE_DEGERLERI[terfi] - SEE_DEGERLERI[tas]
+            karedeki_deger = SEE_DEGERLERI[terfi]
+        else:
+            karedeki_deger = SEE_DEGERLERI[tas]
+
+        duz = tahta.beyaz_kale | tahta.beyaz_vezir | tahta.siyah_kale | tahta.siyah_vezir
+        capraz = tahta.beyaz_fil | tahta.beyaz_vezir | tahta.siyah_fil | tahta.siyah_vezir
+        saldiranlar = self.saldiranlar(tahta, hedef, dolu) & dolu
+
+        sira_beyaz = tas >= SIYAH_PIYON  # Sıradaki alan taraf
+        while True:
+            renk_taslari = tahta.beyaz_taslar if sira_beyaz else tahta.siyah_taslar
+            kendi_saldiranlar = saldiranlar & renk_taslari
+            if not kendi_saldiranlar:
+                break
+
+            # En değersiz saldıranı bul
+            for kod in SEE_SIRASI[0 if sira_beyaz else 1]:
+                bitler = kendi_saldiranlar & getattr(tahta, BITBOARD_ISIMLERI[kod])
+                if bitler:
                     break
+            bit = bitler & -bitler
 
-                if tahta.tum_taslar & (1 << hedef):
-                    if saldirgan_taslar & (1 << hedef):
-                        return True
+            # Şah korunan kareye alamaz
+            if kod == BEYAZ_SAH or kod == SIYAH_SAH:
+                if saldiranlar & ~renk_taslari:
                     break
 
-                hedef += yon
+            kazanc.append(karedeki_deger - kazanc[-1])
+            karedeki_deger = SEE_DEGERLERI[kod]
 
-        return False
+            # Saldıranı kaldır, arkasındaki x-ray saldıranları ekle
+            dolu ^= bit
+            tur = kod % 6
+            if tur == BEYAZ_PIYON or tur == BEYAZ_FIL or tur == BEYAZ_VEZIR:
+                saldiranlar |= FIL_TABLOLARI[hedef][dolu & FIL_MASKELERI[hedef]] & capraz
+            if tur == BEYAZ_KALE or tur == BEYAZ_VEZIR:
+                saldiranlar |= KALE_TABLOLARI[hedef][dolu & KALE_MASKELERI[hedef]] & duz
+            saldiranlar &= dolu
 
-    def _piyon_hamleleri_uret(self, tahta, beyaz):
-        """Piyon hamleleri üret"""
+            sira_beyaz = not sira_beyaz
+
+        # Geriye doğru: her taraf almaya devam etmek ile durmak arasında seçer
+        for d in range(len(kazanc) - 1, 0, -1):
+            kazanc[d - 1] = -max(-kazanc[d - 1], kazanc[d])
+
+        return kazanc[0]
+
+    def saldiri_altinda_mi(self, tahta, kare, beyaz_saldiri):
+        """Belirtilen kare saldırı altında mı kontrol et"""
+        tum_taslar = tahta.tum_taslar
+        if beyaz_saldiri:
+            # Beyaz taşlar tarafından saldırı kontrolü
+            return bool(
+                (SIYAH_PIYON_SALDIRI[kare] & tahta.beyaz_piyon) or
+                (AT_MASKELERI[kare] & tahta.beyaz_at) or
+                (SAH_MASKELERI[kare] & tahta.beyaz_sah) or
+                # Çizgisel saldırılar (kale, vezir)
+                (KALE_TABLOLARI[kare][tum_taslar & KALE_MASKELERI[kare]] & (tahta.beyaz_kale | tahta.beyaz_vezir)) or
+                # Çapraz saldırılar (fil, vezir)
+                (FIL_TABLOLARI[kare][tum_taslar & FIL_MASKELERI[kare]] & (tahta.beyaz_fil | tahta.beyaz_vezir))
+            )
+
+        # Siyah taşlar tarafından saldırı kontrolü
+        return bool(
+            (BEYAZ_PIYON_SALDIRI[kare] & tahta.siyah_piyon) or
+            (AT_MASKELERI[kare] & tahta.siyah_at) or
+            (SAH_MASKELERI[kare] & tahta.siyah_sah) or
+            # Çizgisel saldırılar (kale, vezir)
+            (KALE_TABLOLARI[kare][tum_taslar & KALE_MASKELERI[kare]] & (tahta.siyah_kale | tahta.siyah_vezir)) or
+            # Çapraz saldırılar (fil, vezir)
+            (FIL_TABLOLARI[kare][tum_taslar & FIL_MASKELERI[kare]] & (tahta.siyah_fil | tahta.siyah_vezir))
+        )
+
+    def _cizgisel_saldiri_kontrol(self, tahta, kare, saldirgan_taslar):
+        """Çizgisel (kale/vezir) saldırı kontrolü"""
+        return (KALE_TABLOLARI[kare][tahta.tum_taslar & KALE_MASKELERI[kare]] & saldirgan_taslar) != 0
+
+    def _capraz_saldiri_kontrol(self, tahta, kare, saldirgan_taslar):
+        """Çapraz (fil/vezir) saldırı kontrolü"""
+        return (FIL_TABLOLARI[kare][tahta.tum_taslar & FIL_MASKELERI[kare]] & saldirgan_taslar) != 0
+
+    def _piyon_hamleleri_uret(self, tahta, beyaz, hedef_maski=TUM_KARELER, alma=True, sessiz=True):
+        """Piyon hamleleri üret (alma: almalar, en passant ve terfiler; sessiz: diğer ilerlemeler)"""
         if beyaz:
             piyonlar = tahta.beyaz_piyon
             dusman_taslar = tahta.siyah_taslar
             yon = 8  # İleri yön
             baslangic_satiri = 1
             terfi_satiri = 7
+            tas = BEYAZ_PIYON
+            dusman_piyon = SIYAH_PIYON
         else:
             piyonlar = tahta.siyah_piyon
             dusman_taslar = tahta.beyaz_taslar
             yon = -8  # İleri yön
             baslangic_satiri = 6
             terfi_satiri = 0
+            tas = SIYAH_PIYON
+            dusman_piyon = BEYAZ_PIYON
 
         tum_taslar = tahta.tum_taslar
+        kareler = tahta.kareler
+        hamleler = self.hamleler
+        taban = tas << TAS_KAYDIR
+        saldiri_maskeleri = self.beyaz_piyon_saldiri if beyaz else self.siyah_piyon_saldiri
+        # Terfi taşları: vezir, kale, fil, at (aynı renk)
+        terfi_kodlari = (tas + BEYAZ_VEZIR, tas + BEYAZ_KALE, tas + BEYAZ_FIL, tas + BEYAZ_AT)
 
         while piyonlar:
             kaynak = tahta.en_dusuk_bit_al(piyonlar)
             piyonlar = tahta.en_dusuk_bit_kaldir(piyonlar)
 
             satir = kaynak // 8
+            terfi_var = satir + (1 if beyaz else -1) == terfi_satiri
 
             # İleri hareket
             hedef = kaynak + yon
             if 0 <= hedef < 64 and not (tum_taslar & (1 << hedef)):
-                if satir + (1 if beyaz else -1) == terfi_satiri:
+                if not (hedef_maski & (1 << hedef)):
+                    pass  # Tek kare ileri kaçış karesi değil, iki kare ileri yine de olabilir
+                elif terfi_var:
                     # Terfi hamleleri
-                    for terfi_tasi in ['vezir', 'kale', 'fil', 'at']:
-                        self.hamleler.append((kaynak, hedef, 'piyon', 'terfi', terfi_tasi))
-                else:
-                    self.hamleler.append((kaynak, hedef, 'piyon', 'normal'))
+                    if alma:
+                        for terfi_kodu in terfi_kodlari:
+                            hamleler.append(taban | kaynak | (hedef << HEDEF_KAYDIR) | (TERFI << BAYRAK_KAYDIR) |
+                                            (terfi_kodu << TERFI_KAYDIR) | ALINAN_YOK)
+                elif sessiz:
+                    hamleler.append(taban | kaynak | (hedef << HEDEF_KAYDIR) | ALINAN_YOK)
 
                 # İki kare ileri (başlangıç pozisyonundan)
-                if satir == baslangic_satiri:
+                if sessiz and satir == baslangic_satiri:
                     hedef2 = kaynak + 2 * yon
-                    if 0 <= hedef2 < 64 and not (tum_taslar & (1 << hedef2)):
-                        self.hamleler.append((kaynak, hedef2, 'piyon', 'iki_kare'))
+                    if 0 <= hedef2 < 64 and not (tum_taslar & (1 << hedef2)) and hedef_maski & (1 << hedef2):
+                        hamleler.append(taban | kaynak | (hedef2 << HEDEF_KAYDIR) |
+                                        (IKI_KARE << BAYRAK_KAYDIR) | ALINAN_YOK)
+
+            if not alma:
+                continue
 
             # Çapraz saldırılar
-            saldiri_maskeleri = self.beyaz_piyon_saldiri if beyaz else self.siyah_piyon_saldiri
-            saldirilar = saldiri_maskeleri[kaynak] & dusman_taslar
+            saldirilar = saldiri_maskeleri[kaynak] & dusman_taslar & hedef_maski
 
             while saldirilar:
                 hedef = tahta.en_dusuk_bit_al(saldirilar)
                 saldirilar = tahta.en_dusuk_bit_kaldir(saldirilar)
 
-                if satir + (1 if beyaz else -1) == terfi_satiri:
+                if terfi_var:
                     # Terfi ile alma
-                    for terfi_tasi in ['vezir', 'kale', 'fil', 'at']:
-                        self.hamleler.append((kaynak, hedef, 'piyon', 'terfi_alma', terfi_tasi))
+                    for terfi_kodu in terfi_kodlari:
+                        hamleler.append(taban | kaynak | (hedef << HEDEF_KAYDIR) | (TERFI_ALMA << BAYRAK_KAYDIR) |
+                                        (terfi_kodu << TERFI_KAYDIR) | (kareler[hedef] << ALINAN_KAYDIR))
                 else:
-                    self.hamleler.append((kaynak, hedef, 'piyon', 'alma'))
+                    hamleler.append(taban | kaynak | (hedef << HEDEF_KAYDIR) | ALINAN_ALANI[kareler[hedef]])
 
             # En passant
             if tahta.en_passant_kare != -1:
                 if saldiri_maskeleri[kaynak] & (1 << tahta.en_passant_kare):
-                    self.hamleler.append((kaynak, tahta.en_passant_kare, 'piyon', 'en_passant'))
+                    hamleler.append(taban | kaynak | (tahta.en_passant_kare << HEDEF_KAYDIR) |
+                                    (EN_PASSANT << BAYRAK_KAYDIR) | (dusman_piyon << ALINAN_KAYDIR))
 
-    def _at_hamleleri_uret(self, tahta, beyaz):
+    def _at_hamleleri_uret(self, tahta, beyaz, hedef_maski=TUM_KARELER):
         """At hamleleri üret"""
         atlar = tahta.beyaz_at if beyaz else tahta.siyah_at
         kendi_taslar = tahta.beyaz_taslar if beyaz else tahta.siyah_taslar
+        kareler = tahta.kareler
+        taban = (BEYAZ_AT if beyaz else SIYAH_AT) << TAS_KAYDIR
 
         while atlar:
             kaynak = tahta.en_dusuk_bit_al(atlar)
             atlar = tahta.en_dusuk_bit_kaldir(atlar)
 
-            hedefler = self.at_hamle_maskeleri[kaynak] & ~kendi_taslar
+            hedefler = self.at_hamle_maskeleri[kaynak] & ~kendi_taslar & hedef_maski
 
             while hedefler:
                 hedef = tahta.en_dusuk_bit_al(hedefler)
                 hedefler = tahta.en_dusuk_bit_kaldir(hedefler)
 
-                hamle_turu = 'alma' if (tahta.beyaz_taslar | tahta.siyah_taslar) & (1 << hedef) else 'normal'
-                self.hamleler.append((kaynak, hedef, 'at', hamle_turu))
+                self.hamleler.append(taban | kaynak | (hedef << HEDEF_KAYDIR) | ALINAN_ALANI[kareler[hedef]])
 
-    def _fil_hamleleri_uret(self, tahta, beyaz):
+    def _fil_hamleleri_uret(self, tahta, beyaz, hedef_maski=TUM_KARELER):
         """Fil hamleleri üret"""
         filler = tahta.beyaz_fil if beyaz else tahta.siyah_fil
-        kendi_taslar = tahta.beyaz_taslar if beyaz else tahta.siyah_taslar
-
-        while filler:
-            kaynak = tahta.en_dusuk_bit_al(filler)
-            filler = tahta.en_dusuk_bit_kaldir(filler)
+        # Kendi taşları ve hedef maskesi dışındaki kareler yasak
+        yasak_kareler = (tahta.beyaz_taslar if beyaz else tahta.siyah_taslar) | ~hedef_maski
+        self._kayan_tas_hamleleri_uret(tahta, filler, yasak_kareler, BEYAZ_FIL if beyaz else SIYAH_FIL,
+                                       FIL_TABLOLARI, FIL_MASKELERI)
 
-            # Dört çapraz yön
-            for yon in [7, 9, -7, -9]:
-                hedef = kaynak + yon
-
-                while 0 <= hedef < 64:
-                    # Sınır kontrolü
-                    if abs((hedef % 8) - (kaynak % 8)) != abs((hedef // 8) - (kaynak // 8)):
-                        break
-
-                    if kendi_taslar & (1 << hedef):
-                        break
-
-                    hamle_turu = 'alma' if (tahta.beyaz_taslar | tahta.siyah_taslar) & (1 << hedef) else 'normal'
-                    self.hamleler.append((kaynak, hedef, 'fil', hamle_turu))
-
-                    if (tahta.beyaz_taslar | tahta.siyah_taslar) & (1 << hedef):  # Düşman taşına çarptı
-                        break
-
-                    hedef += yon
-
-    def _kale_hamleleri_uret(self, tahta, beyaz):
+    def _kale_hamleleri_uret(self, tahta, beyaz, hedef_maski=TUM_KARELER):
         """Kale hamleleri üret"""
         kaleler = tahta.beyaz_kale if beyaz else tahta.siyah_kale
-        kendi_taslar = tahta.beyaz_taslar if beyaz else tahta.siyah_taslar
-
-        while kaleler:
-            kaynak = tahta.en_dusuk_bit_al(kaleler)
-            kaleler = tahta.en_dusuk_bit_kaldir(kaleler)
-
-            # Dört doğrusal yön
-            for yon in [1, -1, 8, -8]:
-                hedef = kaynak + yon
-
-                while 0 <= hedef < 64:
-                    # Yatay hareket sınır kontrolü
-                    if yon in [1, -1] and (hedef // 8) != (kaynak // 8):
-                        break
+        # Kendi taşları ve hedef maskesi dışındaki kareler yasak
+        yasak_kareler = (tahta.beyaz_taslar if beyaz else tahta.siyah_taslar) | ~hedef_maski
+        self._kayan_tas_hamleleri_uret(tahta, kaleler, yasak_kareler, BEYAZ_KALE if beyaz else SIYAH_KALE,
+                                       KALE_TABLOLARI, KALE_MASKELERI)
 
-                    if kendi_taslar & (1 << hedef):
-                        break
-
-                    hamle_turu = 'alma' if (tahta.beyaz_taslar | tahta.siyah_taslar) & (1 << hedef) else 'normal'
-                    self.hamleler.append((kaynak, hedef, 'kale', hamle_turu))
-
-                    if (tahta.beyaz_taslar | tahta.siyah_taslar) & (1 << hedef):  # Düşman taşına çarptı
-                        break
-
-                    hedef += yon
-
-    def _vezir_hamleleri_uret(self, tahta, beyaz):
+    def _vezir_hamleleri_uret(self, tahta, beyaz, hedef_maski=TUM_KARELER):
         """Vezir hamleleri üret (kale + fil hareketi)"""
         vezirler = tahta.beyaz_vezir if beyaz else tahta.siyah_vezir
-        kendi_taslar = tahta.beyaz_taslar if beyaz else tahta.siyah_taslar
+        # Kendi taşları ve hedef maskesi dışındaki kareler yasak
+        yasak_kareler = (tahta.beyaz_taslar if beyaz else tahta.siyah_taslar) | ~hedef_maski
+        tum_taslar = tahta.tum_taslar
+        kareler = tahta.kareler
+        hamleler = self.hamleler
+        taban = (BEYAZ_VEZIR if beyaz else SIYAH_VEZIR) << TAS_KAYDIR
 
         while vezirler:
-            kaynak = tahta.en_dusuk_bit_al(vezirler)
-            vezirler = tahta.en_dusuk_bit_kaldir(vezirler)
+            kaynak = (vezirler & -vezirler).bit_length() - 1
+            vezirler &= vezirler - 1
 
-            # Sekiz yön (4 doğrusal + 4 çapraz)
-            for yon in [1, -1, 8, -8, 7, 9, -7, -9]:
-                hedef = kaynak + yon
+            hedefler = (KALE_TABLOLARI[kaynak][tum_taslar & KALE_MASKELERI[kaynak]] |
+                        FIL_TABLOLARI[kaynak][tum_taslar & FIL_MASKELERI[kaynak]]) & ~yasak_kareler
 
-                while 0 <= hedef < 64:
-                    # Sınır kontrolleri
-                    if yon in [1, -1] and (hedef // 8) != (kaynak // 8):
-                        break
-                    if yon in [7, 9, -7, -9]:
-                        if abs((hedef % 8) - (kaynak % 8)) != abs((hedef // 8) - (kaynak // 8)):
-                            break
+            while hedefler:
+                hedef = (hedefler & -hedefler).bit_length() - 1
+                hedefler &= hedefler - 1
+                hamleler.append(taban | kaynak | (hedef << HEDEF_KAYDIR) | ALINAN_ALANI[kareler[hedef]])
 
-                    if kendi_taslar & (1 << hedef):
-                        break
+    def _kayan_tas_hamleleri_uret(self, tahta, taslar, yasak_kareler, tas, tablolar, maskeler):
+        """Fil/kale hamleleri - saldırı tablosundan tek sorgu ile hedef kümesi"""
+        tum_taslar = tahta.tum_taslar
+        kareler = tahta.kareler
+        hamleler = self.hamleler
+        taban = tas << TAS_KAYDIR
 
-                    hamle_turu = 'alma' if (tahta.beyaz_taslar | tahta.siyah_taslar) & (1 << hedef) else 'normal'
-                    self.hamleler.append((kaynak, hedef, 'vezir', hamle_turu))
+        while taslar:
+            kaynak = (taslar & -taslar).bit_length() - 1
+            taslar &= taslar - 1
 
-                    if (tahta.beyaz_taslar | tahta.siyah_taslar) & (1 << hedef):  # Düşman taşına çarptı
-                        break
+            hedefler = tablolar[kaynak][tum_taslar & maskeler[kaynak]] & ~yasak_kareler
 
-                    hedef += yon
+            while hedefler:
+                hedef = (hedefler & -hedefler).bit_length() - 1
+                hedefler &= hedefler - 1
+                hamleler.append(taban | kaynak | (hedef << HEDEF_KAYDIR) | ALINAN_ALANI[kareler[hedef]])
 
-    def _sah_hamleleri_uret(self, tahta, beyaz):
+    def _sah_hamleleri_uret(self, tahta, beyaz, hedef_maski=TUM_KARELER, rok=True):
         """Şah hamleleri üret"""
         sah = tahta.beyaz_sah if beyaz else tahta.siyah_sah
         kendi_taslar = tahta.beyaz_taslar if beyaz else tahta.siyah_taslar
+        kareler = tahta.kareler
+        taban = (BEYAZ_SAH if beyaz else SIYAH_SAH) << TAS_KAYDIR
 
         if sah == 0:
             return
 
         kaynak = tahta.en_dusuk_bit_al(sah)
-        hedefler = self.sah_hamle_maskeleri[kaynak] & ~kendi_taslar
+        hedefler = self.sah_hamle_maskeleri[kaynak] & ~kendi_taslar & hedef_maski
 
         while hedefler:
             hedef = tahta.en_dusuk_bit_al(hedefler)
             hedefler = tahta.en_dusuk_bit_kaldir(hedefler)
 
-            hamle_turu = 'alma' if (tahta.beyaz_taslar | tahta.siyah_taslar) & (1 << hedef) else 'normal'
-            self.hamleler.append((kaynak, hedef, 'sah', hamle_turu))
+            self.hamleler.append(taban | kaynak | (hedef << HEDEF_KAYDIR) | ALINAN_ALANI[kareler[hedef]])
 
         # Rok hamleleri
-        self._rok_hamleleri_uret(tahta, beyaz)
+        if rok:
+            self._rok_hamleleri_uret(tahta, beyaz)
 
     def _rok_hamleleri_uret(self, tahta, beyaz):
-        """Rok hamleleri üret"""
+        """Rok hamleleri üret - şah tehdit altındaysa veya geçtiği kareler saldırı altındaysa rok yok"""
+        tum_taslar = tahta.tum_taslar
         if beyaz:
+            taban = (BEYAZ_SAH << TAS_KAYDIR) | ALINAN_YOK
             if tahta.beyaz_kisa_rok:
                 # Kısa rok: e1-g1
-                if not ((tahta.tum_taslar & 0x60)):  # f1 ve g1 boş
-                    self.hamleler.append((4, 6, 'sah', 'kisa_rok'))
+                if not ((tum_taslar & 0x60)):  # f1 ve g1 boş
+                    if not (self.saldiri_altinda_mi(tahta, 4, False) or self.saldiri_altinda_mi(tahta, 5, False) or
+                            self.saldiri_altinda_mi(tahta, 6, False)):
+                        self.hamleler.append(taban | 4 | (6 << HEDEF_KAYDIR) | (KISA_ROK << BAYRAK_KAYDIR))
 
             if tahta.beyaz_uzun_rok:
                 # Uzun rok: e1-c1
-                if not ((tahta.tum_taslar & 0x0E)):  # b1, c1, d1 boş
-                    self.hamleler.append((4, 2, 'sah', 'uzun_rok'))
+                if not ((tum_taslar & 0x0E)):  # b1, c1, d1 boş
+                    if not (self.saldiri_altinda_mi(tahta, 4, False) or self.saldiri_altinda_mi(tahta, 3, False) or
+                            self.saldiri_altinda_mi(tahta, 2, False)):
+                        self.hamleler.append(taban | 4 | (2 << HEDEF_KAYDIR) | (UZUN_ROK << BAYRAK_KAYDIR))
         else:
+            taban = (SIYAH_SAH << TAS_KAYDIR) | ALINAN_YOK
             if tahta.siyah_kisa_rok:
                 # Kısa rok: e8-g8
-                if not ((tahta.tum_taslar & 0x6000000000000000)):  # f8 ve g8 boş
-                    self.hamleler.append((60, 62, 'sah', 'kisa_rok'))
+                if not ((tum_taslar & 0x6000000000000000)):  # f8 ve g8 boş
+                    if not (self.saldiri_altinda_mi(tahta, 60, True) or self.saldiri_altinda_mi(tahta, 61, True) or
+                            self.saldiri_altinda_mi(tahta, 62, True)):
+                        self.hamleler.append(taban | 60 | (62 << HEDEF_KAYDIR) | (KISA_ROK << BAYRAK_KAYDIR))
 
             if tahta.siyah_uzun_rok:
                 # Uzun rok: e8-c8
-                if not ((tahta.tum_taslar & 0x0E00000000000000)):  # b8, c8, d8 boş
-                    self.hamleler.append((60, 58, 'sah', 'uzun_rok'))
\ No newline at end of file
+                if not ((tum_taslar & 0x0E00000000000000)):  # b8, c8, d8 boş
+                    if not (self.saldiri_altinda_mi(tahta, 60, True) or self.saldiri_altinda_mi(tahta, 59, True) or
+                            self.saldiri_altinda_mi(tahta, 58, True)):
+                        self.hamleler.append(taban | 60 | (58 << HEDEF_KAYDIR) | (UZUN_ROK << BAYRAK_KAYDIR))
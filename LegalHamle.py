@@ -1,9 +1,10 @@
 """
-Legal hamle bulucu. Pseudo-legal hamleleri alır ve legal olanları filtreler.
+Legal hamle bulucu. Şah tehdidi ve açmaz (pin) maskeleri ile doğrudan legal hamle üretir.
 Şah kontrolü ve geçici hamle uygulama sistemi.
 """
 
-from HamleUret import HamleUretici
+from HamleUret import HamleUretici, ARA_KARELER, TUM_KARELER, kale_saldirilari, fil_saldirilari
+from Hamle import HEDEF_KAYDIR, BAYRAK_KAYDIR, EN_PASSANT
 
 
 class LegalHamleBulucu:
@@ -11,204 +12,151 @@ class LegalHamleBulucu:
         self.hamle_uretici = HamleUretici()
         self.legal_hamleler = []
 
-    def legal_hamleleri_bul(self, tahta):
-        """Mevcut pozisyon için tüm legal hamleleri bul"""
-        self.legal_hamleler = []
-        pseudo_legal_hamleler = self.hamle_uretici.tum_hamleleri_uret(tahta)
+    def legal_hamleleri_bul(self, tahta, durum=None):
+        """Mevcut pozisyon için tüm legal hamleleri bul.
+        Şah tehdidi, açmazlar ve kaçış maskesi pozisyon başına bir kez hesaplanır; sadece şah,
+        açmazdaki taşlar ve en passant alabilecek piyonların hamleleri ek kontrolden geçer."""
+        self.legal_hamleler = self._legal_hamleleri_uret(tahta, durum, True, True)
+        return self.legal_hamleler
+
+    def legal_alma_hamlelerini_bul(self, tahta, durum=None):
+        """Legal alma, en passant ve terfi hamleleri"""
+        return self._legal_hamleleri_uret(tahta, durum, True, False)
+
+    def legal_sessiz_hamleleri_bul(self, tahta, durum=None):
+        """Legal sessiz hamleler (alma ve terfi dışı, rok dahil)"""
+        return self._legal_hamleleri_uret(tahta, durum, False, True)
+
+    def legal_durum_hesapla(self, tahta):
+        """Pozisyonun legalite bilgisini hesapla:
+        (şah karesi, şah çekenler, kaçış maskesi, açmaz hatları, ek kontrol gereken kaynaklar).
+        Aynı pozisyonda birden fazla üretim (kademeli sıralama) için tekrar kullanılabilir."""
+        beyaz = tahta.beyaz_sira
+        sah = tahta.beyaz_sah if beyaz else tahta.siyah_sah
+        if sah == 0:
+            # Şahsız pozisyon (test/analiz) - pseudo-legal hamleler legaldir
+            return None
+
+        sah_karesi = sah.bit_length() - 1
+        kendi_taslar = tahta.beyaz_taslar if beyaz else tahta.siyah_taslar
+        dusman_taslar = tahta.siyah_taslar if beyaz else tahta.beyaz_taslar
+
+        # Şah çeken taşlar ve kaçış maskesi
+        tehdit_edenler = self.hamle_uretici.saldiranlar(tahta, sah_karesi, tahta.tum_taslar) & dusman_taslar
+        if not tehdit_edenler:
+            kacis_maskesi = TUM_KARELER
+        elif tehdit_edenler & (tehdit_edenler - 1):
+            kacis_maskesi = 0  # Çifte şah: sadece şah oynayabilir
+        else:
+            kacis_maskesi = tehdit_edenler | ARA_KARELER[sah_karesi][tehdit_edenler.bit_length() - 1]
+
+        # Açmazdaki taşlar ve hareket edebilecekleri hatlar
+        acmaz_hatlari = self._acmazlari_bul(tahta, sah_karesi, beyaz, kendi_taslar, dusman_taslar)
+
+        # Ek kontrol gereken kaynak kareler: şah, açmazdaki taşlar, en passant alabilecek piyonlar
+        ozel_kaynaklar = sah
+        for kare in acmaz_hatlari:
+            ozel_kaynaklar |= 1 << kare
+        if tahta.en_passant_kare != -1:
+            piyonlar = tahta.beyaz_piyon if beyaz else tahta.siyah_piyon
+            saldiri = (self.hamle_uretici.siyah_piyon_saldiri if beyaz
+                       else self.hamle_uretici.beyaz_piyon_saldiri)
+            ozel_kaynaklar |= saldiri[tahta.en_passant_kare] & piyonlar
+
+        return sah_karesi, tehdit_edenler, kacis_maskesi, acmaz_hatlari, ozel_kaynaklar
+
+    def _legal_hamleleri_uret(self, tahta, durum, alma, sessiz):
+        """Kaçış maskesi ile pseudo-legal üretip sadece özel kaynaklı hamleleri kontrol et"""
+        if durum is None:
+            durum = self.legal_durum_hesapla(tahta)
+            if durum is None:
+                return list(self.hamle_uretici._hamleleri_uret(tahta, TUM_KARELER, alma, sessiz))
+
+        sah_karesi, _, kacis_maskesi, acmaz_hatlari, ozel_kaynaklar = durum
+        beyaz = tahta.beyaz_sira
+        tum_taslar = tahta.tum_taslar
+
+        legal_hamleler = []
+        for hamle in self.hamle_uretici._hamleleri_uret(tahta, kacis_maskesi, alma, sessiz):
+            if not (1 << (hamle & 63)) & ozel_kaynaklar:
+                legal_hamleler.append(hamle)
+            elif self._ozel_hamle_legal_mi(tahta, hamle, sah_karesi, beyaz, acmaz_hatlari, tum_taslar):
+                legal_hamleler.append(hamle)
+
+        return legal_hamleler
+
+    def hamle_gecerli_mi(self, tahta, hamle):
+        """Başka bir düğümden gelen hamle (hash/katil hamle) bu pozisyonda legal mi"""
+        return self.hamle_uretici.hamle_pseudo_legal_mi(tahta, hamle) and self.hamle_legal_mi(tahta, hamle)
+
+    def _acmazlari_bul(self, tahta, sah_karesi, beyaz, kendi_taslar, dusman_taslar):
+        """Açmazdaki kendi taşları -> hareket edebilecekleri hat (açmaz eden taş dahil)"""
+        if beyaz:
+            duz = tahta.siyah_kale | tahta.siyah_vezir
+            capraz = tahta.siyah_fil | tahta.siyah_vezir
+        else:
+            duz = tahta.beyaz_kale | tahta.beyaz_vezir
+            capraz = tahta.beyaz_fil | tahta.beyaz_vezir
+
+        # Kendi taşları yokmuş gibi şahtan görülen düşman kayan taşları
+        adaylar = ((kale_saldirilari(sah_karesi, dusman_taslar) & duz) |
+                   (fil_saldirilari(sah_karesi, dusman_taslar) & capraz))
+
+        acmaz_hatlari = {}
+        while adaylar:
+            saldirgan = (adaylar & -adaylar).bit_length() - 1
+            adaylar &= adaylar - 1
+
+            arasi = ARA_KARELER[sah_karesi][saldirgan] & kendi_taslar
+            if arasi and not (arasi & (arasi - 1)):
+                acmaz_hatlari[arasi.bit_length() - 1] = ARA_KARELER[sah_karesi][saldirgan] | (1 << saldirgan)
+
+        return acmaz_hatlari
+
+    def _ozel_hamle_legal_mi(self, tahta, hamle, sah_karesi, beyaz, acmaz_hatlari, tum_taslar):
+        """Şah, açmazdaki taş veya en passant hamlesi için legalite kontrolü (tahtayı değiştirmeden)"""
+        kaynak = hamle & 63
+        hedef = (hamle >> HEDEF_KAYDIR) & 63
+        dusman_taslar = tahta.siyah_taslar if beyaz else tahta.beyaz_taslar
+
+        if kaynak == sah_karesi:
+            # Şah hedef karede, şah tahtadan kalkmış doluluk ile saldırı altında olmamalı
+            # (rok geçiş kareleri üretimde kontrol edildi)
+            return not (self.hamle_uretici.saldiranlar(tahta, hedef, tum_taslar ^ (1 << kaynak)) & dusman_taslar)
+
+        if kaynak in acmaz_hatlari and not (acmaz_hatlari[kaynak] & (1 << hedef)):
+            return False
 
-        for hamle in pseudo_legal_hamleler:
-            if self.hamle_legal_mi(tahta, hamle):
-                self.legal_hamleler.append(hamle)
+        if (hamle >> BAYRAK_KAYDIR) & 7 == EN_PASSANT:
+            # En passant: iki piyon aynı anda kalktığı için açılan hatları tam kontrol et
+            alinan_kare = hedef - 8 if beyaz else hedef + 8
+            dolu = (tum_taslar ^ (1 << kaynak) ^ (1 << alinan_kare)) | (1 << hedef)
+            saldiranlar = self.hamle_uretici.saldiranlar(tahta, sah_karesi, dolu) & dusman_taslar
+            return not (saldiranlar & ~(1 << alinan_kare))
 
-        return self.legal_hamleler
+        return True
 
     def hamle_legal_mi(self, tahta, hamle):
         """Belirtilen hamle legal mi kontrol et"""
         # Geçici hamle uygula
-        onceki_durum = self.hamle_uygula_gecici(tahta, hamle)
+        if not tahta.hamle_yap(hamle):
+            return False
 
         # Şah tehdidinde mi kontrol et
         legal = not self.sah_tehdidinde_mi(tahta, not tahta.beyaz_sira)
 
         # Hamleyi geri al
-        self.hamle_geri_al(tahta, hamle, onceki_durum)
+        tahta.hamle_geri_al()
 
         return legal
 
     def hamle_uygula_gecici(self, tahta, hamle):
-        """Hamleyi geçici olarak uygula ve önceki durumu kaydet"""
-        kaynak, hedef = hamle[0], hamle[1]
-        hamle_turu = hamle[3] if len(hamle) > 3 else 'normal'
-
-        # Önceki durumu kaydet
-        onceki_durum = {
-            'hedef_tas': tahta.tas_turu_al(hedef),
-            'kaynak_tas': tahta.tas_turu_al(kaynak),
-            'beyaz_sira': tahta.beyaz_sira,
-            'en_passant_kare': tahta.en_passant_kare,
-            'beyaz_kisa_rok': tahta.beyaz_kisa_rok,
-            'beyaz_uzun_rok': tahta.beyaz_uzun_rok,
-            'siyah_kisa_rok': tahta.siyah_kisa_rok,
-            'siyah_uzun_rok': tahta.siyah_uzun_rok,
-            'hamle_turu': hamle_turu,
-            'yarim_hamle_sayici': tahta.yarim_hamle_sayici,
-            'hamle_sayisi': tahta.hamle_sayisi
-        }
-
-        # Özel hamle durumları için ek bilgiler
-        if hamle_turu == 'en_passant':
-            onceki_durum['en_passant_hedef'] = tahta.en_passant_kare + (-8 if tahta.beyaz_sira else 8)
-            onceki_durum['alinen_piyon'] = tahta.tas_turu_al(onceki_durum['en_passant_hedef'])
-
-        # Hamleyi uygula
-        self._hamle_isle(tahta, hamle)
-
-        return onceki_durum
-
-    def hamle_geri_al(self, tahta, hamle, onceki_durum):
-        """Geçici hamleyi geri al"""
-        kaynak, hedef = hamle[0], hamle[1]
-        hamle_turu = onceki_durum['hamle_turu']
-
-        # Durumları geri yükle
-        tahta.beyaz_sira = onceki_durum['beyaz_sira']
-        tahta.en_passant_kare = onceki_durum['en_passant_kare']
-        tahta.beyaz_kisa_rok = onceki_durum['beyaz_kisa_rok']
-        tahta.beyaz_uzun_rok = onceki_durum['beyaz_uzun_rok']
-        tahta.siyah_kisa_rok = onceki_durum['siyah_kisa_rok']
-        tahta.siyah_uzun_rok = onceki_durum['siyah_uzun_rok']
-        tahta.yarim_hamle_sayici = onceki_durum['yarim_hamle_sayici']
-        tahta.hamle_sayisi = onceki_durum['hamle_sayisi']
-
-        # Taşları geri yerleştir
-        tahta.tas_kaldir(hedef)
-        if onceki_durum['kaynak_tas']:
-            renk, tur = onceki_durum['kaynak_tas']
-            tahta.tas_ekle(kaynak, renk, tur)
-
-        if onceki_durum['hedef_tas']:
-            renk, tur = onceki_durum['hedef_tas']
-            tahta.tas_ekle(hedef, renk, tur)
-
-        # Özel hamle geri alma işlemleri
-        if hamle_turu == 'kisa_rok':
-            if onceki_durum['beyaz_sira']:  # Beyaz rok
-                tahta.tas_kaldir(5)  # f1'deki kaleyi kaldır
-                tahta.tas_ekle(7, 'beyaz', 'kale')  # h1'e geri koy
-            else:  # Siyah rok
-                tahta.tas_kaldir(61)  # f8'deki kaleyi kaldır
-                tahta.tas_ekle(63, 'siyah', 'kale')  # h8'e geri koy
-
-        elif hamle_turu == 'uzun_rok':
-            if onceki_durum['beyaz_sira']:  # Beyaz rok
-                tahta.tas_kaldir(3)  # d1'deki kaleyi kaldır
-                tahta.tas_ekle(0, 'beyaz', 'kale')  # a1'e geri koy
-            else:  # Siyah rok
-                tahta.tas_kaldir(59)  # d8'deki kaleyi kaldır
-                tahta.tas_ekle(56, 'siyah', 'kale')  # a8'e geri koy
-
-        elif hamle_turu == 'en_passant':
-            # Alınan piyonu geri koy
-            if onceki_durum['alinen_piyon']:
-                renk, tur = onceki_durum['alinen_piyon']
-                tahta.tas_ekle(onceki_durum['en_passant_hedef'], renk, tur)
-
-    def _hamle_isle(self, tahta, hamle):
-        """Hamleyi işle (özel hamle türlerine göre)"""
-        kaynak, hedef = hamle[0], hamle[1]
-        tas_turu = hamle[2]
-        hamle_turu = hamle[3] if len(hamle) > 3 else 'normal'
-
-        # Kaynak taşın bilgisini al
-        tas_bilgisi = tahta.tas_turu_al(kaynak)
-        if not tas_bilgisi:
-            return False
-
-        renk, tur = tas_bilgisi
-
-        # Rok haklarını güncelle
-        self._rok_haklarini_guncelle(tahta, kaynak, hedef, renk, tur)
-
-        # En passant karesi güncelleme
-        tahta.en_passant_kare = -1
-
-        if hamle_turu == 'iki_kare':
-            # İki kare piyon hamlesi - en passant karesi belirle
-            tahta.en_passant_kare = (kaynak + hedef) // 2
-
-        elif hamle_turu == 'en_passant':
-            # En passant alma - alınan piyonu kaldır
-            alinen_piyon_kare = hedef + (-8 if renk == 'beyaz' else 8)
-            tahta.tas_kaldir(alinen_piyon_kare)
-
-        elif hamle_turu == 'kisa_rok':
-            # Kısa rok - kaleyi de hareket ettir
-            if renk == 'beyaz':
-                tahta.tas_kaldir(7)  # h1
-                tahta.tas_ekle(5, 'beyaz', 'kale')  # f1
-            else:
-                tahta.tas_kaldir(63)  # h8
-                tahta.tas_ekle(61, 'siyah', 'kale')  # f8
-
-        elif hamle_turu == 'uzun_rok':
-            # Uzun rok - kaleyi de hareket ettir
-            if renk == 'beyaz':
-                tahta.tas_kaldir(0)  # a1
-                tahta.tas_ekle(3, 'beyaz', 'kale')  # d1
-            else:
-                tahta.tas_kaldir(56)  # a8
-                tahta.tas_ekle(59, 'siyah', 'kale')  # d8
-
-        elif hamle_turu in ['terfi', 'terfi_alma']:
-            # Piyon terfisi
-            terfi_tasi = hamle[4] if len(hamle) > 4 else 'vezir'
-            tahta.tas_kaldir(hedef)  # Hedef karedeki taşı kaldır
-            tahta.tas_kaldir(kaynak)  # Kaynak karedeki piyonu kaldır
-            tahta.tas_ekle(hedef, renk, terfi_tasi)  # Terfi olan taşı yerleştir
-            tahta.beyaz_sira = not tahta.beyaz_sira
-            return True
-
-        # Normal hamle işlemi
-        tahta.tas_kaldir(hedef)  # Hedef karedeki taşı kaldır (varsa)
-        tahta.tas_kaldir(kaynak)  # Kaynak karedeki taşı kaldır
-        tahta.tas_ekle(hedef, renk, tur)  # Taşı hedef kareye yerleştir
-
-        # Sırayı değiştir
-        tahta.beyaz_sira = not tahta.beyaz_sira
-
-        return True
+        """Hamleyi geçici olarak uygula (Tahta.hamle_yap üzerinden)"""
+        return tahta.hamle_yap(hamle)
 
-    def _rok_haklarini_guncelle(self, tahta, kaynak, hedef, renk, tur):
-        """Rok haklarını güncelle"""
-        if tur == 'sah':
-            if renk == 'beyaz':
-                tahta.beyaz_kisa_rok = False
-                tahta.beyaz_uzun_rok = False
-            else:
-                tahta.siyah_kisa_rok = False
-                tahta.siyah_uzun_rok = False
-
-        elif tur == 'kale':
-            if renk == 'beyaz':
-                if kaynak == 0:  # a1
-                    tahta.beyaz_uzun_rok = False
-                elif kaynak == 7:  # h1
-                    tahta.beyaz_kisa_rok = False
-            else:
-                if kaynak == 56:  # a8
-                    tahta.siyah_uzun_rok = False
-                elif kaynak == 63:  # h8
-                    tahta.siyah_kisa_rok = False
-
-        # Hedef karedeki kale yakalandıysa rok haklarını kaldır
-        if hedef == 0:  # a1
-            tahta.beyaz_uzun_rok = False
-        elif hedef == 7:  # h1
-            tahta.beyaz_kisa_rok = False
-        elif hedef == 56:  # a8
-            tahta.siyah_uzun_rok = False
-        elif hedef == 63:  # h8
-            tahta.siyah_kisa_rok = False
+    def hamle_geri_al(self, tahta):
+        """Geçici hamleyi geri al (Tahta.hamle_geri_al üzerinden)"""
+        tahta.hamle_geri_al()
 
     def sah_tehdidinde_mi(self, tahta, beyaz):
         """Belirtilen rengin şahı tehdit altında mı"""
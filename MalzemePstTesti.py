@@ -0,0 +1,63 @@
+"""
+Malzeme+PST öz testi. Bitboard geçişinin (malzeme_pst_hesapla) ve Tahta'nın artımlı
+orta/son oyun toplamlarının bilinen referans skorları verdiğini doğrular.
+
+Kullanım:
+    python MalzemePstTesti.py
+"""
+
+import sys
+
+from Tahta import Tahta
+from LegalHamle import LegalHamleBulucu
+from Degerlendirme import Degerlendirici, kademeli_skor, malzeme_pst_hesapla
+
+# Referans skorlar (beyaz açısından): bitboard geçişinden önceki kare kare
+# malzeme_dengesi_hesapla + pozisyonel_deger_hesapla uygulamasının bu FEN'lerdeki değerleri
+MALZEME_PST_REFERANSLARI = (
+    ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', 0),
+    ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', 135),
+    ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', 25),
+    ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', 40),
+    ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', -45),
+    ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10', 0),
+    ('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3', 0),
+    ('8/8/p1p5/1p5p/1P5p/8/PPP2K1p/4R1rk w - - 0 1', -67),
+    ('8/5k2/8/2P5/8/8/5K2/8 w - - 0 1', 100),
+    ('4k3/8/8/3pP3/2P5/8/8/4K3 w - - 0 1', 105),
+    ('2k5/8/1K6/8/8/8/8/7R w - - 0 1', 520),
+    ('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1', 50),
+    ('r1b2rk1/pp1n1ppp/2pqpn2/3p4/2PP4/2NBPN2/PPQ2PPP/R4RK1 b - - 4 10', 15),
+    ('QQQ1k3/8/8/8/8/8/8/4K2q w - - 0 1', 1780),
+)
+
+
+def malzeme_pst_oz_testi():
+    """Referans skorları kontrol et; her legal hamle yapılıp geri alınırken
+    artımlı toplamlar da doğrulanır. Hatasızsa True"""
+    legal_bulucu = LegalHamleBulucu()
+    degerlendirici = Degerlendirici()
+    hata_sayisi = 0
+    for fen, beklenen in MALZEME_PST_REFERANSLARI:
+        tahta = Tahta()
+        tahta.fen_yukle(fen)
+        bitboard_skoru = kademeli_skor(*malzeme_pst_hesapla(tahta))
+        artimli = degerlendirici.malzeme_pst_skoru(tahta)
+        if not bitboard_skoru == artimli == beklenen:
+            print(f"HATA: {fen}: beklenen={beklenen}, bitboard={bitboard_skoru}, artımlı={artimli}")
+            hata_sayisi += 1
+
+        for hamle in legal_bulucu.legal_hamleleri_bul(tahta):
+            tahta.hamle_yap(hamle)
+            if not tahta.degerlendirme_dogrula():
+                hata_sayisi += 1
+            tahta.hamle_geri_al()
+        if not tahta.degerlendirme_dogrula():
+            hata_sayisi += 1
+
+    print(f"Malzeme+PST öz testi: {len(MALZEME_PST_REFERANSLARI)} pozisyon, {hata_sayisi} hata")
+    return hata_sayisi == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if malzeme_pst_oz_testi() else 1)
@@ -0,0 +1,251 @@
+"""
+Perft (performans testi) ve divide aracı. Hamle üretiminin doğruluğunu bilinen
+düğüm sayılarıyla karşılaştırmak ve ham üretim hızını ölçmek için kullanılır.
+
+Kullanım:
+    python Perft.py [derinlik] [--fen "<FEN>"] [--hash] [--tek-tek]
+                    [--paralel [işçi sayısı]] [--bolme <bölme derinliği>] [--seri]
+
+Paralel çalışmada raporlanan işçi kullanımı hızlanma değildir; gerçek hızlanma için
+--seri aynı perft'i önce tek süreçte çalıştırıp seri süre / paralel süre oranını verir.
+"""
+
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from Tahta import Tahta
+from LegalHamle import LegalHamleBulucu
+from Hamle import hamle_metni
+from Sabitler import BASLANGIC_FEN
+
+
+class Perft:
+    def __init__(self, legal_bulucu=None):
+        self.legal_bulucu = legal_bulucu if legal_bulucu is not None else LegalHamleBulucu()
+        self.hash_tablosu = {}
+        self.hash_isabet = 0
+
+    def perft(self, tahta, derinlik, toplu=True):
+        """Verilen derinlikteki yaprak düğüm sayısı.
+        toplu=True ise son katta hamleler yapılmadan legal hamle sayısı eklenir"""
+        if derinlik == 0:
+            return 1
+
+        hamleler = self.legal_bulucu.legal_hamleleri_bul(tahta)
+        if toplu and derinlik == 1:
+            return len(hamleler)
+
+        dugum = 0
+        for hamle in hamleler:
+            tahta.hamle_yap(hamle)
+            dugum += self.perft(tahta, derinlik - 1, toplu)
+            tahta.hamle_geri_al()
+        return dugum
+
+    def perft_hash(self, tahta, derinlik):
+        """Alt ağaç sayılarını (Zobrist anahtarı, derinlik) ile saklayan perft"""
+        if derinlik == 0:
+            return 1
+
+        anahtar = (tahta.zobrist_anahtari, derinlik)
+        kayit = self.hash_tablosu.get(anahtar)
+        if kayit is not None:
+            self.hash_isabet += 1
+            return kayit
+
+        hamleler = self.legal_bulucu.legal_hamleleri_bul(tahta)
+        if derinlik == 1:
+            dugum = len(hamleler)
+        else:
+            dugum = 0
+            for hamle in hamleler:
+                tahta.hamle_yap(hamle)
+                dugum += self.perft_hash(tahta, derinlik - 1)
+                tahta.hamle_geri_al()
+
+        self.hash_tablosu[anahtar] = dugum
+        return dugum
+
+    def divide(self, tahta, derinlik, toplu=True, hash_kullan=False):
+        """Her kök hamlesi için alt düğüm sayısı: [(hamle, sayı), ...]"""
+        if hash_kullan:
+            self.hash_tablosu = {}
+            self.hash_isabet = 0
+
+        sonuclar = []
+        for hamle in self.legal_bulucu.legal_hamleleri_bul(tahta):
+            tahta.hamle_yap(hamle)
+            if hash_kullan:
+                dugum = self.perft_hash(tahta, derinlik - 1)
+            else:
+                dugum = self.perft(tahta, derinlik - 1, toplu)
+            tahta.hamle_geri_al()
+            sonuclar.append((hamle, dugum))
+        return sonuclar
+
+    def calistir(self, fen=BASLANGIC_FEN, derinlik=4, toplu=True, hash_kullan=False, yazdir=True):
+        """FEN ve derinlik için divide çalıştır; toplam düğüm, süre ve düğüm/sn döndür"""
+        tahta = Tahta()
+        tahta.fen_yukle(fen)
+
+        baslangic = time.perf_counter()
+        sonuclar = self.divide(tahta, derinlik, toplu, hash_kullan) if derinlik > 0 else []
+        sure = time.perf_counter() - baslangic
+
+        toplam = sum(dugum for _, dugum in sonuclar) if derinlik > 0 else 1
+        nps = int(toplam / sure) if sure > 0 else 0
+
+        if yazdir:
+            for hamle, dugum in sorted(sonuclar, key=lambda s: hamle_metni(s[0])):
+                print(f"{hamle_metni(hamle)}: {dugum}")
+            print(f"\nHamle sayısı: {len(sonuclar)}")
+            print(f"Düğüm: {toplam}")
+            print(f"Süre: {sure:.3f} sn")
+            print(f"Düğüm/sn: {nps}")
+            if hash_kullan:
+                print(f"Hash kayıt: {len(self.hash_tablosu)}, isabet: {self.hash_isabet}")
+
+        return {'dugum': toplam, 'sure': sure, 'nps': nps, 'divide': sonuclar}
+
+
+# İşçi sürecindeki Perft nesnesi (Pool initializer ile bir kez oluşturulur)
+_isci_perft = None
+
+
+def _isci_baslat():
+    """İşçi süreci başlangıcı: legal bulucu ve tablolar görev başına değil, süreç başına kurulur"""
+    global _isci_perft
+    _isci_perft = Perft()
+
+
+def _isci_gorevi(gorev):
+    """Tek görev: FEN'den hamle önekini oynayıp kalan derinlikte perft say"""
+    fen, onek, derinlik, toplu, hash_kullan = gorev
+    # İşlemci süresi: çekirdekten az işçi varken duvar süresi işçi kullanımını şişirir
+    baslangic = time.process_time()
+
+    tahta = Tahta()
+    tahta.fen_yukle(fen)
+    for hamle in onek:
+        tahta.hamle_yap(hamle)
+
+    if hash_kullan:
+        # Hash tablosu süreç içinde görevler arasında paylaşılır
+        dugum = _isci_perft.perft_hash(tahta, derinlik)
+    else:
+        dugum = _isci_perft.perft(tahta, derinlik, toplu)
+
+    return onek, dugum, time.process_time() - baslangic, os.getpid()
+
+
+def _onekleri_topla(bulucu, tahta, derinlik, onek, onekler):
+    """Bölme derinliğine kadar tüm legal hamle dizilerini topla"""
+    if derinlik == 0:
+        onekler.append(tuple(onek))
+        return
+    for hamle in bulucu.legal_hamleleri_bul(tahta):
+        tahta.hamle_yap(hamle)
+        onek.append(hamle)
+        _onekleri_topla(bulucu, tahta, derinlik - 1, onek, onekler)
+        onek.pop()
+        tahta.hamle_geri_al()
+
+
+def paralel_perft(fen=BASLANGIC_FEN, derinlik=5, isci_sayisi=None, bolme_derinligi=1,
+                  toplu=True, hash_kullan=False, yazdir=True, seri_karsilastir=False):
+    """Perft'i bölme derinliğindeki hamle dizilerine ayırıp süreç havuzunda çalıştır.
+    Kök hamle başına sayılar, işçi başına işlemci süreleri ve işçi kullanımı (toplam işçi işlemci süresi / duvar süresi,
+    yani ortalama meşgul işçi sayısı; seri çalışmaya göre hızlanma değildir) raporlanır.
+    seri_karsilastir ile aynı perft önce tek süreçte çalıştırılır ve gerçek hızlanma (seri süre / paralel süre) eklenir"""
+    if derinlik <= 1:
+        return Perft().calistir(fen, derinlik, toplu, hash_kullan, yazdir)
+
+    isci_sayisi = isci_sayisi or os.cpu_count() or 1
+    bolme_derinligi = max(1, min(bolme_derinligi, derinlik - 1))
+
+    seri = Perft().calistir(fen, derinlik, toplu, hash_kullan, yazdir=False) if seri_karsilastir else None
+
+    baslangic = time.perf_counter()
+
+    tahta = Tahta()
+    tahta.fen_yukle(fen)
+    onekler = []
+    _onekleri_topla(LegalHamleBulucu(), tahta, bolme_derinligi, [], onekler)
+    gorevler = [(fen, onek, derinlik - bolme_derinligi, toplu, hash_kullan) for onek in onekler]
+
+    with Pool(isci_sayisi, initializer=_isci_baslat) as havuz:
+        sonuclar = havuz.map(_isci_gorevi, gorevler, chunksize=max(1, len(gorevler) // (isci_sayisi * 8)))
+
+    sure = time.perf_counter() - baslangic
+
+    # Kök hamle bazında topla, işçi bazında süreleri biriktir
+    kok_sayilari = {}
+    isci_sureleri = {}
+    for onek, dugum, gorev_suresi, pid in sonuclar:
+        kok_sayilari[onek[0]] = kok_sayilari.get(onek[0], 0) + dugum
+        isci_sureleri[pid] = isci_sureleri.get(pid, 0.0) + gorev_suresi
+
+    toplam = sum(kok_sayilari.values())
+    nps = int(toplam / sure) if sure > 0 else 0
+    isci_kullanimi = sum(isci_sureleri.values()) / sure if sure > 0 else 0.0
+    hizlanma = seri['sure'] / sure if seri and sure > 0 else None
+
+    if yazdir:
+        for hamle, dugum in sorted(kok_sayilari.items(), key=lambda s: hamle_metni(s[0])):
+            print(f"{hamle_metni(hamle)}: {dugum}")
+        print(f"\nHamle sayısı: {len(kok_sayilari)}")
+        print(f"Düğüm: {toplam}")
+        print(f"Süre: {sure:.3f} sn")
+        print(f"Düğüm/sn: {nps}")
+        print(f"Görev: {len(gorevler)} (bölme derinliği {bolme_derinligi}), işçi: {isci_sayisi}")
+        for pid, isci_suresi in sorted(isci_sureleri.items()):
+            print(f"  İşçi {pid}: {isci_suresi:.3f} sn")
+        print(f"İşçi kullanımı: {isci_kullanimi:.2f} (ortalama meşgul işçi)")
+        if seri:
+            print(f"Seri süre: {seri['sure']:.3f} sn, düğüm: {seri['dugum']}"
+                  f"{'' if seri['dugum'] == toplam else ' (UYUMSUZ)'}")
+            print(f"Hızlanma: {hizlanma:.2f}x (seri süre / paralel süre)")
+
+    return {'dugum': toplam, 'sure': sure, 'nps': nps, 'divide': list(kok_sayilari.items()),
+            'isci_sureleri': isci_sureleri, 'isci_kullanimi': isci_kullanimi, 'hizlanma': hizlanma}
+
+
+def main(argumanlar):
+    """Komut satırı: derinlik, --fen, --hash (hash'li perft), --tek-tek (toplu sayım kapalı),
+    --paralel [işçi sayısı], --bolme <bölme derinliği>, --seri (paralelde seri çalışmaya göre hızlanma)"""
+    derinlik = 4
+    fen = BASLANGIC_FEN
+    hash_kullan = '--hash' in argumanlar
+    toplu = '--tek-tek' not in argumanlar
+    paralel = '--paralel' in argumanlar
+    seri_karsilastir = '--seri' in argumanlar
+    isci_sayisi = None
+    bolme_derinligi = 1
+
+    i = 0
+    while i < len(argumanlar):
+        arguman = argumanlar[i]
+        if arguman == '--fen' and i + 1 < len(argumanlar):
+            fen = argumanlar[i + 1]
+            i += 1
+        elif arguman == '--paralel' and i + 1 < len(argumanlar) and argumanlar[i + 1].isdigit():
+            isci_sayisi = int(argumanlar[i + 1])
+            i += 1
+        elif arguman == '--bolme' and i + 1 < len(argumanlar):
+            bolme_derinligi = int(argumanlar[i + 1])
+            i += 1
+        elif arguman.isdigit():
+            derinlik = int(arguman)
+        i += 1
+
+    if paralel:
+        paralel_perft(fen, derinlik, isci_sayisi, bolme_derinligi, toplu, hash_kullan,
+                      seri_karsilastir=seri_karsilastir)
+    else:
+        Perft().calistir(fen, derinlik, toplu, hash_kullan)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
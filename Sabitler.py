@@ -0,0 +1,24 @@
+"""
+Taş kodları ve taş tabloları. Tahta'nın mailbox dizisi, hamle kodlaması ve
+taş indeksli tablolar (Zobrist, PST) aynı kodları kullanır.
+"""
+
+# Taş kodları - mailbox dizisi ve taş indeksli tablolar için
+BEYAZ_PIYON, BEYAZ_KALE, BEYAZ_AT, BEYAZ_FIL, BEYAZ_VEZIR, BEYAZ_SAH = range(6)
+SIYAH_PIYON, SIYAH_KALE, SIYAH_AT, SIYAH_FIL, SIYAH_VEZIR, SIYAH_SAH = range(6, 12)
+BOS = 12  # Boş kare
+
+TAS_TURLERI = ('piyon', 'kale', 'at', 'fil', 'vezir', 'sah')
+
+# Kod -> bitboard attribute adı
+BITBOARD_ISIMLERI = tuple(f'{renk}_{tur}' for renk in ('beyaz', 'siyah') for tur in TAS_TURLERI)
+
+# Kod -> (renk, tür); BOS kodu None verir
+TAS_BILGILERI = tuple((renk, tur) for renk in ('beyaz', 'siyah') for tur in TAS_TURLERI) + (None,)
+
+# (renk, tür) -> kod
+TAS_KODLARI = {bilgi: kod for kod, bilgi in enumerate(TAS_BILGILERI[:BOS])}
+
+# FEN taş harfleri (kod sırasıyla) ve başlangıç pozisyonu
+FEN_HARFLERI = 'PRNBQKprnbqk'
+BASLANGIC_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
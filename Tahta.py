@@ -1,8 +1,26 @@
 """
 Bitboard tabanlı satranç tahtası implementasyonu.
 64-bit integer ile her taş türü ve rengi için ayrı bitboard.
+Bitboard'larla senkron tutulan 64 karelik mailbox dizisi kare sorgularını O(1) yapar.
 """
 
+from Sabitler import (BOS, BEYAZ_PIYON, SIYAH_PIYON, BITBOARD_ISIMLERI, TAS_BILGILERI, TAS_KODLARI, FEN_HARFLERI)
+from Hamle import (BAYRAK_KAYDIR, HEDEF_KAYDIR, TERFI_KAYDIR, TAS_KAYDIR, ALINAN_KAYDIR,
+                   IKI_KARE, EN_PASSANT, KISA_ROK, UZUN_ROK, tuple_hamle_donustur,
+                   kare_notasyonu, notasyondan_kare)
+from Zobrist import (TAS_ANAHTARLARI, SIRA_ANAHTARI, ROK_ANAHTARLARI, EN_PASSANT_ANAHTARLARI,
+                     pozisyon_anahtari_hesapla, piyon_anahtari_hesapla)
+from Degerlendirme import ORTA_OYUN_TABLOSU, SON_OYUN_TABLOSU, FAZ_TABLOSU, malzeme_pst_hesapla
+
+# Geri alma yığınında null hamle (pas) kaydı
+NULL_HAMLE = 0
+
+# Debug: her hamle_yap / hamle_geri_al sonrası artımlı Zobrist anahtarını tam hesaplamayla karşılaştır
+ZOBRIST_KONTROL = False
+
+# Debug: her hamle_yap / hamle_geri_al sonrası artımlı malzeme+PST toplamlarını tam hesaplamayla karşılaştır
+DEGERLENDIRME_KONTROL = False
+
 
 class Tahta:
     def __init__(self):
@@ -31,9 +49,18 @@ class Tahta:
         self.yarim_hamle_sayici = 0
         self.hamle_sayisi = 1
 
+        # Hamle geri alma yığını (hamle_yap / hamle_geri_al)
+        self.geri_alma_yigini = []
+
         # Precalculated masks ve tablolar
         self._maskeleri_hazirla()
 
+        # Mailbox: her kare için taş kodu (BOS = boş kare)
+        self._kareleri_hazirla()
+
+        # Oynanan pozisyonların Zobrist anahtarları (tekrar tespiti için, son eleman mevcut pozisyon)
+        self.anahtar_gecmisi = [self.zobrist_anahtari]
+
     def _maskeleri_hazirla(self):
         """Sık kullanılan bit maskelerini önceden hesapla"""
         # Satır ve sütun maskeleri
@@ -47,51 +74,39 @@ class Tahta:
         # Kare bit maskeleri
         self.kare_maskeleri = [1 << i for i in range(64)]
 
-    @property
-    def beyaz_taslar(self):
-        """Tüm beyaz taşların birleşik bitboard'u"""
-        return (self.beyaz_piyon | self.beyaz_kale | self.beyaz_at |
-                self.beyaz_fil | self.beyaz_vezir | self.beyaz_sah)
+    def _kareleri_hazirla(self):
+        """Mailbox dizisini ve doluluk bitboard'larını taş bitboard'larından yeniden oluştur"""
+        self.kareler = bytearray([BOS]) * 64
+        for kod, isim in enumerate(BITBOARD_ISIMLERI):
+            bitboard = getattr(self, isim)
+            while bitboard:
+                kare = (bitboard & -bitboard).bit_length() - 1
+                self.kareler[kare] = kod
+                bitboard &= bitboard - 1
+
+        # Renk bazında ve toplam doluluk - taş eklenip kaldırıldıkça artımlı güncellenir
+        self.beyaz_taslar = (self.beyaz_piyon | self.beyaz_kale | self.beyaz_at |
+                             self.beyaz_fil | self.beyaz_vezir | self.beyaz_sah)
+        self.siyah_taslar = (self.siyah_piyon | self.siyah_kale | self.siyah_at |
+                             self.siyah_fil | self.siyah_vezir | self.siyah_sah)
+        self.tum_taslar = self.beyaz_taslar | self.siyah_taslar
+
+        # Zobrist anahtarı - taş koyma/silme ve hamle_yap içinde artımlı güncellenir
+        self.zobrist_anahtari = pozisyon_anahtari_hesapla(self)
 
-    @property
-    def siyah_taslar(self):
-        """Tüm siyah taşların birleşik bitboard'u"""
-        return (self.siyah_piyon | self.siyah_kale | self.siyah_at |
-                self.siyah_fil | self.siyah_vezir | self.siyah_sah)
+        # Sadece piyonların anahtarı (piyon hash tablosu için) - piyon koyma/silme ile artımlı
+        self.piyon_anahtari = piyon_anahtari_hesapla(self)
 
-    @property
-    def tum_taslar(self):
-        """Tüm taşların birleşik bitboard'u"""
-        return self.beyaz_taslar | self.siyah_taslar
+        # Orta/son oyun malzeme+PST skorları (beyaz açısından) ve faz ağırlığı - taş koyma/silme ile artımlı
+        self.orta_oyun_skoru, self.son_oyun_skoru, self.faz_agirligi = malzeme_pst_hesapla(self)
 
     def bit_kontrol_et(self, kare):
         """Belirtilen karede taş var mı kontrol et"""
-        return (self.tum_taslar & self.kare_maskeleri[kare]) != 0
+        return self.kareler[kare] != BOS
 
     def tas_turu_al(self, kare):
         """Belirtilen karedeki taşın türünü ve rengini döndür"""
-        if not self.bit_kontrol_et(kare):
-            return None
-
-        mask = self.kare_maskeleri[kare]
-
-        # Beyaz taşlar
-        if self.beyaz_piyon & mask: return ('beyaz', 'piyon')
-        if self.beyaz_kale & mask: return ('beyaz', 'kale')
-        if self.beyaz_at & mask: return ('beyaz', 'at')
-        if self.beyaz_fil & mask: return ('beyaz', 'fil')
-        if self.beyaz_vezir & mask: return ('beyaz', 'vezir')
-        if self.beyaz_sah & mask: return ('beyaz', 'sah')
-
-        # Siyah taşlar
-        if self.siyah_piyon & mask: return ('siyah', 'piyon')
-        if self.siyah_kale & mask: return ('siyah', 'kale')
-        if self.siyah_at & mask: return ('siyah', 'at')
-        if self.siyah_fil & mask: return ('siyah', 'fil')
-        if self.siyah_vezir & mask: return ('siyah', 'vezir')
-        if self.siyah_sah & mask: return ('siyah', 'sah')
-
-        return None
+        return TAS_BILGILERI[self.kareler[kare]]
 
     def karedeki_tas(self, kare):
         """Alias - GUI uyumluluğu için"""
@@ -99,150 +114,268 @@ class Tahta:
 
     def tas_ekle(self, kare, renk, tur):
         """Belirtilen kareye taş ekle"""
-        mask = self.kare_maskeleri[kare]
-
-        if renk == 'beyaz':
-            if tur == 'piyon':
-                self.beyaz_piyon |= mask
-            elif tur == 'kale':
-                self.beyaz_kale |= mask
-            elif tur == 'at':
-                self.beyaz_at |= mask
-            elif tur == 'fil':
-                self.beyaz_fil |= mask
-            elif tur == 'vezir':
-                self.beyaz_vezir |= mask
-            elif tur == 'sah':
-                self.beyaz_sah |= mask
-        else:
-            if tur == 'piyon':
-                self.siyah_piyon |= mask
-            elif tur == 'kale':
-                self.siyah_kale |= mask
-            elif tur == 'at':
-                self.siyah_at |= mask
-            elif tur == 'fil':
-                self.siyah_fil |= mask
-            elif tur == 'vezir':
-                self.siyah_vezir |= mask
-            elif tur == 'sah':
-                self.siyah_sah |= mask
+        self._tas_koy(kare, TAS_KODLARI[(renk, tur)])
 
     def tas_kaldir(self, kare):
         """Belirtilen kareden taşı kaldır"""
-        mask = ~self.kare_maskeleri[kare]
-
-        self.beyaz_piyon &= mask
-        self.beyaz_kale &= mask
-        self.beyaz_at &= mask
-        self.beyaz_fil &= mask
-        self.beyaz_vezir &= mask
-        self.beyaz_sah &= mask
-
-        self.siyah_piyon &= mask
-        self.siyah_kale &= mask
-        self.siyah_at &= mask
-        self.siyah_fil &= mask
-        self.siyah_vezir &= mask
-        self.siyah_sah &= mask
+        self._tas_sil(kare)
+
+    def _tas_koy(self, kare, kod):
+        """Kareye kod ile taş koy (bitboard, doluluk ve mailbox birlikte)"""
+        mask = self.kare_maskeleri[kare]
+        isim = BITBOARD_ISIMLERI[kod]
+        setattr(self, isim, getattr(self, isim) | mask)
+        if kod < SIYAH_PIYON:
+            self.beyaz_taslar |= mask
+        else:
+            self.siyah_taslar |= mask
+        self.tum_taslar |= mask
+        self.kareler[kare] = kod
+        self.zobrist_anahtari ^= TAS_ANAHTARLARI[kod][kare]
+        if kod == BEYAZ_PIYON or kod == SIYAH_PIYON:
+            self.piyon_anahtari ^= TAS_ANAHTARLARI[kod][kare]
+        self.orta_oyun_skoru += ORTA_OYUN_TABLOSU[kod][kare]
+        self.son_oyun_skoru += SON_OYUN_TABLOSU[kod][kare]
+        self.faz_agirligi += FAZ_TABLOSU[kod]
+
+    def _tas_tasi(self, kaynak, hedef):
+        """Kaynak karedeki taşı boş hedef kareye taşı"""
+        self._tas_koy(hedef, self._tas_sil(kaynak))
+
+    def _tas_sil(self, kare):
+        """Karedeki taşı kaldır ve kodunu döndür (boşsa BOS)"""
+        kod = self.kareler[kare]
+        if kod != BOS:
+            mask = ~self.kare_maskeleri[kare]
+            isim = BITBOARD_ISIMLERI[kod]
+            setattr(self, isim, getattr(self, isim) & mask)
+            if kod < SIYAH_PIYON:
+                self.beyaz_taslar &= mask
+            else:
+                self.siyah_taslar &= mask
+            self.tum_taslar &= mask
+            self.kareler[kare] = BOS
+            self.zobrist_anahtari ^= TAS_ANAHTARLARI[kod][kare]
+            if kod == BEYAZ_PIYON or kod == SIYAH_PIYON:
+                self.piyon_anahtari ^= TAS_ANAHTARLARI[kod][kare]
+            self.orta_oyun_skoru -= ORTA_OYUN_TABLOSU[kod][kare]
+            self.son_oyun_skoru -= SON_OYUN_TABLOSU[kod][kare]
+            self.faz_agirligi -= FAZ_TABLOSU[kod]
+        return kod
 
     def hamle_yap(self, hamle):
-        """Hamleyi tahtaya uygula - tuple formatında"""
-        try:
+        """Tamsayı kodlu hamleyi tahtaya yerinde uygula ve geri alma bilgisini yığına it"""
+        if type(hamle) is not int:
+            # Eski tuple formatı (geriye uyumluluk)
             if not hamle or len(hamle) < 2:
                 print(f"DEBUG: Geçersiz hamle formatı: {hamle}")
                 return False
-
-            kaynak = hamle[0]
-            hedef = hamle[1]
-            ozel_hamle = hamle[3] if len(hamle) > 3 else None
-
-            # Kare sınırları kontrolü
-            if not (0 <= kaynak <= 63) or not (0 <= hedef <= 63):
-                print(f"DEBUG: Geçersiz kare: kaynak={kaynak}, hedef={hedef}")
+            if self.kareler[hamle[0]] == BOS:
+                print(f"DEBUG: Kaynak karede taş yok: {hamle[0]}")
                 return False
+            hamle = tuple_hamle_donustur(self, hamle)
 
-            # Kaynak karedeki taşı al
-            tas_bilgisi = self.tas_turu_al(kaynak)
-            if not tas_bilgisi:
-                print(f"DEBUG: Kaynak karede taş yok: {kaynak}")
-                return False
+        kaynak = hamle & 63
+        hedef = (hamle >> HEDEF_KAYDIR) & 63
+        bayrak = (hamle >> BAYRAK_KAYDIR) & 7
+        kod = (hamle >> TAS_KAYDIR) & 15
 
-            renk, tur = tas_bilgisi
+        # Hamle bu tahtaya ait mi (oynayan taş kaynakta ve sıra onda)
+        if self.kareler[kaynak] != kod or (kod < SIYAH_PIYON) != self.beyaz_sira:
+            print(f"DEBUG: Geçersiz hamle: kaynak={kaynak}, hedef={hedef}, taş={kod}")
+            return False
 
-            # Doğru renk kontrolü
-            if (renk == 'beyaz') != self.beyaz_sira:
-                print(f"DEBUG: Yanlış renk: {renk}, sıra: {'beyaz' if self.beyaz_sira else 'siyah'}")
-                return False
+        # Geri alınamayan durumu kaydet: hamle, rok hakları, en passant karesi,
+        # yarım hamle sayacı ve Zobrist anahtarı (oynayan ve alınan taş hamlenin içinde)
+        self.geri_alma_yigini.append((
+            hamle,
+            self.beyaz_kisa_rok, self.beyaz_uzun_rok,
+            self.siyah_kisa_rok, self.siyah_uzun_rok,
+            self.en_passant_kare, self.yarim_hamle_sayici,
+            self.zobrist_anahtari
+        ))
+        eski_rok = self.rok_maskesi()
+        if self.en_passant_kare != -1:
+            self.zobrist_anahtari ^= EN_PASSANT_ANAHTARLARI[self.en_passant_kare & 7]
+
+        # Yarım hamle sayacı: piyon hamlesi veya alma sıfırlar (50 hamle kuralı)
+        if kod == BEYAZ_PIYON or kod == SIYAH_PIYON or (hamle >> ALINAN_KAYDIR) & 15 != BOS:
+            self.yarim_hamle_sayici = 0
+        else:
+            self.yarim_hamle_sayici += 1
 
-            # Hedef karedeki taşı kaldır (eğer varsa)
-            self.tas_kaldir(hedef)
+        # Hedef ve kaynak karedeki taşları kaldır
+        self._tas_sil(hedef)
+        self._tas_sil(kaynak)
 
-            # Kaynak karedeki taşı kaldır
-            self.tas_kaldir(kaynak)
+        terfi = (hamle >> TERFI_KAYDIR) & 15
+        if terfi:
+            # Piyon terfisi
+            self._tas_koy(hedef, terfi)
+        else:
+            self._tas_koy(hedef, kod)
 
             # Özel hamle durumları
-            if ozel_hamle == 'kisa_rok':
-                if renk == 'beyaz':
-                    self.tas_kaldir(7)  # h1
-                    self.tas_ekle(5, 'beyaz', 'kale')  # f1
-                    self.tas_ekle(6, 'beyaz', 'sah')  # g1
-                else:
-                    self.tas_kaldir(63)  # h8
-                    self.tas_ekle(61, 'siyah', 'kale')  # f8
-                    self.tas_ekle(62, 'siyah', 'sah')  # g8
-
-            elif ozel_hamle == 'uzun_rok':
-                if renk == 'beyaz':
-                    self.tas_kaldir(0)  # a1
-                    self.tas_ekle(3, 'beyaz', 'kale')  # d1
-                    self.tas_ekle(2, 'beyaz', 'sah')  # c1
-                else:
-                    self.tas_kaldir(56)  # a8
-                    self.tas_ekle(59, 'siyah', 'kale')  # d8
-                    self.tas_ekle(58, 'siyah', 'sah')  # c8
-
-            elif ozel_hamle == 'en_passant':
+            if bayrak == KISA_ROK:
+                self._tas_tasi(kaynak + 3, kaynak + 1)  # h1-f1 / h8-f8
+            elif bayrak == UZUN_ROK:
+                self._tas_tasi(kaynak - 4, kaynak - 1)  # a1-d1 / a8-d8
+            elif bayrak == EN_PASSANT:
                 # Alınan piyonu kaldır
-                alinen_piyon_kare = hedef + (-8 if renk == 'beyaz' else 8)
-                self.tas_kaldir(alinen_piyon_kare)
-                self.tas_ekle(hedef, renk, tur)
-
-            elif ozel_hamle in ['terfi', 'terfi_alma']:
-                # Piyon terfisi
-                terfi_tasi = hamle[4] if len(hamle) > 4 else 'vezir'
-                self.tas_ekle(hedef, renk, terfi_tasi)
-
-            elif ozel_hamle == 'iki_kare':
-                # İki kare piyon hamlesi
-                self.en_passant_kare = (kaynak + hedef) // 2
-                self.tas_ekle(hedef, renk, tur)
-
-            else:
-                # Normal hamle
-                self.tas_ekle(hedef, renk, tur)
-
-            # Rok haklarını güncelle
-            self._rok_haklarini_guncelle(kaynak, hedef, renk, tur)
-
-            # En passant karesi sıfırla (iki kare piyon hamlesi dışında)
-            if ozel_hamle != 'iki_kare':
-                self.en_passant_kare = -1
+                self._tas_sil(hedef - 8 if kod < SIYAH_PIYON else hedef + 8)
 
-            # Sırayı değiştir
-            self.beyaz_sira = not self.beyaz_sira
+        # Rok haklarını güncelle
+        renk, tur = TAS_BILGILERI[kod]
+        self._rok_haklarini_guncelle(kaynak, hedef, renk, tur)
 
-            # Hamle sayısını artır
-            if not self.beyaz_sira:  # Siyah oynadıysa
-                self.hamle_sayisi += 1
+        yeni_rok = self.rok_maskesi()
+        if yeni_rok != eski_rok:
+            self.zobrist_anahtari ^= ROK_ANAHTARLARI[eski_rok] ^ ROK_ANAHTARLARI[yeni_rok]
 
-            return True
+        # En passant karesi sadece iki kare piyon hamlesinde açılır
+        if bayrak == IKI_KARE:
+            self.en_passant_kare = (kaynak + hedef) // 2
+            self.zobrist_anahtari ^= EN_PASSANT_ANAHTARLARI[self.en_passant_kare & 7]
+        else:
+            self.en_passant_kare = -1
+
+        # Sırayı değiştir
+        self.beyaz_sira = not self.beyaz_sira
+        self.zobrist_anahtari ^= SIRA_ANAHTARI
+
+        # Hamle sayısını artır
+        if self.beyaz_sira:  # Siyah oynadıysa
+            self.hamle_sayisi += 1
+
+        self.anahtar_gecmisi.append(self.zobrist_anahtari)
+
+        if ZOBRIST_KONTROL:
+            self.zobrist_dogrula()
+        if DEGERLENDIRME_KONTROL:
+            self.degerlendirme_dogrula()
+
+        return True
+
+    def hamle_geri_al(self):
+        """Son hamle_yap çağrısını yığındaki bilgiyle geri al"""
+        (hamle,
+         self.beyaz_kisa_rok, self.beyaz_uzun_rok,
+         self.siyah_kisa_rok, self.siyah_uzun_rok,
+         self.en_passant_kare, self.yarim_hamle_sayici,
+         zobrist_anahtari) = self.geri_alma_yigini.pop()
+        self.anahtar_gecmisi.pop()
+
+        kaynak = hamle & 63
+        hedef = (hamle >> HEDEF_KAYDIR) & 63
+        bayrak = (hamle >> BAYRAK_KAYDIR) & 7
+        kod = (hamle >> TAS_KAYDIR) & 15
+        alinan = (hamle >> ALINAN_KAYDIR) & 15
+
+        # Sırayı geri çevir
+        if self.beyaz_sira:  # Siyah oynamıştı
+            self.hamle_sayisi -= 1
+        self.beyaz_sira = not self.beyaz_sira
+
+        # Taşı kaynak kareye geri koy
+        self._tas_sil(hedef)
+        self._tas_koy(kaynak, kod)
+
+        # Özel hamle geri alma işlemleri
+        if bayrak == KISA_ROK:
+            self._tas_tasi(kaynak + 1, kaynak + 3)  # f1-h1 / f8-h8
+        elif bayrak == UZUN_ROK:
+            self._tas_tasi(kaynak - 1, kaynak - 4)  # d1-a1 / d8-a8
+        elif bayrak == EN_PASSANT:
+            # Alınan piyonu geri koy
+            self._tas_koy(hedef - 8 if kod < SIYAH_PIYON else hedef + 8, alinan)
+        elif alinan != BOS:
+            self._tas_koy(hedef, alinan)
+
+        # Taş koyma/silme anahtarı değiştirdi; hamle öncesi anahtar yığından geri yüklenir
+        self.zobrist_anahtari = zobrist_anahtari
+
+        if ZOBRIST_KONTROL:
+            self.zobrist_dogrula()
+        if DEGERLENDIRME_KONTROL:
+            self.degerlendirme_dogrula()
+
+    def null_hamle_yap(self):
+        """Null hamle (pas): taşlara dokunmadan sırayı değiştir ve en passant hakkını kaldır.
+        Null hamle tekrar zincirini keser; yarım hamle sayacı geri alınana kadar sıfırlanır"""
+        self.geri_alma_yigini.append((
+            NULL_HAMLE,
+            self.beyaz_kisa_rok, self.beyaz_uzun_rok,
+            self.siyah_kisa_rok, self.siyah_uzun_rok,
+            self.en_passant_kare, self.yarim_hamle_sayici,
+            self.zobrist_anahtari
+        ))
+
+        if self.en_passant_kare != -1:
+            self.zobrist_anahtari ^= EN_PASSANT_ANAHTARLARI[self.en_passant_kare & 7]
+            self.en_passant_kare = -1
+        self.yarim_hamle_sayici = 0
 
-        except Exception as e:
-            print(f"DEBUG: Hamle yapma hatası: {e}, hamle: {hamle}")
-            import traceback
-            traceback.print_exc()
+        self.beyaz_sira = not self.beyaz_sira
+        self.zobrist_anahtari ^= SIRA_ANAHTARI
+        self.anahtar_gecmisi.append(self.zobrist_anahtari)
+
+    def null_hamle_geri_al(self):
+        """null_hamle_yap çağrısını geri al"""
+        (_, _, _, _, _,
+         self.en_passant_kare, self.yarim_hamle_sayici,
+         self.zobrist_anahtari) = self.geri_alma_yigini.pop()
+        self.anahtar_gecmisi.pop()
+        self.beyaz_sira = not self.beyaz_sira
+
+    def tekrar_sayisi(self):
+        """Mevcut pozisyonun daha önce kaç kez oluştuğu.
+        Sadece son geri alınamaz hamleye (piyon hamlesi/alma) kadar ve aynı taraf sıradayken bakılır"""
+        gecmis = self.anahtar_gecmisi
+        anahtar = gecmis[-1]
+        sinir = max(len(gecmis) - 1 - self.yarim_hamle_sayici, 0)
+
+        sayi = 0
+        for i in range(len(gecmis) - 3, sinir - 1, -2):
+            if gecmis[i] == anahtar:
+                sayi += 1
+        return sayi
+
+    def uc_kez_tekrar_mi(self):
+        """Üç kez tekrar ile beraberlik"""
+        return self.tekrar_sayisi() >= 2
+
+    def elli_hamle_kurali_mi(self):
+        """50 hamle kuralı ile beraberlik (piyon hamlesi ve alma olmadan 100 yarım hamle)"""
+        return self.yarim_hamle_sayici >= 100
+
+    def rok_maskesi(self):
+        """Rok haklarını 4 bitlik maske olarak döndür (1: beyaz kısa, 2: beyaz uzun, 4: siyah kısa, 8: siyah uzun)"""
+        return (self.beyaz_kisa_rok | (self.beyaz_uzun_rok << 1) |
+                (self.siyah_kisa_rok << 2) | (self.siyah_uzun_rok << 3))
+
+    def zobrist_dogrula(self):
+        """Artımlı Zobrist ve piyon anahtarlarını tam hesaplamayla karşılaştır (debug amaçlı)"""
+        hesaplanan = pozisyon_anahtari_hesapla(self)
+        if hesaplanan != self.zobrist_anahtari:
+            print(f"DEBUG: Zobrist anahtarı uyuşmuyor: artımlı=0x{self.zobrist_anahtari:016X}, "
+                  f"hesaplanan=0x{hesaplanan:016X}, FEN={self.fen_al()}")
+            return False
+        hesaplanan = piyon_anahtari_hesapla(self)
+        if hesaplanan != self.piyon_anahtari:
+            print(f"DEBUG: Piyon anahtarı uyuşmuyor: artımlı=0x{self.piyon_anahtari:016X}, "
+                  f"hesaplanan=0x{hesaplanan:016X}, FEN={self.fen_al()}")
             return False
+        return True
+
+    def degerlendirme_dogrula(self):
+        """Artımlı malzeme+PST toplamlarını ve faz ağırlığını tam hesaplamayla karşılaştır (debug amaçlı)"""
+        hesaplanan = malzeme_pst_hesapla(self)
+        artimli = (self.orta_oyun_skoru, self.son_oyun_skoru, self.faz_agirligi)
+        if hesaplanan != artimli:
+            print(f"DEBUG: Değerlendirme toplamları uyuşmuyor: artımlı={artimli}, "
+                  f"hesaplanan={hesaplanan}, FEN={self.fen_al()}")
+            return False
+        return True
 
     def _rok_haklarini_guncelle(self, kaynak, hedef, renk, tur):
         """Rok haklarını güncelle"""
@@ -292,6 +425,16 @@ class Tahta:
         yeni_tahta.siyah_fil = self.siyah_fil
         yeni_tahta.siyah_vezir = self.siyah_vezir
         yeni_tahta.siyah_sah = self.siyah_sah
+        yeni_tahta.kareler = bytearray(self.kareler)
+        yeni_tahta.beyaz_taslar = self.beyaz_taslar
+        yeni_tahta.siyah_taslar = self.siyah_taslar
+        yeni_tahta.tum_taslar = self.tum_taslar
+        yeni_tahta.zobrist_anahtari = self.zobrist_anahtari
+        yeni_tahta.piyon_anahtari = self.piyon_anahtari
+        yeni_tahta.orta_oyun_skoru = self.orta_oyun_skoru
+        yeni_tahta.son_oyun_skoru = self.son_oyun_skoru
+        yeni_tahta.faz_agirligi = self.faz_agirligi
+        yeni_tahta.anahtar_gecmisi = list(self.anahtar_gecmisi)
 
         yeni_tahta.beyaz_sira = self.beyaz_sira
         yeni_tahta.beyaz_kisa_rok = self.beyaz_kisa_rok
@@ -304,6 +447,67 @@ class Tahta:
 
         return yeni_tahta
 
+    def fen_yukle(self, fen):
+        """FEN metninden pozisyonu yükle (geri alma yığını sıfırlanır)"""
+        alanlar = fen.split()
+        if len(alanlar) < 4:
+            raise ValueError(f"Geçersiz FEN: {fen}")
+
+        for isim in BITBOARD_ISIMLERI:
+            setattr(self, isim, 0)
+
+        satir, sutun = 7, 0
+        for karakter in alanlar[0]:
+            if karakter == '/':
+                satir -= 1
+                sutun = 0
+            elif karakter.isdigit():
+                sutun += int(karakter)
+            else:
+                kod = FEN_HARFLERI.index(karakter)
+                isim = BITBOARD_ISIMLERI[kod]
+                setattr(self, isim, getattr(self, isim) | (1 << (satir * 8 + sutun)))
+                sutun += 1
+
+        self.beyaz_sira = alanlar[1] == 'w'
+        self.beyaz_kisa_rok = 'K' in alanlar[2]
+        self.beyaz_uzun_rok = 'Q' in alanlar[2]
+        self.siyah_kisa_rok = 'k' in alanlar[2]
+        self.siyah_uzun_rok = 'q' in alanlar[2]
+        self.en_passant_kare = -1 if alanlar[3] == '-' else notasyondan_kare(alanlar[3])
+        self.yarim_hamle_sayici = int(alanlar[4]) if len(alanlar) > 4 else 0
+        self.hamle_sayisi = int(alanlar[5]) if len(alanlar) > 5 else 1
+
+        self.geri_alma_yigini = []
+        self._kareleri_hazirla()
+        self.anahtar_gecmisi = [self.zobrist_anahtari]
+
+    def fen_al(self):
+        """Pozisyonu FEN metni olarak döndür"""
+        satirlar = []
+        for satir in range(7, -1, -1):
+            metin = ''
+            bos = 0
+            for sutun in range(8):
+                kod = self.kareler[satir * 8 + sutun]
+                if kod == BOS:
+                    bos += 1
+                    continue
+                if bos:
+                    metin += str(bos)
+                    bos = 0
+                metin += FEN_HARFLERI[kod]
+            if bos:
+                metin += str(bos)
+            satirlar.append(metin)
+
+        rok = (('K' if self.beyaz_kisa_rok else '') + ('Q' if self.beyaz_uzun_rok else '') +
+               ('k' if self.siyah_kisa_rok else '') + ('q' if self.siyah_uzun_rok else '')) or '-'
+        en_passant = kare_notasyonu(self.en_passant_kare) if self.en_passant_kare != -1 else '-'
+
+        return (f"{'/'.join(satirlar)} {'w' if self.beyaz_sira else 'b'} {rok} {en_passant} "
+                f"{self.yarim_hamle_sayici} {self.hamle_sayisi}")
+
     def bit_sayisi(self, bitboard):
         """Bitboard'daki set bit sayısını döndür (popcount)"""
         return bin(bitboard).count('1')
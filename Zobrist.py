@@ -4,165 +4,95 @@ Transposition table ve tekrar pozisyon tespiti için optimize edilmiş.
 """
 
 import random
+from array import array
+
+from Sabitler import BOS, BEYAZ_PIYON, SIYAH_PIYON
+
+# Transposition table sınır türleri (SINIR_YOK = boş kayıt)
+SINIR_YOK = 0
+KESIN = 1       # Skor tam değer
+ALT_SINIR = 2   # Beta kesmesi: gerçek skor >= kayıtlı skor
+UST_SINIR = 3   # Alpha geçilemedi: gerçek skor <= kayıtlı skor
+
+# Kova başına kayıt (derinlik öncelikli + her zaman yazılan) ve kayıt başına bayt
+KOVA_BOYUTU = 2
+KAYIT_BAYT = 8 + 4 + 4 + 1 + 1 + 1
+
+# Piyon hash tablosu kayıt sayısı (2'nin kuvveti)
+PIYON_TABLOSU_BOYUTU = 1 << 14
+
+
+def anahtar_tablolari_olustur(seed=12345):
+    """Rastgele 64-bit anahtar tabloları: (taş kodu x kare, sıra, rok maskesi, en passant sütunu).
+    Rok tablosu 4 bitlik rok maskesinin (Tahta.rok_maskesi) 16 değeri için önceden XOR'lanmıştır"""
+    rastgele = random.Random(seed)  # Tekrarlanabilir, global random durumunu etkilemez
+
+    tas_anahtarlari = tuple(tuple(rastgele.getrandbits(64) for _ in range(64)) for _ in range(BOS))
+    sira_anahtari = rastgele.getrandbits(64)
+
+    rok_bitleri = [rastgele.getrandbits(64) for _ in range(4)]
+    rok_anahtarlari = []
+    for maske in range(16):
+        anahtar = 0
+        for bit in range(4):
+            if maske & (1 << bit):
+                anahtar ^= rok_bitleri[bit]
+        rok_anahtarlari.append(anahtar)
+
+    en_passant_anahtarlari = tuple(rastgele.getrandbits(64) for _ in range(8))
+
+    return tas_anahtarlari, sira_anahtari, tuple(rok_anahtarlari), en_passant_anahtarlari
 
-class ZobristHash:
-    def __init__(self, seed=12345):
-        """Zobrist hash tablosunu başlat"""
-        random.seed(seed)  # Tekrarlanabilir rastgele sayılar için
-
-        # Her taş türü ve pozisyon için rastgele 64-bit sayılar
-        self.tas_hash_tablosu = {}
-        self._hash_tablosunu_olustur()
-
-        # Özel durumlar için hash değerleri
-        self.beyaz_sira_hash = self._rastgele_64bit()
-        self.rok_hash = {
-            'beyaz_kisa': self._rastgele_64bit(),
-            'beyaz_uzun': self._rastgele_64bit(),
-            'siyah_kisa': self._rastgele_64bit(),
-            'siyah_uzun': self._rastgele_64bit()
-        }
 
-        # En passant için hash değerleri (her sütun için)
-        self.en_passant_hash = [self._rastgele_64bit() for _ in range(8)]
+# Tahta'nın artımlı anahtarı için varsayılan tablolar
+TAS_ANAHTARLARI, SIRA_ANAHTARI, ROK_ANAHTARLARI, EN_PASSANT_ANAHTARLARI = anahtar_tablolari_olustur()
 
-    def _rastgele_64bit(self):
-        """64-bit rastgele sayı üret"""
-        return random.getrandbits(64)
 
-    def _hash_tablosunu_olustur(self):
-        """Tüm taş türleri ve pozisyonlar için hash tablosunu oluştur"""
-        tas_turleri = [
-            ('beyaz', 'piyon'), ('beyaz', 'kale'), ('beyaz', 'at'),
-            ('beyaz', 'fil'), ('beyaz', 'vezir'), ('beyaz', 'sah'),
-            ('siyah', 'piyon'), ('siyah', 'kale'), ('siyah', 'at'),
-            ('siyah', 'fil'), ('siyah', 'vezir'), ('siyah', 'sah')
-        ]
+def pozisyon_anahtari_hesapla(tahta, tablolar=None):
+    """Pozisyonun Zobrist anahtarını sıfırdan hesapla (varsayılan tablolar ile Tahta.zobrist_anahtari'na eşit)"""
+    if tablolar is None:
+        tas_anahtarlari, sira_anahtari, rok_anahtarlari, en_passant_anahtarlari = (
+            TAS_ANAHTARLARI, SIRA_ANAHTARI, ROK_ANAHTARLARI, EN_PASSANT_ANAHTARLARI)
+    else:
+        tas_anahtarlari, sira_anahtari, rok_anahtarlari, en_passant_anahtarlari = tablolar
 
-        for renk, tur in tas_turleri:
-            self.tas_hash_tablosu[(renk, tur)] = [self._rastgele_64bit() for _ in range(64)]
+    anahtar = 0
+    for kare, kod in enumerate(tahta.kareler):
+        if kod != BOS:
+            anahtar ^= tas_anahtarlari[kod][kare]
+
+    if tahta.beyaz_sira:
+        anahtar ^= sira_anahtari
+    anahtar ^= rok_anahtarlari[tahta.rok_maskesi()]
+    if tahta.en_passant_kare != -1:
+        anahtar ^= en_passant_anahtarlari[tahta.en_passant_kare % 8]
+
+    return anahtar
+
+
+def piyon_anahtari_hesapla(tahta):
+    """Sadece piyonların Zobrist anahtarı (Tahta.piyon_anahtari'na eşit)"""
+    anahtar = 0
+    for kod in (BEYAZ_PIYON, SIYAH_PIYON):
+        anahtarlar = TAS_ANAHTARLARI[kod]
+        piyonlar = tahta.beyaz_piyon if kod == BEYAZ_PIYON else tahta.siyah_piyon
+        while piyonlar:
+            anahtar ^= anahtarlar[(piyonlar & -piyonlar).bit_length() - 1]
+            piyonlar &= piyonlar - 1
+    return anahtar
+
+
+class ZobristHash:
+    def __init__(self, seed=12345):
+        """Zobrist hash tablosunu başlat"""
+        # Taş kodu indeksli tablolar: tas_hash_tablosu[kod][kare]
+        (self.tas_hash_tablosu, self.beyaz_sira_hash,
+         self.rok_hash, self.en_passant_hash) = anahtar_tablolari_olustur(seed)
 
     def pozisyon_hash_hesapla(self, tahta):
         """Tahta pozisyonu için tam hash hesapla"""
-        hash_degeri = 0
-
-        # Tüm taşlar için hash hesapla
-        for kare in range(64):
-            tas_bilgisi = tahta.tas_turu_al(kare)
-            if tas_bilgisi:
-                renk, tur = tas_bilgisi
-                hash_degeri ^= self.tas_hash_tablosu[(renk, tur)][kare]
-
-        # Sıra hash'i
-        if tahta.beyaz_sira:
-            hash_degeri ^= self.beyaz_sira_hash
-
-        # Rok hakları hash'i
-        if tahta.beyaz_kisa_rok:
-            hash_degeri ^= self.rok_hash['beyaz_kisa']
-        if tahta.beyaz_uzun_rok:
-            hash_degeri ^= self.rok_hash['beyaz_uzun']
-        if tahta.siyah_kisa_rok:
-            hash_degeri ^= self.rok_hash['siyah_kisa']
-        if tahta.siyah_uzun_rok:
-            hash_degeri ^= self.rok_hash['siyah_uzun']
-
-        # En passant hash'i
-        if tahta.en_passant_kare != -1:
-            sutun = tahta.en_passant_kare % 8
-            hash_degeri ^= self.en_passant_hash[sutun]
-
-        return hash_degeri
-
-    def hamle_hash_guncelle(self, mevcut_hash, tahta, hamle, onceki_durum=None):
-        """Hamle sonrası hash'i artımlı olarak güncelle"""
-        kaynak, hedef = hamle[0], hamle[1]
-        hamle_turu = hamle[3] if len(hamle) > 3 else 'normal'
-
-        yeni_hash = mevcut_hash
-
-        # Sıra değişimi
-        yeni_hash ^= self.beyaz_sira_hash
-
-        # Kaynak karedeki taşı kaldır
-        if onceki_durum and onceki_durum.get('kaynak_tas'):
-            renk, tur = onceki_durum['kaynak_tas']
-            yeni_hash ^= self.tas_hash_tablosu[(renk, tur)][kaynak]
-
-        # Hedef karedeki taşı kaldır (eğer alma hamlesi ise)
-        if onceki_durum and onceki_durum.get('hedef_tas'):
-            renk, tur = onceki_durum['hedef_tas']
-            yeni_hash ^= self.tas_hash_tablosu[(renk, tur)][hedef]
-
-        # Yeni pozisyondaki taşı ekle
-        yeni_tas_bilgisi = tahta.tas_turu_al(hedef)
-        if yeni_tas_bilgisi:
-            renk, tur = yeni_tas_bilgisi
-            yeni_hash ^= self.tas_hash_tablosu[(renk, tur)][hedef]
-
-        # Özel hamle durumları
-        if hamle_turu == 'kisa_rok':
-            # Kale hareketini de hash'e dahil et
-            renk = 'beyaz' if onceki_durum['beyaz_sira'] else 'siyah'
-            if renk == 'beyaz':
-                yeni_hash ^= self.tas_hash_tablosu[('beyaz', 'kale')][7]  # h1'den kaldır
-                yeni_hash ^= self.tas_hash_tablosu[('beyaz', 'kale')][5]  # f1'e ekle
-            else:
-                yeni_hash ^= self.tas_hash_tablosu[('siyah', 'kale')][63]  # h8'den kaldır
-                yeni_hash ^= self.tas_hash_tablosu[('siyah', 'kale')][61]  # f8'e ekle
-
-        elif hamle_turu == 'uzun_rok':
-            # Kale hareketini de hash'e dahil et
-            renk = 'beyaz' if onceki_durum['beyaz_sira'] else 'siyah'
-            if renk == 'beyaz':
-                yeni_hash ^= self.tas_hash_tablosu[('beyaz', 'kale')][0]  # a1'den kaldır
-                yeni_hash ^= self.tas_hash_tablosu[('beyaz', 'kale')][3]  # d1'e ekle
-            else:
-                yeni_hash ^= self.tas_hash_tablosu[('siyah', 'kale')][56]  # a8'den kaldır
-                yeni_hash ^= self.tas_hash_tablosu[('siyah', 'kale')][59]  # d8'e ekle
-
-        elif hamle_turu == 'en_passant':
-            # Alınan piyonu hash'den çıkar
-            if onceki_durum and 'alinen_piyon' in onceki_durum:
-                renk, tur = onceki_durum['alinen_piyon']
-                alinen_kare = onceki_durum['en_passant_hedef']
-                yeni_hash ^= self.tas_hash_tablosu[(renk, tur)][alinen_kare]
-
-        # Rok hakları değişimi
-        if onceki_durum:
-            # Eski rok haklarını çıkar
-            if onceki_durum['beyaz_kisa_rok']:
-                yeni_hash ^= self.rok_hash['beyaz_kisa']
-            if onceki_durum['beyaz_uzun_rok']:
-                yeni_hash ^= self.rok_hash['beyaz_uzun']
-            if onceki_durum['siyah_kisa_rok']:
-                yeni_hash ^= self.rok_hash['siyah_kisa']
-            if onceki_durum['siyah_uzun_rok']:
-                yeni_hash ^= self.rok_hash['siyah_uzun']
-
-            # Yeni rok haklarını ekle
-            if tahta.beyaz_kisa_rok:
-                yeni_hash ^= self.rok_hash['beyaz_kisa']
-            if tahta.beyaz_uzun_rok:
-                yeni_hash ^= self.rok_hash['beyaz_uzun']
-            if tahta.siyah_kisa_rok:
-                yeni_hash ^= self.rok_hash['siyah_kisa']
-            if tahta.siyah_uzun_rok:
-                yeni_hash ^= self.rok_hash['siyah_uzun']
-
-        # En passant değişimi
-        if onceki_durum:
-            # Eski en passant hash'ini çıkar
-            if onceki_durum['en_passant_kare'] != -1:
-                eski_sutun = onceki_durum['en_passant_kare'] % 8
-                yeni_hash ^= self.en_passant_hash[eski_sutun]
-
-            # Yeni en passant hash'ini ekle
-            if tahta.en_passant_kare != -1:
-                yeni_sutun = tahta.en_passant_kare % 8
-                yeni_hash ^= self.en_passant_hash[yeni_sutun]
-
-        return yeni_hash
+        return pozisyon_anahtari_hesapla(
+            tahta, (self.tas_hash_tablosu, self.beyaz_sira_hash, self.rok_hash, self.en_passant_hash))
 
     def hash_dogrula(self, tahta, beklenen_hash):
         """Hash doğruluğunu kontrol et (debug amaçlı)"""
@@ -175,9 +105,158 @@ class ZobristHash:
 
 
 class TranspositionTable:
-    """Zobrist hash tabanlı pozisyon saklama tablosu"""
+    """Zobrist hash tabanlı pozisyon saklama tablosu.
+    Önceden ayrılmış düz dizilerde tutulur; her kova iki kayıtlıdır:
+    derinlik öncelikli kayıt ve her zaman üzerine yazılan kayıt."""
 
     def __init__(self, boyut_mb=64):
         """Transposition table başlat"""
-        # MB cinsinden boyutu entry sayısına çevir
-        # Her entry: hash
\ No newline at end of file
+        # MB cinsinden boyutu kova sayısına çevir (2'nin kuvveti, indeks = hash & maske)
+        kova_sayisi = 1
+        while kova_sayisi * 2 * KOVA_BOYUTU * KAYIT_BAYT <= boyut_mb * 1024 * 1024:
+            kova_sayisi *= 2
+        self.maske = kova_sayisi - 1
+        self.kayit_sayisi = kova_sayisi * KOVA_BOYUTU
+
+        # Her alan ayrı düz dizi; kayıt indeksi = kova * 2 (+1 her zaman yazılan kayıt)
+        self.anahtarlar = array('Q', bytes(8 * self.kayit_sayisi))
+        self.hamleler = array('I', bytes(4 * self.kayit_sayisi))
+        self.skorlar = array('i', bytes(4 * self.kayit_sayisi))
+        self.derinlikler = array('b', bytes(self.kayit_sayisi))
+        self.sinirlar = array('B', bytes(self.kayit_sayisi))
+        self.nesiller = array('B', bytes(self.kayit_sayisi))
+
+        self.nesil = 0
+        self.sorgu_sayisi = 0
+        self.isabet_sayisi = 0
+        self.carpisma_sayisi = 0
+        self.yazma_sayisi = 0
+
+    def yeni_arama(self):
+        """Yeni arama başlangıcı: nesli ilerlet (eski nesil kayıtları önce değiştirilir),
+        istatistikleri sıfırla (kayıtlar korunur)"""
+        self.nesil = (self.nesil + 1) & 255
+        self.sorgu_sayisi = 0
+        self.isabet_sayisi = 0
+        self.carpisma_sayisi = 0
+        self.yazma_sayisi = 0
+
+    def sorgula(self, anahtar):
+        """Anahtara ait kaydı (derinlik, skor, sınır, hamle) olarak döndür; yoksa None.
+        Hamle yoksa 0 döner"""
+        self.sorgu_sayisi += 1
+        indeks = (anahtar & self.maske) * KOVA_BOYUTU
+        anahtarlar = self.anahtarlar
+
+        for i in (indeks, indeks + 1):
+            if anahtarlar[i] == anahtar and self.sinirlar[i] != SINIR_YOK:
+                self.isabet_sayisi += 1
+                return self.derinlikler[i], self.skorlar[i], self.sinirlar[i], self.hamleler[i]
+
+        # Kova başka pozisyonlarla dolu
+        if self.sinirlar[indeks] != SINIR_YOK:
+            self.carpisma_sayisi += 1
+        return None
+
+    def kaydet(self, anahtar, derinlik, skor, sinir, hamle=None):
+        """Kaydı kovaya yaz: derinlik öncelikli kayıt aynı pozisyon, eski nesil veya
+        daha sığ kayıt ise değiştirilir; aksi halde her zaman yazılan kayda gider"""
+        self.yazma_sayisi += 1
+        indeks = (anahtar & self.maske) * KOVA_BOYUTU
+
+        if (self.sinirlar[indeks] == SINIR_YOK or self.anahtarlar[indeks] == anahtar or
+                self.nesiller[indeks] != self.nesil or derinlik >= self.derinlikler[indeks]):
+            # Aynı pozisyonun yeni kaydı hamle vermiyorsa eski hash hamlesi korunur
+            if hamle is None and self.anahtarlar[indeks] == anahtar:
+                hamle = self.hamleler[indeks]
+        else:
+            indeks += 1
+
+        self.anahtarlar[indeks] = anahtar
+        self.derinlikler[indeks] = max(-128, min(127, derinlik))
+        self.skorlar[indeks] = int(skor)
+        self.sinirlar[indeks] = sinir
+        self.hamleler[indeks] = hamle or 0
+        self.nesiller[indeks] = self.nesil
+
+    def temizle(self):
+        """Tüm kayıtları ve istatistikleri sıfırla"""
+        self.sinirlar = array('B', bytes(self.kayit_sayisi))
+        self.nesil = 0
+        self.sorgu_sayisi = 0
+        self.isabet_sayisi = 0
+        self.carpisma_sayisi = 0
+        self.yazma_sayisi = 0
+
+    def doluluk(self, ornek=1000):
+        """Bu nesilde yazılmış kayıtların oranı (ilk kayıtlardan örnekleyerek)"""
+        ornek = min(ornek, self.kayit_sayisi)
+        dolu = sum(1 for i in range(ornek)
+                   if self.sinirlar[i] != SINIR_YOK and self.nesiller[i] == self.nesil)
+        return dolu / ornek
+
+    def get_istatistikler(self):
+        """Sorgu, isabet, çarpışma ve yazma sayıları"""
+        return {
+            'tt_sorgu': self.sorgu_sayisi,
+            'tt_isabet': self.isabet_sayisi,
+            'tt_carpisma': self.carpisma_sayisi,
+            'tt_yazma': self.yazma_sayisi,
+            'tt_isabet_orani': self.isabet_sayisi / self.sorgu_sayisi if self.sorgu_sayisi else 0.0,
+            'tt_doluluk': self.doluluk()
+        }
+
+
+class PiyonHashTablosu:
+    """Piyon anahtarı ile indekslenen sabit boyutlu piyon yapısı tablosu.
+    Piyon yapısı skoru ve iki tarafın geçer piyon bitboard'larını saklar; çakışmada üzerine yazılır"""
+
+    def __init__(self, kayit_sayisi=PIYON_TABLOSU_BOYUTU):
+        """Piyon hash tablosunu başlat"""
+        self.maske = kayit_sayisi - 1
+        self.kayit_sayisi = kayit_sayisi
+        self.anahtarlar = array('Q', bytes(8 * kayit_sayisi))
+        self.skorlar = array('i', bytes(4 * kayit_sayisi))
+        self.beyaz_gecerler = array('Q', bytes(8 * kayit_sayisi))
+        self.siyah_gecerler = array('Q', bytes(8 * kayit_sayisi))
+        self.dolu = bytearray(kayit_sayisi)
+
+        self.sorgu_sayisi = 0
+        self.isabet_sayisi = 0
+
+    def sorgula(self, anahtar):
+        """Anahtara ait kaydı (skor, beyaz geçerler, siyah geçerler) olarak döndür; yoksa None"""
+        self.sorgu_sayisi += 1
+        indeks = anahtar & self.maske
+        if self.dolu[indeks] and self.anahtarlar[indeks] == anahtar:
+            self.isabet_sayisi += 1
+            return self.skorlar[indeks], self.beyaz_gecerler[indeks], self.siyah_gecerler[indeks]
+        return None
+
+    def kaydet(self, anahtar, skor, beyaz_gecerler, siyah_gecerler):
+        """Kaydı anahtarın yuvasına yaz (her zaman üzerine yazılır)"""
+        indeks = anahtar & self.maske
+        self.anahtarlar[indeks] = anahtar
+        self.skorlar[indeks] = skor
+        self.beyaz_gecerler[indeks] = beyaz_gecerler
+        self.siyah_gecerler[indeks] = siyah_gecerler
+        self.dolu[indeks] = 1
+
+    def yeni_arama(self):
+        """Yeni arama başlangıcı: istatistikleri sıfırla (kayıtlar korunur)"""
+        self.sorgu_sayisi = 0
+        self.isabet_sayisi = 0
+
+    def temizle(self):
+        """Tüm kayıtları ve istatistikleri sıfırla"""
+        self.dolu = bytearray(self.kayit_sayisi)
+        self.sorgu_sayisi = 0
+        self.isabet_sayisi = 0
+
+    def get_istatistikler(self):
+        """Sorgu, isabet sayısı ve isabet oranı"""
+        return {
+            'piyon_sorgu': self.sorgu_sayisi,
+            'piyon_isabet': self.isabet_sayisi,
+            'piyon_isabet_orani': self.isabet_sayisi / self.sorgu_sayisi if self.sorgu_sayisi else 0.0
+        }
@@ -8,6 +8,7 @@ import sys
 import os
 from Tahta import Tahta
 from Arama import Arama
+from Hamle import hamle_kaynak, hamle_hedef, hamle_metni
 import threading
 
 
@@ -39,10 +40,11 @@ class SatrancGUI:
 
         # Oyun durumu
         self.tahta = Tahta()
-        self.arama = Arama(derinlik=4)
+        self.arama = Arama(derinlik=4, sure_limiti=10.0)  # Derinlik üst sınır, süre saniye
         self.secili_kare = None
         self.mumkun_hamleler = []
         self.oyun_bitti = False
+        self.oyun_sonu_mesaji = None
         self.motor_dusunuyor = False
         
         # Değerlendirme bilgileri
@@ -132,7 +134,7 @@ class SatrancGUI:
     def mumkun_hamleleri_ciz(self):
         """Mümkün hamleleri göster"""
         for hamle in self.mumkun_hamleler:
-            hedef_kare = hamle[1]
+            hedef_kare = hamle_hedef(hamle)
             x, y = self.kare_pozisyonu_al(hedef_kare)
             overlay = pygame.Surface((self.KARE_BOYUTU, self.KARE_BOYUTU))
             overlay.set_alpha(100)
@@ -202,6 +204,8 @@ class SatrancGUI:
         sira_text = "Beyaz Sıra" if self.tahta.beyaz_sira else "Siyah Sıra"
         if self.motor_dusunuyor:
             sira_text = "Motor Düşünüyor..."
+        if self.oyun_sonu_mesaji:
+            sira_text = self.oyun_sonu_mesaji
 
         text = self.font.render(sira_text, True, self.YAZI_RENK)
         self.ekran.blit(text, (self.TAHTA_BOYUTU + 10, y_offset))
@@ -241,8 +245,8 @@ class SatrancGUI:
         # Son hamle
         if self.son_hamle:
             # Hamleyi insan okunabilir formatta göster
-            kaynak_str = self._kare_notasyonu(self.son_hamle[0])
-            hedef_str = self._kare_notasyonu(self.son_hamle[1])
+            kaynak_str = self._kare_notasyonu(hamle_kaynak(self.son_hamle))
+            hedef_str = self._kare_notasyonu(hamle_hedef(self.son_hamle))
             hamle_str = f"Son: {kaynak_str}-{hedef_str}"
             text = self.kucuk_font.render(hamle_str, True, self.YAZI_RENK)
             self.ekran.blit(text, (self.TAHTA_BOYUTU + 10, y_offset))
@@ -300,12 +304,11 @@ class SatrancGUI:
     def kare_icin_hamleler_bul(self, kaynak_kare):
         """Belirli bir kare için mümkün hamleleri bul"""
         try:
-            from HamleUret import HamleUretici
-            uretici = HamleUretici()
-            tum_hamleler = uretici.tum_hamleleri_uret(self.tahta)
+            from LegalHamle import LegalHamleBulucu
+            tum_hamleler = LegalHamleBulucu().legal_hamleleri_bul(self.tahta)
 
             # Sadece bu kareden başlayan hamleleri filtrele
-            kare_hamleleri = [hamle for hamle in tum_hamleler if hamle[0] == kaynak_kare]
+            kare_hamleleri = [hamle for hamle in tum_hamleler if hamle_kaynak(hamle) == kaynak_kare]
             return kare_hamleleri
         except Exception as e:
             return []
@@ -313,16 +316,16 @@ class SatrancGUI:
     def hamle_dene(self, kaynak, hedef):
         """Hamle yapmaya çalış"""
         for hamle in self.mumkun_hamleler:
-            if hamle[0] == kaynak and hamle[1] == hedef:
+            if hamle_kaynak(hamle) == kaynak and hamle_hedef(hamle) == hedef:
                 try:
                     if self.tahta.hamle_yap(hamle):
                         self.son_hamle = hamle
+                        self.oyun_sonu_kontrol()
                         
                         # Pozisyonu değerlendir (beyaz perspektifinden)
-                        from Degerlendirme import Degerlendirici
-                        degerlendirici = Degerlendirici()
+                        # Aramanın değerlendiricisi kullanılır: piyon hash tablosu hamleler arasında korunur
                         # Değerlendirmeyi beyaz perspektifinden al (pozitif = beyaz iyi, negatif = siyah iyi)
-                        raw_skor = degerlendirici.pozisyon_degerlendir(self.tahta)
+                        raw_skor = self.arama.degerlendirme.pozisyon_degerlendir(self.tahta)
                         self.son_degerlendirme = raw_skor / 100.0
                         
                         return True
@@ -343,9 +346,8 @@ class SatrancGUI:
         """Motor hamlesi hesapla (thread fonksiyonu)"""
         try:
             # Önce mevcut hamleleri kontrol et
-            from HamleUret import HamleUretici
-            uretici = HamleUretici()
-            mevcut_hamleler = uretici.tum_hamleleri_uret(self.tahta)
+            from LegalHamle import LegalHamleBulucu
+            mevcut_hamleler = LegalHamleBulucu().legal_hamleleri_bul(self.tahta)
 
             if not mevcut_hamleler:
                 print("Motor için hamle bulunamadı!")
@@ -357,18 +359,19 @@ class SatrancGUI:
             if en_iyi_hamle:
                 # Hamleyi yap
                 if self.tahta.hamle_yap(en_iyi_hamle):
-                    print(f"Motor hamle yaptı: {en_iyi_hamle}")
                     self.son_hamle = en_iyi_hamle
+                    self.oyun_sonu_kontrol()
                     
                     # Arama istatistiklerini güncelle
                     istatistikler = self.arama.get_istatistikler()
                     self.dugum_sayisi = istatistikler['dugum_sayisi']
+                    print(f"Motor hamle yaptı: {hamle_metni(en_iyi_hamle)} "
+                          f"(derinlik {istatistikler['tamamlanan_derinlik']}, {istatistikler['sure']:.1f} sn)")
                     
                     # Pozisyonu değerlendir (beyaz perspektifinden)
-                    from Degerlendirme import Degerlendirici
-                    degerlendirici = Degerlendirici()
+                    # Aramanın değerlendiricisi kullanılır: piyon hash tablosu hamleler arasında korunur
                     # Değerlendirmeyi beyaz perspektifinden al (pozitif = beyaz iyi, negatif = siyah iyi)
-                    raw_skor = degerlendirici.pozisyon_degerlendir(self.tahta)
+                    raw_skor = self.arama.degerlendirme.pozisyon_degerlendir(self.tahta)
                     self.son_degerlendirme = raw_skor / 100.0  # Centipawn'dan pawn'a çevir
                 else:
                     print("Motor hamle yapamadı!")
@@ -377,8 +380,9 @@ class SatrancGUI:
                 import random
                 rastgele_hamle = random.choice(mevcut_hamleler)
                 if self.tahta.hamle_yap(rastgele_hamle):
-                    print(f"Motor rastgele hamle yaptı: {rastgele_hamle}")
+                    print(f"Motor rastgele hamle yaptı: {hamle_metni(rastgele_hamle)}")
                     self.son_hamle = rastgele_hamle
+                    self.oyun_sonu_kontrol()
                     self.son_degerlendirme = 0
 
         except Exception as e:
@@ -387,12 +391,25 @@ class SatrancGUI:
         finally:
             self.motor_dusunuyor = False
 
+    def oyun_sonu_kontrol(self):
+        """Hamle sonrası beraberlik kontrolü (üç kez tekrar, 50 hamle kuralı)"""
+        if self.tahta.uc_kez_tekrar_mi():
+            self.oyun_sonu_mesaji = "Berabere: Üç Kez Tekrar"
+        elif self.tahta.elli_hamle_kurali_mi():
+            self.oyun_sonu_mesaji = "Berabere: 50 Hamle"
+        else:
+            return
+
+        self.oyun_bitti = True
+        print(self.oyun_sonu_mesaji)
+
     def yeniden_baslat(self):
         """Oyunu yeniden başlat"""
         self.tahta = Tahta()
         self.secili_kare = None
         self.mumkun_hamleler = []
         self.oyun_bitti = False
+        self.oyun_sonu_mesaji = None
         self.motor_dusunuyor = False
         
         # Değerlendirme bilgilerini sıfırla